@@ -0,0 +1,100 @@
+"""
+인증 비용 측정
+
+- 요청별 token 검증(decode_access_token): jwt.decode 매번 수행 / TokenCache hit
+- auth module import 시간(worker 기동): hash 계산은 import시 하지 않음
+  (이전에는 import시 bcrypt hash 계산, hashed_password 설정이 없으면 처음 로그인할 때 한 번 계산)
+- /api/v1/metrics 요청(인증 포함) 시간: TestClient
+
+RUN command in source:
+    python benchmarks/bench_auth.py --count 20000
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+# pyefriend_api 설정(config.yml, 비밀번호)이 없는 경우 template 사용
+if not os.getenv('EFRIEND_HOME'):
+    os.environ['EFRIEND_HOME'] = tempfile.mkdtemp(prefix='efriend-bench-')
+    shutil.copy(os.path.join(BASE_DIR, 'config.template.yml'), os.path.join(os.environ['EFRIEND_HOME'], 'config.yml'))
+os.environ.setdefault('EFRIEND_PASSWORD', 'password')
+
+IMPORT_AUTH = 'import time; t = time.perf_counter(); import pyefriend_api.app.auth; print(time.perf_counter() - t)'
+
+
+def import_time(home: str) -> float:
+    """ 새 process에서 auth module import 시간(초) """
+    env = dict(os.environ, EFRIEND_HOME=home, PYTHONPATH=BASE_DIR)
+    output = subprocess.check_output([sys.executable, '-c', IMPORT_AUTH], env=env, stderr=subprocess.DEVNULL)
+    return float(output.decode().strip().splitlines()[-1])
+
+
+def measure(name: str, func, count: int) -> float:
+    func()
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    elapsed = (time.perf_counter() - start) / count
+    print(f'{name:<32} {elapsed * 1e6:>9.1f} us')
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=20000)
+    parser.add_argument('--requests', type=int, default=500)
+    args = parser.parse_args()
+
+    from pyefriend_api.app import auth
+    from pyefriend_api.utils.password import hash_password
+
+    # token 검증
+    token = auth.create_access_token({'sub': auth.get_admin_user()['username']})
+
+    def uncached():
+        auth.token_cache.clear()
+        return auth.decode_access_token(token)
+
+    base = measure('decode_access_token(no cache)', uncached, args.count)
+    cached = measure('decode_access_token(cache hit)', lambda: auth.decode_access_token(token), args.count)
+    print(f'{"":<32} x{base / cached:.1f}')
+
+    # 요청 전체
+    from fastapi.testclient import TestClient
+    from pyefriend_api.api import create_app
+
+    client = TestClient(create_app())
+    headers = {'Authorization': f'Bearer {token}'}
+    cache_size = auth.token_cache.maxsize
+
+    for name, size in (('GET /metrics(no cache)', 0), ('GET /metrics(cache)', cache_size)):
+        auth.token_cache.clear()
+        auth.token_cache.maxsize = size
+        measure(name, lambda: client.get('/api/v1/metrics/', headers=headers), args.requests)
+
+    # import(worker 기동)
+    home = os.environ['EFRIEND_HOME']
+    hashed_home = tempfile.mkdtemp(prefix='efriend-bench-')
+    with open(os.path.join(home, 'config.yml'), encoding='utf-8') as f:
+        conf = f.read()
+    with open(os.path.join(hashed_home, 'config.yml'), 'w', encoding='utf-8') as f:
+        hashed_password = hash_password(os.environ['EFRIEND_PASSWORD'])
+        f.write(conf.replace('fastapi:\n', f"fastapi:\n  hashed_password: '{hashed_password}'\n", 1))
+
+    start = time.perf_counter()
+    hash_password(os.environ['EFRIEND_PASSWORD'])
+    print(f'{"bcrypt hash(previous import)":<32} {(time.perf_counter() - start) * 1000:>9.1f} ms')
+    print(f'{"import auth(password_env)":<32} {import_time(home) * 1000:>9.1f} ms')
+    print(f'{"import auth(hashed_password)":<32} {import_time(hashed_home) * 1000:>9.1f} ms')
+    shutil.rmtree(hashed_home, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
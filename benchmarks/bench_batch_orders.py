@@ -0,0 +1,66 @@
+"""
+주문 여러 건 제출 시간 비교(SimulatedController)
+
+- loop: 주문마다 AsyncApi.buy_stock 호출(호출마다 controller thread 작업 하나)
+- batch: AsyncApi.submit_orders 한 번 호출(controller thread 작업 하나에서 연속 제출)
+- --rate: 주문 초당 요청 수(throttle, 0일 경우 제한 없음), --latency: transaction 지연(초)
+
+RUN command in source:
+    python benchmarks/bench_batch_orders.py --orders 200 --latency 0.005
+    python benchmarks/bench_batch_orders.py --orders 200 --rate 5
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pyefriend import AsyncApi, SimulatedController, Fixture, set_controller
+from pyefriend.const import Market, ServiceClass
+from pyefriend.throttle import Throttle
+
+
+async def run(args):
+    throttle = Throttle(rates={ServiceClass.ORDER: args.rate or None})
+    set_controller(SimulatedController(default_fixture=Fixture.filled(),
+                                       latency=args.latency,
+                                       jitter=0,
+                                       throttle=throttle))
+    api = await AsyncApi.load(market=Market.DOMESTIC, account='5005775101', password='password')
+    orders = [dict(side='buy', product_code=f'{i:06d}', count=1) for i in range(args.orders)]
+
+    async def loop():
+        for order in orders:
+            await api.buy_stock(product_code=order['product_code'], count=order['count'])
+
+    async def batch():
+        result = await api.submit_orders(orders)
+        assert result.failed == 0
+
+    results = {}
+    for name, func in (('loop', loop), ('batch', batch)):
+        # 이전 측정에서 사용한 token 회복
+        await asyncio.sleep(args.orders / args.rate if args.rate else 0)
+
+        start = time.perf_counter()
+        await func()
+        results[name] = time.perf_counter() - start
+        print(f'{name:<8} {results[name] * 1000:>10.1f} ms  {args.orders / results[name]:>8.1f} orders/s')
+
+    print(f'{"":<8} x{results["loop"] / results["batch"]:.2f}')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--orders', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.005)
+    parser.add_argument('--rate', type=float, default=0)
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
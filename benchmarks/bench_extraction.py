@@ -0,0 +1,103 @@
+"""
+다건 조회 column 추출 비용 측정(simulator backend, record당 비용)
+
+- legacy: record마다 column dict를 다시 읽는 기존 방식(record x column loop)
+- plan(compile): 매 호출마다 ExtractionPlan compile
+- plan(cached): Api.get_data(multiple=True) 경로(캐시된 ExtractionPlan)
+
+RUN command in source:
+    python benchmarks/bench_extraction.py --records 100 --count 500
+"""
+import os
+import sys
+import argparse
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pyefriend.api import DomesticApi, set_controller
+from pyefriend.columnar import ExtractionPlan
+from pyefriend.simulator import SimulatedController, Fixture
+from pyefriend.throttle import Throttle
+
+
+ACCOUNT = '5005775101'
+
+# domestic_stocks와 같은 형태의 column 정의
+COLUMNS = [
+    dict(index=0, key='product_code', not_null=True),
+    dict(index=1, key='product_name', not_null=True),
+    dict(index=7, key='count', dtype=int),
+    dict(index=9, key='purchase_price', dtype=float),
+    dict(index=10, key='purchase_amount', dtype=int),
+    dict(index=11, key='current_price', dtype=int),
+    dict(index=12, key='evaluated_amount', dtype=int),
+    dict(index=13, key='pnl_amount', dtype=int),
+    dict(index=14, key='pnl_rate', dtype=float),
+]
+
+
+def legacy_get_data(controller, columns, block_index: int = 0):
+    """ 기존 get_data(multiple=True) 구현 """
+    data_list = []
+
+    for record_idx in range(controller.GetMultiRecordCount(block_index)):
+        skip = False
+        data = {}
+        for column in columns:
+            key = column.get('key')
+            index = column.get('index')
+            dtype = column.get('dtype', str)
+            not_null = column.get('not_null', False)
+            value = controller.GetMultiData(block_index=block_index,
+                                            record_index=record_idx,
+                                            field_index=index)
+
+            if not_null and value == '':
+                skip = True
+                break
+
+            data[key] = value if dtype == str else dtype(value)
+
+        if len(data) > 0 and not skip:
+            data_list.append(data)
+
+    return data_list
+
+
+def measure(name: str, func, count: int, records: int):
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    elapsed = time.perf_counter() - start
+    print(f'{name:<16} {elapsed / count * 1e6:>10.1f} us/call  {elapsed / count / records * 1e9:>8.0f} ns/row')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--records', type=int, default=100, help='다건 조회 record 수')
+    parser.add_argument('--count', type=int, default=500)
+    args = parser.parse_args()
+
+    controller = set_controller(
+        SimulatedController(default_fixture=Fixture.filled(records=args.records),
+                            accounts=[ACCOUNT],
+                            latency=0,
+                            jitter=0,
+                            throttle=Throttle.unlimited())
+    )
+    api = DomesticApi(account=ACCOUNT, password='password')
+    api.set_account_info().request_data('SATPS')
+
+    get_multi_data = controller.GetMultiData
+    record_count = controller.GetMultiRecordCount(0)
+
+    measure('legacy', lambda: legacy_get_data(controller, COLUMNS), args.count, args.records)
+    measure('plan(compile)',
+            lambda: ExtractionPlan.compile(COLUMNS).execute(get_multi_data, 0, record_count).rows(),
+            args.count, args.records)
+    measure('plan(cached)', lambda: api.get_data(multiple=True, columns=COLUMNS), args.count, args.records)
+
+
+if __name__ == '__main__':
+    main()
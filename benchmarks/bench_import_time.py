@@ -0,0 +1,111 @@
+"""
+import 시간 측정(python -X importtime)
+
+- 대상별로 새 process에서 import 후 -X importtime 결과(cumulative, us)를 합산
+- 가장 오래 걸린 module(--top)을 함께 출력
+- --max-ms를 설정한 경우 초과한 대상이 있으면 exit code 1(회귀 확인용)
+
+RUN command in source:
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --max-ms 50 "import pyefriend" "from pyefriend import ColumnarData"
+"""
+import os
+import sys
+import shutil
+import argparse
+import tempfile
+import subprocess
+from typing import List, Tuple
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = (
+    'import pyefriend',
+    'from pyefriend import ColumnarData',
+    'from pyefriend.store import HistoryStore',
+    'from pyefriend import DomesticApi, SimulatedController',
+    'from pyefriend import AsyncApi',
+    'import pyefriend_api.config',
+    'import pyefriend_api.api',
+)
+
+
+def run_importtime(statement: str, env: dict) -> List[Tuple[int, str]]:
+    """ :return: [(cumulative us, module), ...] """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules.append((int(cumulative), name.rstrip()))
+
+    return modules
+
+
+def import_time(statement: str, env: dict, startup: set) -> Tuple[float, List[Tuple[int, str]]]:
+    """
+    :param startup: interpreter 시작시 import되는 module(site 등, 제외)
+    :return: (전체 시간(ms), [(cumulative us, module), ...])
+    """
+    modules = [(cumulative, name) for cumulative, name in run_importtime(statement, env)
+               if name.strip() not in startup]
+
+    # 최상위(들여쓰기 없는) module만 합산
+    total = sum(cumulative for cumulative, name in modules if not name.startswith('  '))
+    return total / 1000, modules
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('targets', nargs='*', default=TARGETS, help='import 문')
+    parser.add_argument('--top', type=int, default=5, help='대상별로 출력할 module 수')
+    parser.add_argument('--max-ms', type=float, default=None, help='대상별 최대 import 시간(ms)')
+    args = parser.parse_args()
+
+    env = dict(os.environ, PYTHONPATH=BASE_DIR)
+
+    # pyefriend_api 설정(config.yml)이 없는 경우 template 사용
+    home = None
+    if not env.get('EFRIEND_HOME'):
+        home = tempfile.mkdtemp(prefix='efriend-bench-')
+        shutil.copy(os.path.join(BASE_DIR, 'config.template.yml'), os.path.join(home, 'config.yml'))
+        env['EFRIEND_HOME'] = home
+    env.setdefault('EFRIEND_PASSWORD', 'password')
+
+    failed = []
+
+    try:
+        startup = {name.strip() for _, name in run_importtime('pass', env)}
+
+        for target in args.targets:
+            try:
+                total, modules = import_time(target, env, startup)
+            except RuntimeError as e:
+                print(f'{target:<56} failed({e})')
+                continue
+
+            print(f'{target:<56} {total:>9.1f} ms')
+            for cumulative, name in sorted(modules, reverse=True)[:args.top]:
+                print(f'    {cumulative / 1000:>9.1f} ms  {name.strip()}')
+
+            if args.max_ms is not None and total > args.max_ms:
+                failed.append(target)
+
+    finally:
+        if home:
+            shutil.rmtree(home, ignore_errors=True)
+
+    if failed:
+        print(f'--max-ms {args.max_ms} 초과: {failed}')
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
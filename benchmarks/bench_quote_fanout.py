@@ -0,0 +1,118 @@
+"""
+QuoteHub fan-out 측정(simulator backend)
+
+- --clients개의 client가 --symbols개 종목 중 --per-client개씩 구독
+- 구독자 수와 관계없이 upstream 조회(transaction)는 주기마다 종목당 한 번인지 확인
+- --slow 비율의 client는 --slow-delay(초)마다 한 번씩만 수신(conflation 확인)
+- 값 변경(publish) 후 client가 수신하기까지의 지연(fan-out latency) 측정
+
+RUN command in source:
+    python benchmarks/bench_quote_fanout.py --clients 5000 --symbols 200 --per-client 10 --seconds 5
+"""
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pyefriend import AsyncApi, QuoteHub
+from pyefriend.api import set_controller
+from pyefriend.cache import quote_cache
+from pyefriend.metrics import Histogram
+from pyefriend.simulator import SimulatedController, Fixture
+from pyefriend.throttle import Throttle
+
+
+ACCOUNT = '5005775101'
+
+
+def price_fixture(request) -> Fixture:
+    """ 조회할 때마다 바뀌는 현재가 """
+    return Fixture(single={11: str(random.randint(1000, 2000)), 16: '1', 18: '1', 19: '1', 20: '1', 23: '1'})
+
+
+async def consume(client, received: Histogram, published_at: dict, delay: float, stop: asyncio.Event):
+    while not stop.is_set():
+        quotes = await client.get()
+        now = time.perf_counter()
+        for key in quotes:
+            received.record(now - published_at[key])
+
+        if delay:
+            await asyncio.sleep(delay)
+
+
+async def run(args):
+    controller = SimulatedController(accounts=[ACCOUNT], latency=args.latency, jitter=0, throttle=Throttle.unlimited())
+    controller.add_fixture('SCP', price_fixture)
+    set_controller(controller)
+
+    # 현재가 cache를 사용하지 않아야 주기마다 실제 조회
+    quote_cache.ttls['SCP'] = 0
+
+    api = await AsyncApi.load(market='domestic', account=ACCOUNT, password='password')
+    hub = QuoteHub(fetch=api.iter_product_prices, interval=args.interval)
+
+    # publish 시각 기록
+    published_at = {}
+    publish = hub.publish
+
+    def timed_publish(key, value):
+        published_at[key] = time.perf_counter()
+        publish(key, value)
+
+    hub.publish = timed_publish
+
+    symbols = [f'{code:06d}' for code in range(1, args.symbols + 1)]
+    received = Histogram(scale=1e6)
+    stop = asyncio.Event()
+    consumers = []
+
+    started_requests = controller.request_count
+    for number in range(args.clients):
+        client = hub.connect()
+        hub.subscribe(client, random.sample(symbols, args.per_client))
+        delay = args.slow_delay if number < args.clients * args.slow else 0
+        consumers.append(asyncio.ensure_future(consume(client, received, published_at, delay, stop)))
+
+    await asyncio.sleep(args.seconds)
+    stop.set()
+
+    snapshot = hub.snapshot()
+    transactions = controller.request_count - started_requests
+    for consumer in consumers:
+        consumer.cancel()
+    await asyncio.gather(*consumers, return_exceptions=True)
+    await hub.close()
+
+    latency = received.snapshot()
+
+    print(f'clients {args.clients}  symbols {snapshot["symbols"]}  subscriptions {snapshot["subscriptions"]}')
+    print(f'polls {snapshot["polls"]}  transactions {transactions}  '
+          f'transactions/poll {transactions / max(snapshot["polls"], 1):.1f}')
+    print(f'published {snapshot["published"]}  delivered {snapshot["delivered"]}  conflated {snapshot["conflated"]}')
+    print(f'fan-out latency(ms) p50 {latency["p50"] * 1000:.2f}  p99 {latency["p99"] * 1000:.2f}  '
+          f'max {latency["max"] * 1000:.2f}')
+    print(f'poll time(ms) mean {snapshot["poll_time"]["mean"] * 1000:.2f}')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clients', type=int, default=5000)
+    parser.add_argument('--symbols', type=int, default=200)
+    parser.add_argument('--per-client', type=int, default=10, help='client별 구독 종목 수')
+    parser.add_argument('--interval', type=float, default=0.5, help='upstream 조회 주기(초)')
+    parser.add_argument('--latency', type=float, default=0, help='transaction 지연(초)')
+    parser.add_argument('--slow', type=float, default=0.1, help='느린 client 비율')
+    parser.add_argument('--slow-delay', type=float, default=2., help='느린 client의 수신 간격(초)')
+    parser.add_argument('--seconds', type=float, default=5.)
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+리밸런싱 주문 계획 계산 시간(pyefriend.rebalance.plan_rebalance)
+
+- 종목 수(--sizes)별로 plan_rebalance + orders()(응답 dict 생성) 시간 측정
+- 국내/해외 절반씩, 보유 종목/목표 종목이 일부만 겹치는 portfolio(무작위, --seed)
+- 종목별 python loop로 계산한 목표 수량과 같은지 확인(loop 계산 시간 함께 출력)
+
+RUN command in source:
+    python benchmarks/bench_rebalance.py --sizes 100 1000 5000 --count 20
+"""
+import os
+import sys
+import time
+import math
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pyefriend.rebalance import plan_rebalance, RebalanceLimits
+
+LIMITS = RebalanceLimits(available_limit=0.9, domestic_limit=0.5, overseas_limit=0.4)
+CURRENCY = 1200.
+
+
+def make_portfolio(size: int, seed: int) -> dict:
+    random = np.random.default_rng(seed)
+    is_overseas = np.arange(size) % 2 == 1
+
+    return dict(product_codes=[f'{i:06d}' for i in range(size)],
+                counts=random.integers(0, 200, size) * (random.random(size) < 0.5),
+                prices=np.where(is_overseas, random.uniform(5, 500, size), random.integers(1000, 500000, size)),
+                weights=random.random(size) * (random.random(size) < 0.8),
+                is_overseas=is_overseas,
+                lots=np.where(random.random(size) < 0.1, 10, 1),
+                cash=float(random.integers(10 ** 8, 10 ** 9)),
+                currency=CURRENCY,
+                limits=LIMITS)
+
+
+def loop_targets(portfolio: dict) -> list:
+    """ 종목별 python loop(비교용, 매수 축소/작은 주문 제외는 생략) """
+    codes = portfolio['product_codes']
+    counts = portfolio['counts'].tolist()
+    prices = portfolio['prices'].tolist()
+    weights = portfolio['weights'].tolist()
+    is_overseas = portfolio['is_overseas'].tolist()
+    lots = portfolio['lots'].tolist()
+
+    krw_prices = [price * CURRENCY if overseas else price for price, overseas in zip(prices, is_overseas)]
+    total_amount = portfolio['cash'] + sum(count * price for count, price in zip(counts, krw_prices))
+    budget = total_amount * LIMITS.available_limit
+
+    group_weight = {True: 0., False: 0.}
+    for weight, overseas in zip(weights, is_overseas):
+        group_weight[overseas] += weight
+
+    targets = []
+    for i in range(len(codes)):
+        limit = LIMITS.overseas_limit if is_overseas[i] else LIMITS.domestic_limit
+        ratio = weights[i] / group_weight[is_overseas[i]] if group_weight[is_overseas[i]] else 0.
+        target = math.floor(budget * limit * ratio / (krw_prices[i] * lots[i])) * lots[i]
+
+        delta = target - counts[i]
+        if delta < 0:
+            delta = -min(-(delta // lots[i]) * lots[i], counts[i])
+        targets.append(counts[i] + delta)
+
+    return targets
+
+
+def measure(func, count: int) -> float:
+    func()
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    return (time.perf_counter() - start) / count
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 5000])
+    parser.add_argument('--count', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f'{"symbols":>8} {"plan":>10} {"plan+orders":>12} {"python loop":>12} {"orders":>7}')
+    for size in args.sizes:
+        portfolio = make_portfolio(size, args.seed)
+
+        # 매수 금액이 예수금을 넘지 않는 portfolio여야 loop 결과와 비교 가능
+        plan = plan_rebalance(**portfolio)
+        if plan.summary()['cash_after'] >= 0 and plan.targets.tolist() != loop_targets(portfolio):
+            raise AssertionError(f'{size}: python loop와 목표 수량이 다릅니다.')
+
+        elapsed_plan = measure(lambda: plan_rebalance(**portfolio), args.count)
+        elapsed_orders = measure(lambda: plan_rebalance(**portfolio).orders(), args.count)
+        elapsed_loop = measure(lambda: loop_targets(portfolio), args.count)
+
+        print(f'{size:>8} {elapsed_plan * 1000:>8.2f}ms {elapsed_orders * 1000:>10.2f}ms '
+              f'{elapsed_loop * 1000:>10.2f}ms {len(plan):>7}')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
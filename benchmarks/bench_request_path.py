@@ -0,0 +1,66 @@
+"""
+Api 전체 요청 경로 처리량 측정(simulator backend)
+
+RUN command in source:
+    python benchmarks/bench_request_path.py --latency 0.01 --count 200
+"""
+import os
+import sys
+import argparse
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pyefriend.api import DomesticApi, set_controller
+from pyefriend.cache import quote_cache
+from pyefriend.simulator import SimulatedController, Fixture
+from pyefriend.throttle import Throttle
+
+
+ACCOUNT = '5005775101'
+
+
+def measure(name: str, func, count: int):
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    elapsed = time.perf_counter() - start
+    print(f'{name:<32} {count / elapsed:>10.1f} req/s  {elapsed / count * 1000:>8.3f} ms/req')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--latency', type=float, default=0.0, help='transaction 평균 지연(초)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='transaction 지연 표준편차(초)')
+    parser.add_argument('--count', type=int, default=200)
+    parser.add_argument('--records', type=int, default=100, help='다건 조회 record 수')
+    parser.add_argument('--throttle', action='store_true', help='기본 요청 제한(throttle.DEFAULT_RATES) 적용')
+    parser.add_argument('--cache', action='store_true', help='시세 cache(cache.DEFAULT_TTLS) 사용')
+    args = parser.parse_args()
+
+    if not args.cache:
+        quote_cache.ttls.clear()
+
+    throttle = Throttle() if args.throttle else Throttle.unlimited()
+
+    set_controller(
+        SimulatedController(default_fixture=Fixture.filled(records=args.records),
+                            accounts=[ACCOUNT],
+                            latency=args.latency,
+                            jitter=args.jitter,
+                            throttle=throttle)
+    )
+    api = DomesticApi(account=ACCOUNT, password='password')
+
+    measure('get_product_prices', lambda: api.get_product_prices('005930'), args.count)
+    measure('get_spread', lambda: api.get_spread('005930'), args.count)
+    measure('list_product_histories', lambda: api.list_product_histories('005930'), args.count)
+    measure('get_stocks(overall=False)', lambda: api.get_stocks(overall=False), args.count)
+
+    if args.throttle:
+        for service_class, stat in throttle.snapshot().items():
+            print(f"{service_class:<8} effective_rate={stat['effective_rate']:.1f}/s avg_wait={stat['avg_wait'] * 1000:.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+List[PriceHistory] 응답 직렬화 시간 비교(--rows record)
+
+- pydantic: fastapi의 response_model 경로(serialize_response -> JSONResponse)
+- fast json: pyefriend_api.utils.response.rows_response(orjson 설치시 orjson)
+- columnar json: Accept: application/vnd.pyefriend.columnar+json
+- arrow: Accept: application/vnd.apache.arrow.stream(pyarrow 설치시)
+
+RUN command in source:
+    python benchmarks/bench_response_rows.py --rows 10000 --count 20
+"""
+import os
+import sys
+import time
+import shutil
+import asyncio
+import argparse
+import tempfile
+from typing import List
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+# pyefriend_api 설정(config.yml, 비밀번호)이 없는 경우 template 사용
+if not os.getenv('EFRIEND_HOME'):
+    os.environ['EFRIEND_HOME'] = tempfile.mkdtemp(prefix='efriend-bench-')
+    shutil.copy(os.path.join(BASE_DIR, 'config.template.yml'), os.path.join(os.environ['EFRIEND_HOME'], 'config.yml'))
+os.environ.setdefault('EFRIEND_PASSWORD', 'password')
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from pyefriend_api.app.v1.stock.schema import PriceHistory
+from pyefriend_api.utils import response
+from pyefriend_api.utils.response import rows_response, COLUMNAR_JSON, ARROW_STREAM
+
+
+def make_rows(count: int) -> List[dict]:
+    """ DomesticApi.list_sector_histories와 같은 형태(type 변환된 값) """
+    return [{'standard_date': f'{20000101 + i}',
+             'closing': 2000.5 + i,
+             'opening': 1990.25 + i,
+             'maximum': 2010.75 + i,
+             'minimum': 1980 + i,
+             'volume': 100000 + i,
+             'amount': 12345678}
+            for i in range(count)]
+
+
+def measure(name: str, func, count: int):
+    func()
+    start = time.perf_counter()
+    for _ in range(count):
+        size = len(func())
+    elapsed = (time.perf_counter() - start) / count
+    print(f'{name:<16} {elapsed * 1000:>9.2f} ms  {size:>10} bytes')
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--count', type=int, default=20)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    field = create_response_field(name='Response_list_sector_histories', type_=List[PriceHistory])
+    loop = asyncio.new_event_loop()
+
+    def pydantic_path() -> bytes:
+        content = loop.run_until_complete(serialize_response(field=field, response_content=rows))
+        return JSONResponse(content).body
+
+    print(f'rows {args.rows}  orjson {"yes" if response.orjson is not None else "no"}')
+    base = measure('pydantic', pydantic_path, args.count)
+
+    for name, accept in (('fast json', None), ('columnar json', COLUMNAR_JSON), ('arrow', ARROW_STREAM)):
+        try:
+            elapsed = measure(name, lambda: rows_response(rows, PriceHistory, accept=accept).body, args.count)
+        except Exception as e:
+            print(f'{name:<16} skipped({getattr(e, "detail", e)})')
+            continue
+        print(f'{"":<16} x{base / elapsed:.1f}')
+
+    loop.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
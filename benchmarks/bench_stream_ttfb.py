@@ -0,0 +1,116 @@
+"""
+/stock/sector/history 응답의 첫 byte까지 시간(TTFB)/전체 시간 측정(stream=False / stream=True, simulator backend)
+
+- uvicorn을 process 안에서 실행하고 httpx로 요청
+- 연속 조회 page마다 --latency만큼 지연
+
+RUN command in source:
+    python benchmarks/bench_stream_ttfb.py --pages 10 --records 100 --latency 0.05
+"""
+import os
+import sys
+import shutil
+import tempfile
+import argparse
+import asyncio
+import threading
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+# pyefriend_api 설정(config.yml, 비밀번호)이 없는 경우 template 사용
+if not os.getenv('EFRIEND_HOME'):
+    os.environ['EFRIEND_HOME'] = tempfile.mkdtemp(prefix='efriend-bench-')
+    shutil.copy(os.path.join(BASE_DIR, 'config.template.yml'), os.path.join(os.environ['EFRIEND_HOME'], 'config.yml'))
+os.environ.setdefault('EFRIEND_PASSWORD', 'password')
+
+import httpx
+import uvicorn
+
+from pyefriend.api import set_controller
+from pyefriend.simulator import SimulatedController, Fixture
+from pyefriend.throttle import Throttle
+
+
+ACCOUNT = '5005775101'
+
+
+def sector_fixture(pages: int, records: int, latency: float) -> Fixture:
+    def page(number: int) -> Fixture:
+        rows = [[f'2021{number:02d}{i % 28 + 1:02d}', '1', '1', '1', '1', '1', '1', '1', '1', '1']
+                for i in range(records)]
+        return Fixture(multi={1: rows}, latency=latency)
+
+    first = page(1)
+    first.next_pages = [page(number) for number in range(2, pages + 1)]
+    return first
+
+
+async def measure(client: httpx.AsyncClient, name: str, headers: dict, params: dict, count: int):
+    ttfbs, totals, size = [], [], 0
+
+    for _ in range(count):
+        start = time.perf_counter()
+        async with client.stream('POST',
+                                 '/api/v1/stock/sector/history',
+                                 json={'market': 'domestic', 'account': ACCOUNT, 'password': 'password',
+                                       'sector_code': '0001'},
+                                 params=params,
+                                 headers=headers) as response:
+            first = None
+            size = 0
+            async for chunk in response.aiter_bytes():
+                if first is None:
+                    first = time.perf_counter() - start
+                size += len(chunk)
+        ttfbs.append(first)
+        totals.append(time.perf_counter() - start)
+
+    print(f'{name:<24} ttfb {sum(ttfbs) / count * 1000:>8.1f} ms  '
+          f'total {sum(totals) / count * 1000:>8.1f} ms  {size:>9} bytes')
+
+
+async def run(args, port: int):
+    async with httpx.AsyncClient(base_url=f'http://127.0.0.1:{port}', timeout=60) as client:
+        token = (await client.post('/auth/token',
+                                   data={'username': 'youngha.park', 'password': os.environ['EFRIEND_PASSWORD']})).json()
+        headers = {'Authorization': f"Bearer {token['access_token']}"}
+
+        await measure(client, 'stream=False(1 page)', headers, {'stream': False}, args.count)
+        await measure(client, 'stream=True(1 page)', headers, {'stream': True, 'max_pages': 1}, args.count)
+        await measure(client, f'stream=True({args.pages} pages)', headers,
+                      {'stream': True, 'max_pages': args.pages}, args.count)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pages', type=int, default=10, help='연속 조회 page 수')
+    parser.add_argument('--records', type=int, default=100, help='page별 record 수')
+    parser.add_argument('--latency', type=float, default=0.05, help='page별 transaction 지연(초)')
+    parser.add_argument('--count', type=int, default=5)
+    parser.add_argument('--port', type=int, default=8799)
+    args = parser.parse_args()
+
+    controller = SimulatedController(accounts=[ACCOUNT], latency=0, jitter=0, throttle=Throttle.unlimited())
+    controller.add_fixture('PUP02120000', lambda request: sector_fixture(args.pages, args.records, args.latency))
+    set_controller(controller)
+
+    from pyefriend_api.api import create_app
+
+    server = uvicorn.Server(uvicorn.Config(create_app(), port=args.port, log_level='warning'))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+
+    while not server.started:
+        time.sleep(0.05)
+
+    try:
+        asyncio.run(run(args, args.port))
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,15 +1,65 @@
-from .controller import Controller
-from .api import DomesticApi, OverSeasApi, encrypt_password_by_efriend_expert
-from .helper import api_context, load_api, domestic_context, overseas_context
-
-
-__all__ = [
-    'Controller',
-    'encrypt_password_by_efriend_expert',
-    'DomesticApi',
-    'OverSeasApi',
-    'api_context',
-    'load_api',
-    'domestic_context',
-    'overseas_context',
-]
+"""
+pyefriend
+
+아래 이름들은 처음 사용할 때 해당 module을 import(PEP 562)
+    ex) from pyefriend import ColumnarData  # columnar만 import(PyQt5 등은 Controller 생성 시점에 import)
+"""
+import importlib
+from typing import TYPE_CHECKING
+
+
+# {이름: module}
+_LAZY_ATTRIBUTES = {
+    'BaseController': 'controller',
+    'Controller': 'controller',
+    'SimulatedController': 'simulator',
+    'Fixture': 'simulator',
+    'ColumnarData': 'columnar',
+    'encrypt_password_by_efriend_expert': 'api',
+    'set_controller': 'api',
+    'DomesticApi': 'api',
+    'OverSeasApi': 'api',
+    'AsyncApi': 'async_api',
+    'RealTimeManager': 'realtime',
+    'Tick': 'realtime',
+    'TickDecoder': 'realtime',
+    'ApiRegistry': 'registry',
+    'QuoteHub': 'fanout',
+    'Order': 'order',
+    'OrderBatch': 'order',
+    'api_context': 'helper',
+    'load_api': 'helper',
+    'domestic_context': 'helper',
+    'overseas_context': 'helper',
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_ATTRIBUTES.get(name)
+
+    if module is None:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+if TYPE_CHECKING:
+    from .controller import BaseController, Controller
+    from .simulator import SimulatedController, Fixture
+    from .columnar import ColumnarData
+    from .api import DomesticApi, OverSeasApi, encrypt_password_by_efriend_expert, set_controller
+    from .helper import api_context, load_api, domestic_context, overseas_context
+    from .async_api import AsyncApi
+    from .realtime import RealTimeManager, Tick, TickDecoder
+    from .registry import ApiRegistry
+    from .fanout import QuoteHub
+    from .order import Order, OrderBatch
+
+
+__all__ = list(_LAZY_ATTRIBUTES)
@@ -2,6 +2,7 @@
 # API Class
 
 :var controller: controller.py 내 Controller class instance를 단 하나만 생성(get_or_create_controller)
+                  set_controller로 다른 backend(ex. simulator.SimulatedController)로 교체 가능
 
 # 주요 parameters
 
@@ -9,61 +10,107 @@
 :param product_code: 종목 코드
 :param order_num: 주문번호
 """
-import pandas as pd
+import os
+import time
 from logging import Logger
-from typing import List, Dict, Union, Optional, Tuple, Any
+from typing import List, Dict, Union, Optional, Tuple, Any, Iterable, Iterator
 from datetime import datetime, date
-import requests
 
 from .exceptions import *
 from .const import *
 from .log import logger as pyefriend_logger
-from .controller import Controller
+from .controller import BaseController, Controller
+from .cache import cached, invalidate_cache
+from .columnar import ColumnarData, get_plan
+from .fx import FxRate, get_or_create_fx_service
+from .master import get_or_create_stock_master
+from .metrics import metrics
+from .order import Order, OrderResult, OrderBatch, validate_orders
 
 # [Section] Variables
 
-controller: Optional[Controller] = None
+# controller backend: 'qax'(default) / 'simulator'
+BACKEND = os.getenv('PYEFRIEND__BACKEND', Backend.QAX)
+
+# simulator backend 사용시 로드할 fixture json 경로
+SIMULATOR_FIXTURES = os.getenv('PYEFRIEND__SIMULATOR_FIXTURES')
+
+# submit_orders에서 요청 제한 응답(RateLimitException)을 받은 주문의 재시도 횟수
+ORDER_RETRIES = int(os.getenv('PYEFRIEND__ORDER_RETRIES', 1))
+
+controller: Optional[BaseController] = None
 
 
 # [Section] Modules
 
-def get_or_create_controller(logger=None, raise_error: bool = True):
+def create_controller(logger=None) -> BaseController:
+    """ 환경변수 'PYEFRIEND__BACKEND'에 따라 controller 생성 """
+    if BACKEND == Backend.SIMULATOR:
+        from .simulator import SimulatedController, Fixture
+
+        if SIMULATOR_FIXTURES:
+            return SimulatedController.from_json(SIMULATOR_FIXTURES, logger=logger)
+
+        return SimulatedController(default_fixture=Fixture.filled(), logger=logger)
+
+    return Controller(logger)
+
+
+def set_controller(new_controller: BaseController, raise_error: bool = True) -> BaseController:
+    """
+    Api가 사용할 controller(backend)를 교체
+    ex) set_controller(SimulatedController(...))
+    """
     global controller
 
-    if controller is None:
-        controller = Controller(logger)
+    controller = new_controller
+    metrics.register('throttle', new_controller.throttle.snapshot)
 
-        def send_log_when_error():
-            return_code = controller.GetRtCode()
-            msg_code = controller.GetReqMsgCode()
+    def send_log_when_error():
+        return_code = new_controller.GetRtCode()
+        msg_code = new_controller.GetReqMsgCode()
 
-            if return_code != '0':
-                msg = f'[{msg_code}] {controller.GetReqMessage()}'
+        # 요청 제한 응답 여부를 throttle에 반영
+        throttled = new_controller.throttle.feedback(msg_code)
 
-                if raise_error:
-                    if msg_code == '40910000':
-                        raise UnAuthorizedAccountException(msg)
+        if return_code != '0':
+            msg = f'[{msg_code}] {new_controller.GetReqMessage()}'
+            metrics.record_error(new_controller.last_service, msg_code)
 
-                    elif msg_code == '40580000':
-                        raise MarketClosingException(msg)
+            if raise_error:
+                if throttled:
+                    raise RateLimitException(msg)
 
-                    elif msg_code == '90000000':
-                        raise NotInVTSException(msg)
+                elif msg_code == '40910000':
+                    raise UnAuthorizedAccountException(msg)
 
-                    elif msg_code == '40070000':
-                        raise BiddingException(msg)
+                elif msg_code == '40580000':
+                    raise MarketClosingException(msg)
 
-                    elif msg_code == 'APBK1664':
-                        raise MarketClosingException(msg)
+                elif msg_code == '90000000':
+                    raise NotInVTSException(msg)
 
-                    else:
-                        raise UnExpectedException(msg)
+                elif msg_code == '40070000':
+                    raise BiddingException(msg)
+
+                elif msg_code == 'APBK1664':
+                    raise MarketClosingException(msg)
 
                 else:
-                    logger.error(msg)
+                    raise UnExpectedException(msg)
 
-        controller.set_receive_data_event_handler(send_log_when_error)
-        controller.set_receive_error_data_handler(send_log_when_error)
+            else:
+                new_controller.logger.error(msg)
+
+    new_controller.set_receive_data_event_handler(send_log_when_error)
+    new_controller.set_receive_error_data_handler(send_log_when_error)
+
+    return new_controller
+
+
+def get_or_create_controller(logger=None, raise_error: bool = True) -> BaseController:
+    if controller is None:
+        set_controller(create_controller(logger), raise_error=raise_error)
 
     return controller
 
@@ -109,7 +156,7 @@ class Api:
             logger.warning(f"실제계좌에 성공적으로 연결되었습니다. 타겟 계좌: '{self.account}'")
 
     @property
-    def controller(self):
+    def controller(self) -> BaseController:
         """ get or create controller """
         return get_or_create_controller(logger=self.logger)
 
@@ -163,9 +210,10 @@ class Api:
                  columns: List[Dict] = None,
                  block_index: int = 0,
                  as_type=None,
-                 default: Any = None) -> Union[str, List[Dict]]:
+                 default: Any = None,
+                 columnar: bool = False) -> Union[str, List[Dict], ColumnarData]:
         """
-        pk = True인 column은 value가 ''인 것을 체크하여 for문을 나가므로 columns의 맨 앞에 위치해야합니다.
+        not_null = True인 column의 값이 ''인 record는 제외됩니다.
 
         :param multiple: 테이블형태로 데이터를 get해올 경우 True, 단일 로그일 경우 False
         :param columns: example)
@@ -175,40 +223,17 @@ class Api:
             ...
         ]
         :param block_index: output이 multi block인 경우 block input를 선택해서 선택해주어야함.
+        :param columnar: True일 경우 ColumnarData(column별 array), False일 경우 row(dict) list로 반환
         """
         if multiple:
             assert columns is not None, "columns must be set"
 
-            # set empty list
-            data_list = []
-
-            # 총 갯수
-            record_ct = self.controller.GetMultiRecordCount(block_index)
-
-            for record_idx in range(record_ct):
-                # skip 여부: not_null=True인 column이 ''일 경우 skip
-                skip = False
-                data = {}
-                for column in columns:
-                    key = column.get('key')
-                    index = column.get('index')
-                    dtype = column.get('dtype', str)
-                    not_null = column.get('not_null', False)
-                    value = self.controller.GetMultiData(block_index=block_index,
-                                                         record_index=record_idx,
-                                                         field_index=index)
-
-                    if not_null and value == '':
-                        # pk column의 값이 ''일 경우 break
-                        skip = True
-                        break
-
-                    data[key] = value if dtype == str else dtype(value)
-
-                if len(data) > 0 and not skip:
-                    data_list.append(data)
+            data = self.get_columns(columns=columns, block_index=block_index)
 
-            return data_list
+            if columnar:
+                return data
+            else:
+                return data.rows()
         else:
             if block_index is not None:
                 data = self.controller.GetSingleDataEx(block_index, field_index, 0)
@@ -223,6 +248,18 @@ class Api:
             else:
                 return default
 
+    def get_columns(self, columns: List[Dict], block_index: int = 0) -> ColumnarData:
+        """ 다건 데이터를 column 단위로 조회(columnar.ExtractionPlan) """
+        started = time.perf_counter()
+
+        plan = get_plan(self.last_service, block_index, columns)
+        data = plan.execute(self.controller.GetMultiData,
+                            block_index,
+                            self.controller.GetMultiRecordCount(block_index))
+
+        metrics.record_extraction(self.last_service, time.perf_counter() - started, len(data))
+        return data
+
     def set_account_info(self):
         """ request 0, 1, 2에 계정 정보 입력 """
         account_num, product_code = self.splitted_account
@@ -239,12 +276,112 @@ class Api:
         self.controller.RequestData(service=service)
         return self
 
+    def request_next_data(self, service: str):
+        """ 연속 조회 요청 """
+        self.last_service = service
+        self.controller.RequestNextData(service=service)
+        return self
+
+    @property
+    def has_next_data(self) -> bool:
+        """ 직전 조회 이후 연속 조회 데이터가 있는지 여부 """
+        return str(self.controller.IsMoreNextData()).upper() in ('1', 'TRUE')
+
+    def iter_pages(self,
+                   service: str,
+                   columns: List[Dict],
+                   block_index: int = 0,
+                   max_pages: int = None,
+                   columnar: bool = False) -> Iterator[Union[List[Dict], ColumnarData]]:
+        """
+        service를 요청하고 연속 조회(IsMoreNextData/RequestNextData)가 끝날 때까지 page 단위로 반환
+        - 첫 요청은 호출 즉시 수행(set_data로 설정한 input 사용), 다음 page는 이전 page를 모두 소비한 뒤 요청
+        - 소비를 중단하면 더 이상 요청하지 않음
+        - 반복 도중 같은 controller로 다른 서비스를 요청하면 연속 조회 정보가 초기화되므로 주의
+
+        :param max_pages: 최대 page 수(None일 경우 제한 없음)
+        :param columnar: get_data 참조
+        """
+        self.request_data(service)
+
+        def pages():
+            page = 1
+            yield self.get_data(multiple=True, columns=columns, block_index=block_index, columnar=columnar)
+
+            while (max_pages is None or page < max_pages) and self.has_next_data:
+                self.request_next_data(service)
+                page += 1
+                yield self.get_data(multiple=True, columns=columns, block_index=block_index, columnar=columnar)
+
+        return pages()
+
+    def iter_records(self,
+                     service: str,
+                     columns: List[Dict],
+                     block_index: int = 0,
+                     max_pages: int = None) -> Iterator[Dict]:
+        """ iter_pages의 record 단위 generator """
+        pages = self.iter_pages(service, columns=columns, block_index=block_index, max_pages=max_pages)
+        return (record for page in pages for record in page)
+
     @property
     def currency(self) -> float:
         """
-        1 달러 -> 원으로 환전할때의 현재 기준 예상환율을 반환
+        1 달러 -> 원으로 환전할때의 예상환율을 반환(currency_info 참고)
+        """
+        return self.currency_info.rate
+
+    @property
+    def currency_info(self) -> FxRate:
+        """
+        환율과 출처(source: 'broker' / 'http' / 'base')/갱신 시각(대기 없음)
+        - 마지막 broker 갱신 후 FxService.interval이 지났으면 broker 예상환율 갱신(refresh_currency_later)만 등록하고
+          저장된 환율을 바로 반환
+        - broker 조회에 실패한 경우 background 외부 환율 사용
+        - 한 번도 갱신되지 않은 경우 Currency.BASE 반환(source/age/is_fresh로 확인)
+        """
+        fx = get_or_create_fx_service(logger=self.logger)
+
+        if fx.broker_due():
+            self.refresh_currency_later()
+
+        return fx.get()
+
+    def refresh_currency_later(self) -> bool:
+        """
+        controller thread(executor)에 refresh_currency를 낮은 우선순위(HISTORY)로 등록
+        controller thread가 없는 경우(동기 사용) 등록하지 않으며, 필요한 경우 refresh_currency를 직접 호출
+
+        :return: 등록 여부
+        """
+        from . import executor
+        from .scheduler import Job
+
+        controller_thread = executor.controller_thread
+        if controller_thread is None or not controller_thread.is_alive():
+            return False
+
+        fx = get_or_create_fx_service(logger=self.logger)
+        fx.broker_attempted = time.time()
+
+        try:
+            # controller thread 안에서 호출한 경우에도 바로 실행하지 않도록 scheduler에 직접 등록
+            controller_thread.scheduler.put(Job(self.refresh_currency, service_class=ServiceClass.HISTORY))
+        except Exception as e:
+            self.logger.warning(f'{e.__class__.__name__}: {str(e)}')
+            return False
+
+        return True
+
+    def refresh_currency(self) -> float:
+        """
+        broker 예상환율(OS_OS3004R) 조회 후 fx.FxService에 저장
         예상환율은 최초고시 환율로 매일 08:15시경에 당일 환율이 제공됨
+        조회에 실패한 경우 외부 환율 갱신을 요청하고 저장된 값을 반환
         """
+        fx = get_or_create_fx_service(logger=self.logger)
+        fx.broker_attempted = time.time()
+
         try:
             (
                 self.set_account_info()  # 계정 정보
@@ -257,22 +394,13 @@ class Api:
 
             # 값을 불러오지 못할 때가 있음
             if currency != '':
-                return float(currency)
+                return fx.update(float(currency), source='broker').rate
 
         except Exception as e:
             self.logger.warning(f'{e.__class__.__name__}: {str(e)}')
-            pass
 
-        try:
-            # requests 모듈로 타 사이트에서 로드해옴
-            response = requests.get(Currency.URL)
-            data = response.json()
-            return data[0]['basePrice']
-
-        except Exception as e:
-            self.logger.warning('환율 정보를 불러오는 데 실패하였습니다.'
-                                '설정된 환율을 사용합니다.')
-            return Currency.BASE
+        fx.refresh_later()
+        return fx.rate
 
     @property
     def domestic_deposit(self) -> int:
@@ -476,6 +604,11 @@ class Api:
     def get_product_info(self, product_code: str, **kwargs) -> dict:
         raise NotImplementedError('해당 함수가 설정되어야 합니다.')
 
+    @cached('product_name')
+    def get_product_name(self, product_code: str, **kwargs) -> str:
+        """ 종목명(get_product_info, 1일 cache) """
+        return self.get_product_info(product_code, **kwargs)['product_name']
+
     def get_product_prices(self, product_code: str, **kwargs):
         """
         입력한 종목의 현재가, 최저가, 최고가, 시가, 전일종가 로드
@@ -483,6 +616,48 @@ class Api:
         """
         raise NotImplementedError('해당 함수가 설정되어야 합니다.')
 
+    def iter_product_prices(self,
+                            product_codes: Iterable[str],
+                            **kwargs) -> Iterator[Tuple[str, Optional[Tuple], Optional[Exception]]]:
+        """
+        여러 종목의 get_product_prices 결과를 (종목코드, 결과, 에러)로 반환
+        - cache된 종목을 먼저 반환한 뒤 나머지 종목을 차례로 요청(요청 간격은 controller throttle이 조절)
+        - 종목별 에러는 중단하지 않고 에러로 반환
+        """
+        product_codes = list(dict.fromkeys(product_codes))
+        peek = getattr(self.get_product_prices, 'peek', None)
+        missing = []
+
+        for product_code in product_codes:
+            found, prices = peek(self, product_code, **kwargs) if peek else (False, None)
+            if found:
+                yield product_code, prices, None
+            else:
+                missing.append(product_code)
+
+        for product_code in missing:
+            try:
+                yield product_code, self.get_product_prices(product_code, **kwargs), None
+            except Exception as e:
+                yield product_code, None, e
+
+    def get_product_prices_many(self,
+                                product_codes: Iterable[str],
+                                **kwargs) -> Tuple[Dict[str, Tuple], Dict[str, Exception]]:
+        """
+        여러 종목의 현재가, 최저가, 최고가, 시가, 전일종가, 누적 거래량 로드
+        :return ({종목코드: get_product_prices 결과}, {종목코드: 에러})
+        """
+        result, errors = {}, {}
+
+        for product_code, prices, error in self.iter_product_prices(product_codes, **kwargs):
+            if error is None:
+                result[product_code] = prices
+            else:
+                errors[product_code] = error
+
+        return result, errors
+
     def list_product_histories(self, product_code: str, standard: DWM = DWM.W, **kwargs) -> List[Dict]:
         """
         일자별 상세 정보 로드
@@ -504,7 +679,68 @@ class Api:
                                      product_code: str,
                                      start_date: Union[date, str],
                                      end_date: Union[date, str],
-                                     **kwargs):
+                                     use_store: bool = True,
+                                     **kwargs) -> List[Dict]:
+        """
+        일자별 현/시/고/체결량 제공(최근 일자부터)
+        환경변수 'PYEFRIEND__HISTORY_STORE'가 설정된 경우 local 저장소(store.HistoryStore)에 없는 기간만 조회
+
+        :param use_store: False일 경우 저장소를 사용하지 않고 전체 기간 조회
+        """
+        from .store import get_history_store
+
+        if isinstance(start_date, date):
+            start_date = start_date.strftime('%Y%m%d')
+
+        if isinstance(end_date, date):
+            end_date = end_date.strftime('%Y%m%d')
+
+        store = get_history_store() if use_store else None
+
+        if store is None:
+            return self.fetch_product_histories_daily(product_code, start_date, end_date, **kwargs)
+
+        def fetch(gap_start: str, gap_end: str) -> Tuple[List[Dict], bool]:
+            records = self.fetch_product_histories_daily(product_code, gap_start, gap_end, **kwargs)
+            # max_pages에서 연속 조회가 끝난 경우(다음 page 존재) 기간 전체를 조회하지 않음
+            return records, kwargs.get('max_pages') is None or not self.has_next_data
+
+        market = Market.DOMESTIC if self.is_domestic else Market.OVERSEAS
+        return store.get_or_fetch(market.value, product_code, start_date, end_date, fetch=fetch)
+
+    def iter_product_histories_daily(self,
+                                     product_code: str,
+                                     start_date: Union[date, str],
+                                     end_date: Union[date, str],
+                                     use_store: bool = True,
+                                     **kwargs) -> Iterator[List[Dict]]:
+        """
+        list_product_histories_daily의 page 단위 generator(최근 일자부터)
+        - 저장소를 사용하지 않는 경우 서버 연속 조회 page를 받는 대로 반환
+        - 저장소를 사용하는 경우 조회하지 않은 기간을 채운 뒤 저장소 결과를 한 page로 반환
+        """
+        from .store import get_history_store
+
+        if (get_history_store() if use_store else None) is None:
+            yield from self.iter_fetch_product_histories_daily(product_code, start_date, end_date, **kwargs)
+        else:
+            yield self.list_product_histories_daily(product_code, start_date, end_date, **kwargs)
+
+    def fetch_product_histories_daily(self,
+                                      product_code: str,
+                                      start_date: Union[date, str],
+                                      end_date: Union[date, str],
+                                      **kwargs) -> List[Dict]:
+        """ 서버에서 일자별 현/시/고/체결량 조회(저장소 미사용) """
+        pages = self.iter_fetch_product_histories_daily(product_code, start_date, end_date, **kwargs)
+        return [record for page in pages for record in page]
+
+    def iter_fetch_product_histories_daily(self,
+                                           product_code: str,
+                                           start_date: Union[date, str],
+                                           end_date: Union[date, str],
+                                           **kwargs) -> Iterator[List[Dict]]:
+        """ fetch_product_histories_daily의 page 단위 generator """
         raise NotImplementedError('해당 함수가 설정되어야 합니다.')
 
     def buy_stock(self, product_code: str, count: int, price: int = 0, **kwargs) -> str:
@@ -521,6 +757,54 @@ class Api:
         """
         raise NotImplementedError('해당 함수가 설정되어야 합니다.')
 
+    def submit_orders(self,
+                      orders: Iterable[Union[Order, Dict]],
+                      stop_on_error: bool = False,
+                      retries: int = ORDER_RETRIES) -> OrderBatch:
+        """
+        여러 주문을 검증한 뒤 연속으로 제출(order.py 참고)
+        - 하나라도 잘못된 주문이 있으면 아무것도 주문하지 않고 InvalidOrderException
+        - 주문 간격은 controller throttle(ServiceClass.ORDER)이 조절
+        - 요청 제한 응답시(throttle backoff 후) retries만큼 다시 제출
+
+        :param orders: Order 혹은 dict(side, product_code, count, price, market_code) 리스트
+        :param stop_on_error: 주문 에러 발생시 남은 주문을 제출하지 않음
+        """
+        orders = validate_orders(orders, is_domestic=self.is_domestic)
+        results = []
+        stopped = False
+        started = time.perf_counter()
+
+        for order in orders:
+            if stopped:
+                results.append(OrderResult(order=order, error='이전 주문 에러로 제출하지 않았습니다.'))
+                continue
+
+            place = self.buy_stock if order.side == 'buy' else self.sell_stock
+
+            for attempt in range(retries + 1):
+                try:
+                    order_num = place(product_code=order.product_code,
+                                      count=order.count,
+                                      price=order.price,
+                                      market_code=order.market_code)
+                    result = OrderResult(order=order, order_num=order_num, submitted=True)
+
+                except RateLimitException as e:
+                    result = OrderResult(order=order, error=f'{e.__class__.__name__}: {e.detail}', submitted=True)
+                    continue
+
+                except Exception as e:
+                    result = OrderResult(order=order,
+                                         error=f'{e.__class__.__name__}: {getattr(e, "detail", str(e))}',
+                                         submitted=True)
+                break
+
+            results.append(result)
+            stopped = stop_on_error and not result.ok
+
+        return OrderBatch(results=results, elapsed=time.perf_counter() - started)
+
     def get_processed_orders(self, start_date: str = None, **kwargs) -> List[Dict]:
         """ start_date 이후의 체결된 주문 리스트 반환 """
         raise NotImplementedError('해당 함수가 설정되어야 합니다.')
@@ -548,6 +832,23 @@ class DomesticApi(Api):
     def unit(self):
         return Unit.KRW
 
+    def get_product_name(self, product_code: str, **kwargs) -> str:
+        """ 종목명(종목 마스터, 마스터에 없는 경우 get_product_info) """
+        master = get_or_create_stock_master(controller=self.controller, logger=self.logger)
+        name = master.name(product_code) if master is not None else None
+        return name or super().get_product_name(product_code, **kwargs)
+
+    def is_valid_product(self, product_code: str) -> bool:
+        """ 종목 마스터에 존재하는 종목코드인지 여부(마스터를 불러오지 못한 경우 True) """
+        master = get_or_create_stock_master(controller=self.controller, logger=self.logger)
+        return master is None or product_code in master
+
+    def search_products(self, product_name: str, limit: int = 20) -> List[Dict]:
+        """ 종목명으로 시작하는 종목 검색(종목 마스터) """
+        master = get_or_create_stock_master(controller=self.controller, logger=self.logger)
+        return master.search(product_name, limit=limit) if master is not None else []
+
+    @cached(Service.KST03010100)
     def get_product_info(self, product_code: str, **kwargs) -> dict:
         mapping = [
             (6, 'sector_code')
@@ -574,6 +875,7 @@ class DomesticApi(Api):
 
         return response_data
 
+    @cached(Service.SCP)
     def get_product_prices(self, product_code: str, **kwargs) -> Tuple[int, int, int, int, int, int]:
         # set
         (
@@ -595,7 +897,9 @@ class DomesticApi(Api):
     def list_product_histories(self,
                                product_code: str,
                                standard: DWM = DWM.D,
+                               max_pages: Optional[int] = 1,
                                **kwargs) -> List[Dict]:
+        """ :param max_pages: 연속 조회 최대 page 수(기본 1 page, None일 경우 전체) """
         columns = [
             dict(index=0, key='standard_date', not_null=True),
             dict(index=3, key='minimum', dtype=int),
@@ -605,20 +909,24 @@ class DomesticApi(Api):
             dict(index=5, key='volume', dtype=int),
         ]
 
-        return (
+        return list(
             self.set_data(0, 'J')  # 0: 시장분류코드 / J: 주식, ETF, ETN
                 .set_data(1, product_code)  # 1: 종목코드
                 .set_data(2, standard.value)  # D: 일/ W: 주/ M: 월
-                .request_data(Service.SCPD)
-                .get_data(multiple=True, columns=columns)
+                .iter_records(Service.SCPD, columns=columns, max_pages=max_pages)
         )
 
-    def list_product_histories_daily(self,
-                                     product_code: str,
-                                     start_date: Union[date, str],
-                                     end_date: Union[date, str],
-                                     **kwargs):
-        """ 일자별 현/시/고/체결량 제공 """
+    def iter_fetch_product_histories_daily(self,
+                                           product_code: str,
+                                           start_date: Union[date, str],
+                                           end_date: Union[date, str],
+                                           max_pages: int = None,
+                                           **kwargs) -> Iterator[List[Dict]]:
+        """
+        일자별 현/시/고/체결량 제공(연속 조회 page 단위)
+
+        :param max_pages: 연속 조회 최대 page 수(None일 경우 전체)
+        """
 
         if isinstance(start_date, date):
             start_date = start_date.strftime('%Y%m%d')
@@ -626,17 +934,6 @@ class DomesticApi(Api):
         if isinstance(end_date, date):
             end_date = end_date.strftime('%Y%m%d')
 
-        (
-            self
-                .set_data(0, 'J')
-                .set_data(1, product_code)  # 1: 종목코드
-                .set_data(0, 'J', 1)
-                .set_data(1, product_code, 1)
-                .set_data(2, start_date, 1)
-                .set_data(3, end_date, 1)
-                .request_data(Service.KST03010100)
-        )
-
         columns = [
             dict(index=0, key='standard_date', not_null=True),
             dict(index=4, key='minimum', dtype=float),
@@ -645,9 +942,18 @@ class DomesticApi(Api):
             dict(index=1, key='closing', dtype=float, not_null=True),
             dict(index=5, key='volume', dtype=int),
         ]
-        data = self.get_data(multiple=True, columns=columns, block_index=1)
-        data = [e for e in data if e['closing'] != 0]
-        return data
+
+        pages = (
+            self
+                .set_data(0, 'J')
+                .set_data(1, product_code)  # 1: 종목코드
+                .set_data(0, 'J', 1)
+                .set_data(1, product_code, 1)
+                .set_data(2, start_date, 1)
+                .set_data(3, end_date, 1)
+                .iter_pages(Service.KST03010100, columns=columns, block_index=1, max_pages=max_pages)
+        )
+        return ([e for e in page if e['closing'] != 0] for page in pages)
 
     def get_sector_info(self, sector_code: str, **kwargs) -> dict:
         mapping = [
@@ -681,6 +987,19 @@ class DomesticApi(Api):
                               sector_code: str,
                               start_date: str = None,
                               standard: DWM = DWM.D):
+        pages = self.iter_sector_histories(sector_code, start_date=start_date, standard=standard, max_pages=1)
+        return [record for page in pages for record in page]
+
+    def iter_sector_histories(self,
+                              sector_code: str,
+                              start_date: str = None,
+                              standard: DWM = DWM.D,
+                              max_pages: int = None) -> Iterator[List[Dict]]:
+        """
+        list_sector_histories의 연속 조회 page 단위 generator
+
+        :param max_pages: 연속 조회 최대 page 수(None일 경우 전체)
+        """
         today = datetime.today().strftime('%Y%m%d')
 
         if start_date is None:
@@ -702,10 +1021,10 @@ class DomesticApi(Api):
                 .set_data(1, sector_code, 1)  # 1: 종목코드
                 .set_data(2, start_date, 1)
                 .set_data(3, standard.value, 1)  # D: 일/ W: 주/ M: 월
-                .request_data(Service.PUP02120000)
-                .get_data(multiple=True, columns=columns, block_index=1)
+                .iter_pages(Service.PUP02120000, columns=columns, block_index=1, max_pages=max_pages)
         )
 
+    @invalidate_cache
     def buy_stock(self,
                   product_code: str,
                   count: int,
@@ -721,6 +1040,7 @@ class DomesticApi(Api):
                 .get_data(1)  # 1: 주문번호
         )
 
+    @invalidate_cache
     def sell_stock(self,
                    product_code: str,
                    count: int,
@@ -757,15 +1077,14 @@ class DomesticApi(Api):
             dict(index=14, key='is_cancel'),
         ]
 
-        return (
+        return list(
             self.set_account_info()  # 계정 정보
                 .set_data(3, start_date)
                 .set_data(4, today)
                 .set_data(5, '00')  # 매도매수구분코드  전체: 00 / 매도: 01 / 매수: 02
                 .set_data(6, '00')  # 조회구분        역순: 00 / 정순: 01
                 .set_data(8, '01')  # 체결구분        전체: 00 / 체결: 01 / 미체결: 02
-                .request_data(Service.TC8001R)
-                .get_data(multiple=True, columns=columns)
+                .iter_records(Service.TC8001R, columns=columns)
         )
 
     def get_unprocessed_orders(self, **kwargs) -> List[Dict]:
@@ -781,13 +1100,13 @@ class DomesticApi(Api):
             dict(index=11, key='executed_amount'),
         ]
 
-        return (
+        return list(
             self.set_account_info()  # 계정 정보
                 .set_data(5, '0')  # 조회구분      주문순: 0 / 종목순 1
-                .request_data(Service.SMCP)
-                .get_data(multiple=True, columns=columns)
+                .iter_records(Service.SMCP, columns=columns)
         )
 
+    @invalidate_cache
     def cancel_order(self,
                      order_num: str,
                      count: int,
@@ -802,6 +1121,7 @@ class DomesticApi(Api):
                 .get_data(1)  # 1: 주문번호
         )
 
+    @invalidate_cache
     def cancel_all_unprocessed_orders(self, **kwargs) -> List[str]:
         unprocessed_orders = self.get_unprocessed_orders()
 
@@ -817,6 +1137,7 @@ class DomesticApi(Api):
 
         return results
 
+    @cached(Service.SCPH)
     def get_spread(self, product_code: str, **kwargs):
         """ 종목 현재시간 기준 매수/매도호가 정보 """
         (
@@ -839,7 +1160,7 @@ class DomesticApi(Api):
             *[dict(index=i, key=f'ask_count_icdc_{order}', dtype=int) for order, i in enumerate(range(41, 51))],
             *[dict(index=i, key=f'bid_count_icdc_{order}', dtype=int) for order, i in enumerate(range(51, 61))],
         ]
-        data = self.get_data(multiple=True, columns=columns)[0]
+        data = self.get_data(multiple=True, columns=columns, columnar=True).row(0)
         return {
             'accepted_time': data['accepted_time'],
             'total_ask_count': data['total_ask_count'],
@@ -1033,6 +1354,7 @@ class OverSeasApi(Api):
         )
         return self.get_data(0)
 
+    @cached(Service.KST03010100)
     def get_product_info(self, product_code: str, market_code: str = None, **kwargs) -> dict:
         price, *_ = self.get_product_prices(product_code=product_code, market_code=market_code)
 
@@ -1052,6 +1374,7 @@ class OverSeasApi(Api):
 
         return response_data
 
+    @cached(Service.OS_ST02)
     def get_product_prices(self,
                            product_code: str,
                            market_code: str = None,
@@ -1086,7 +1409,9 @@ class OverSeasApi(Api):
                                standard: DWM = DWM.D,
                                market_code: str = None,
                                standard_date: str = None,
+                               max_pages: Optional[int] = 1,
                                **kwargs) -> List[Dict]:
+        """ :param max_pages: 연속 조회 최대 page 수(기본 1 page, None일 경우 전체) """
         if standard == DWM.D:
             standard = '0'
         elif standard == DWM.W:
@@ -1102,26 +1427,24 @@ class OverSeasApi(Api):
             dict(index=1, key='closing', dtype=float),
             dict(index=8, key='volume', dtype=int),
         ]
-        data = (
+        records = (
             self.set_auth(0)  # 권한 확인
                 .set_data(1, MarketCode.as_short(market_code))
                 .set_data(2, product_code)  # 1: 종목코드
                 .set_data(3, standard)
                 .set_data(4, standard_date)
-                .request_data(Service.OS_ST03)
-                .get_data(multiple=True, columns=columns, block_index=1)
+                .iter_records(Service.OS_ST03, columns=columns, block_index=1, max_pages=max_pages)
         )
-        data = [e for e in data if e['closing'] != 0]
 
-        return data
+        return [e for e in records if e['closing'] != 0]
 
-    def list_product_histories_daily(self,
-                                     product_code: str,
-                                     start_date: Union[date, str],
-                                     end_date: Union[date, str],
-                                     market_code: str = None,
-                                     **kwargs):
-        """ 일자별 현/시/고/체결량 제공 """
+    def iter_fetch_product_histories_daily(self,
+                                           product_code: str,
+                                           start_date: Union[date, str],
+                                           end_date: Union[date, str],
+                                           market_code: str = None,
+                                           **kwargs) -> Iterator[List[Dict]]:
+        """ 일자별 현/시/고/체결량 제공(standard_date 기준 page 단위) """
 
         if isinstance(start_date, date):
             start_date = start_date.strftime('%Y%m%d')
@@ -1132,34 +1455,35 @@ class OverSeasApi(Api):
         histories = self.list_product_histories(product_code=product_code,
                                                 standard=DWM.D,
                                                 market_code=market_code,
-                                                standard_date=end_date)
+                                                standard_date=end_date,
+                                                max_pages=1)  # standard_date 기준으로 직접 페이징
 
         if len(histories) < 100:
             # restrict
-            return [history for history in histories if history['standard_date'] >= start_date]
+            yield [history for history in histories if history['standard_date'] >= start_date]
+            return
 
         while True:
-            # get last date
-            last_date = histories.pop(-1)['standard_date']
+            # get last date(다음 page의 첫 record와 중복)
+            last_date = histories[-1]['standard_date']
+
+            # restrict
+            yield [history for history in histories[:-1] if history['standard_date'] >= start_date]
 
             # break
             if start_date > last_date:
                 break
 
-            new_histories = self.list_product_histories(product_code=product_code,
-                                                        standard=DWM.D,
-                                                        market_code=market_code,
-                                                        standard_date=last_date)
+            histories = self.list_product_histories(product_code=product_code,
+                                                    standard=DWM.D,
+                                                    market_code=market_code,
+                                                    standard_date=last_date,
+                                                    max_pages=1)
 
-            if len(new_histories) < 2:
+            if len(histories) < 2:
                 break
 
-            # append
-            histories += new_histories
-
-        # restrict
-        return [history for history in histories if history['standard_date'] >= start_date]
-
+    @invalidate_cache
     def buy_stock(self,
                   product_code: str,
                   count: int,
@@ -1178,6 +1502,7 @@ class OverSeasApi(Api):
                 .get_data(1)  # 1: 주문번호
         )
 
+    @invalidate_cache
     def sell_stock(self,
                    product_code: str,
                    count: int,
@@ -1216,15 +1541,14 @@ class OverSeasApi(Api):
             dict(index=16, key='is_cancel'),
         ]
 
-        return (
+        return list(
             self.set_account_info()
                 .set_data(4, start_date)
                 .set_data(5, today)
                 .set_data(6, '00')  # 매도매수구분코드  전체: 00 / 매도: 01 / 매수: 02
                 .set_data(7, '01')  # 체결구분        전체: 00 / 체결: 01 / 미체결: 02
                 .set_data(8, market_code)
-                .request_data(Service.OS_US_CCLD)
-                .get_data(multiple=True, columns=columns)
+                .iter_records(Service.OS_US_CCLD, columns=columns)
         )
 
     def get_unprocessed_orders(self, market_code: str = None, **kwargs) -> List[Dict]:
@@ -1240,13 +1564,13 @@ class OverSeasApi(Api):
             dict(index=22, key='executed_amount'),
         ]
 
-        return (
+        return list(
             self.set_account_info()  # 계정 정보
                 .set_data(3, market_code)
-                .request_data(Service.OS_US_NCCS)
-                .get_data(multiple=True, columns=columns)
+                .iter_records(Service.OS_US_NCCS, columns=columns)
         )
 
+    @invalidate_cache
     def cancel_order(self,
                      order_num: str,
                      count: int,
@@ -1263,6 +1587,7 @@ class OverSeasApi(Api):
                 .get_data(1)  # 1: 주문번호
         )
 
+    @invalidate_cache
     def cancel_all_unprocessed_orders(self, market_code: str = None, **kwargs) -> List[str]:
         unprocessed_orders = self.get_unprocessed_orders(market_code=market_code)
 
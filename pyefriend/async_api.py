@@ -0,0 +1,351 @@
+"""
+# Async API
+
+asyncio용 Api wrapper
+
+- DomesticApi/OverSeasApi와 같은 함수/property를 제공하며, 호출 결과는 awaitable로 반환
+- 실제 호출은 모두 ControllerThread(executor.py)에서 실행되므로 event loop를 block하지 않음
+- 호출 우선순위는 scheduler.API_METHOD_CLASSES에 따라 결정(주문 > 계좌 > 시세 > 히스토리)
+- 주문이 아닌 조회 함수는 같은 Api/입력값으로 진행 중인 호출이 있으면 그 결과를 함께 반환(flight.single_flight)
+- limiter(asyncio.Semaphore)/timeout을 설정하면 동시 호출 수와 대기 시간을 제한
+  (timeout은 limiter를 획득한 뒤부터 계산)
+- 여러 종목 조회(iter_product_prices)는 BATCH_CONCURRENCY개씩 나눠서 요청하며,
+  전체 제한 시간은 종목 수 / 시세 초당 요청 수(throttle)에 비례
+- page 단위 generator(iter_*)는 stream으로 controller thread에서 실행하며 page를 받는 대로 반환
+  (timeout은 page 단위로 적용, 받지 않은 page는 STREAM_BUFFER개까지만 쌓아두고 controller thread를 반환)
+
+example)
+    api = await AsyncApi.load(market='domestic', account='5005775101', password='password')
+    current, minimum, maximum, opening, base, total_volume = await api.get_product_prices('005930')
+    currency = await api.currency  # property
+
+    async for page in api.stream(api.api.iter_sector_histories, '0001'):
+        ...
+"""
+import os
+import asyncio
+import functools
+import inspect
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Optional, Tuple, Union
+
+from .api import DomesticApi, OverSeasApi
+from .const import Market, ServiceClass
+from .exceptions import StreamInterruptedException
+from .executor import ControllerThread, get_or_create_controller_thread
+from .flight import make_key, single_flight
+from .registry import get_or_create_api_registry
+from .scheduler import API_METHOD_CLASSES
+
+
+# 여러 종목 조회시 동시에 요청하는 종목 수
+BATCH_CONCURRENCY = int(os.getenv('PYEFRIEND__BATCH_CONCURRENCY', 8))
+
+# stream에서 받지 않은 page를 쌓아두는 최대 개수(초과시 page를 받을 때까지 조회를 멈춤)
+STREAM_BUFFER = int(os.getenv('PYEFRIEND__STREAM_BUFFER', 4))
+
+# 병합하지 않는 함수(controller 상태를 변경하거나 generator를 반환)
+NOT_COALESCED = frozenset({
+    'set_data',
+    'get_data',
+    'get_columns',
+    'set_account_info',
+    'request_data',
+    'request_next_data',
+    'iter_pages',
+    'iter_records',
+    'iter_product_histories_daily',
+    'iter_fetch_product_histories_daily',
+    'iter_sector_histories',
+})
+
+
+class AsyncApi:
+    """
+    :param api: ControllerThread에서 생성된 DomesticApi 혹은 OverSeasApi
+    :param executor: Api 호출을 실행할 ControllerThread
+    :param limiter: 설정한 경우 동시에 controller thread로 보내는 호출 수 제한
+    :param timeout: 호출(limiter 대기 제외) 제한 시간(초), 초과시 asyncio.TimeoutError(stream은 page 단위)
+    """
+    def __init__(self,
+                 api: Union[DomesticApi, OverSeasApi],
+                 executor: ControllerThread = None,
+                 limiter: asyncio.Semaphore = None,
+                 timeout: float = None):
+        self.api = api
+        self.executor = executor or get_or_create_controller_thread()
+        self.limiter = limiter
+        self.timeout = timeout
+
+    @classmethod
+    async def load(cls,
+                   market: Market,
+                   account: str,
+                   password: str = None,
+                   encrypted_password: str = None,
+                   logger=None,
+                   executor: ControllerThread = None,
+                   limiter: asyncio.Semaphore = None,
+                   timeout: float = None) -> 'AsyncApi':
+        """ controller thread에서 api 생성(ApiRegistry에 생성된 api 재사용) """
+        async_api = cls(None, executor=executor, limiter=limiter, timeout=timeout)
+        async_api.api = await async_api.wait(
+            lambda: async_api.executor.submit(get_or_create_api_registry().get,
+                                              market=market,
+                                              account=account,
+                                              password=password,
+                                              encrypted_password=encrypted_password,
+                                              logger=logger)
+        )
+        return async_api
+
+    async def wait(self, start: Callable[[], Future], shared: bool = False) -> Any:
+        """
+        start()로 실행한 Future의 결과 대기(limiter, timeout 적용)
+
+        :param shared: 다른 호출과 공유하는 Future인 경우 True(timeout시 취소하지 않음)
+        """
+        async def call():
+            future = asyncio.wrap_future(start())
+            return await (asyncio.shield(future) if shared else future)
+
+        async def call_with_timeout():
+            if self.timeout is None:
+                return await call()
+            return await asyncio.wait_for(call(), self.timeout)
+
+        if self.limiter is None:
+            return await call_with_timeout()
+
+        # limiter 대기 시간은 timeout에 포함하지 않음
+        async with self.limiter:
+            return await call_with_timeout()
+
+    def batch_timeout(self, count: int, service_class: ServiceClass = ServiceClass.QUOTE) -> Optional[float]:
+        """ count개 요청의 전체 제한 시간(초): timeout + count / 초당 요청 수(throttle), timeout이 없으면 None """
+        if self.timeout is None:
+            return None
+
+        throttle = getattr(self.api.controller, 'throttle', None)
+        bucket = throttle.buckets.get(service_class) if throttle is not None else None
+
+        if bucket is None:
+            return self.timeout
+
+        return self.timeout + count / bucket.rate
+
+    def run(self,
+            func: Callable,
+            *args,
+            service_class: ServiceClass = ServiceClass.QUOTE,
+            **kwargs) -> Awaitable:
+        """ controller thread에서 func(*args, **kwargs) 실행 """
+        return self.wait(lambda: self.executor.schedule(func, args, kwargs, service_class=service_class))
+
+    def run_coalesced(self,
+                      name: str,
+                      func: Callable,
+                      args: tuple = (),
+                      kwargs: dict = None,
+                      service_class: ServiceClass = ServiceClass.QUOTE) -> Awaitable:
+        """ run과 같으나 같은 Api/name/입력값으로 진행 중인 호출이 있으면 그 결과를 함께 반환 """
+        kwargs = kwargs or {}
+
+        try:
+            key = (id(self.api), make_key(args, kwargs))
+        except TypeError:
+            # hash할 수 없는 입력값은 병합하지 않음
+            return self.run(func, *args, service_class=service_class, **kwargs)
+
+        def start() -> Future:
+            return single_flight.submit(
+                name, key, lambda: self.executor.schedule(func, args, kwargs, service_class=service_class)
+            )
+
+        return self.wait(start, shared=True)
+
+    async def stream(self,
+                     func: Callable[..., Iterable],
+                     *args,
+                     service_class: ServiceClass = None,
+                     **kwargs) -> AsyncIterator:
+        """
+        controller thread에서 func(*args, **kwargs)가 반환한 iterator(ex. Api.iter_sector_histories)를 실행하며,
+        생성되는 값(page)을 받는 대로 반환
+        - 받지 않은 page가 STREAM_BUFFER개 쌓이기 전까지는 하나의 요청으로 실행(연속 조회 도중 다른 요청이 끼어들지 않음)
+        - 받지 않은 page가 STREAM_BUFFER개 쌓이면 controller thread를 반환하고, page를 받으면 새 요청으로 이어서 실행
+          (그 사이에 다른 조회가 실행되어 연속 조회 정보가 초기화된 경우 StreamInterruptedException)
+        - 반복을 중단하면 남은 page는 요청하지 않음
+        - timeout은 전체 stream이 아닌 page 하나를 받는 데 걸리는 시간에 적용
+
+        :param service_class: None일 경우 scheduler.API_METHOD_CLASSES에서 func 이름으로 결정
+        """
+        if service_class is None:
+            service_class = API_METHOD_CLASSES.get(getattr(func, '__name__', None), ServiceClass.QUOTE)
+
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        resume = asyncio.Event()  # page를 받을 때마다 설정(멈춘 producer 재개)
+        closed = threading.Event()
+        started, done = object(), object()
+
+        iterator = None
+        produced = received = 0  # producer(controller thread), consumer(event loop)만 각각 변경
+        paused_at = None  # 멈춘 시점의 controller 요청 수
+
+        def put(item, error: BaseException = None):
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, (item, error))
+            except RuntimeError:
+                # event loop 종료
+                closed.set()
+
+        def request_count() -> Optional[int]:
+            return getattr(self.api.controller, 'request_count', None)
+
+        def produce() -> bool:
+            """ 받지 않은 page가 STREAM_BUFFER개 쌓일 때까지 실행, 끝까지 실행한 경우 True """
+            nonlocal iterator, produced, paused_at
+
+            if closed.is_set():
+                return True
+
+            if iterator is None:
+                iterator = iter(func(*args, **kwargs))
+
+            elif paused_at != request_count():
+                raise StreamInterruptedException('stream이 멈춘 동안 다른 요청이 실행되어 연속 조회를 이어갈 수 없습니다.')
+
+            while not closed.is_set():
+                if produced - received >= STREAM_BUFFER:
+                    paused_at = request_count()
+                    return False
+
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return True
+
+                produced += 1
+                put(item)
+
+            return True
+
+        async def run():
+            async def call():
+                # limiter를 획득한 뒤부터 page timeout 적용
+                queue.put_nowait((started, None))
+
+                while True:
+                    resume.clear()
+                    if await asyncio.wrap_future(self.executor.schedule(produce, service_class=service_class)):
+                        return
+                    await resume.wait()
+
+            if self.limiter is None:
+                return await call()
+
+            async with self.limiter:
+                return await call()
+
+        def finished(task: asyncio.Future):
+            error = asyncio.CancelledError() if task.cancelled() else task.exception()
+            queue.put_nowait((done, error))
+
+        task = asyncio.ensure_future(run())
+        task.add_done_callback(finished)
+        timeout = None
+
+        try:
+            while True:
+                item, error = await asyncio.wait_for(queue.get(), timeout)
+                if item is started:
+                    timeout = self.timeout
+                    continue
+                if item is done:
+                    if error is not None:
+                        raise error
+                    break
+                received += 1
+                resume.set()
+                yield item
+        finally:
+            closed.set()
+            task.cancel()
+
+    async def iter_product_prices(self,
+                                  product_codes: Iterable[str],
+                                  **kwargs) -> AsyncIterator[Tuple[str, Optional[Tuple], Optional[Exception]]]:
+        """
+        Api.iter_product_prices의 async 버전
+        - cache된 종목은 controller thread를 거치지 않고 바로 반환
+        - 나머지 종목은 BATCH_CONCURRENCY개씩 요청하여(limiter, throttle 적용) 완료된 순서대로 반환
+        - 전체 제한 시간(batch_timeout)을 넘긴 뒤 남은 종목은 요청하지 않고 asyncio.TimeoutError로 반환
+        - 반복을 중단하면 아직 요청하지 않은 종목은 취소
+        """
+        product_codes = list(dict.fromkeys(product_codes))
+        peek = getattr(self.api.get_product_prices, 'peek', None)
+        missing = []
+
+        for product_code in product_codes:
+            found, prices = peek(self.api, product_code, **kwargs) if peek else (False, None)
+            if found:
+                yield product_code, prices, None
+            else:
+                missing.append(product_code)
+
+        loop = asyncio.get_running_loop()
+        pending = deque(missing)
+        results = asyncio.Queue()
+        timeout = self.batch_timeout(len(missing))
+        deadline = loop.time() + timeout if timeout is not None else None
+
+        async def fetch():
+            # 전체 종목의 task를 한 번에 만들지 않고 worker가 차례로 요청
+            while pending:
+                product_code = pending.popleft()
+
+                if deadline is not None and loop.time() > deadline:
+                    await results.put((product_code, None, asyncio.TimeoutError(f'전체 제한 시간({timeout:.1f}초) 초과')))
+                    continue
+
+                try:
+                    await results.put((product_code, await self.get_product_prices(product_code, **kwargs), None))
+                except Exception as e:
+                    await results.put((product_code, None, e))
+
+        workers = [asyncio.ensure_future(fetch()) for _ in range(min(BATCH_CONCURRENCY, len(missing)))]
+        try:
+            for _ in range(len(missing)):
+                yield await results.get()
+        finally:
+            for worker in workers:
+                worker.cancel()
+
+    def __getattr__(self, name: str) -> Any:
+        service_class = API_METHOD_CLASSES.get(name, ServiceClass.QUOTE)
+        coalesce = service_class != ServiceClass.ORDER and name not in NOT_COALESCED
+
+        # property는 controller thread에서 계산
+        attr = inspect.getattr_static(self.api, name)
+        if isinstance(attr, property):
+            if coalesce:
+                return self.run_coalesced(name, getattr, (self.api, name), service_class=service_class)
+            return self.run(getattr, self.api, name, service_class=service_class)
+
+        value = getattr(self.api, name)
+        if not callable(value):
+            return value
+
+        @functools.wraps(value)
+        async def method(*args, **kwargs):
+            if coalesce:
+                return await self.run_coalesced(name, value, args, kwargs, service_class=service_class)
+            return await self.run(value, *args, service_class=service_class, **kwargs)
+
+        return method
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.api.__class__.__name__}, account={self.api.account})'
@@ -0,0 +1,274 @@
+"""
+# Cache
+
+시세 조회 결과 read-through cache
+
+- (cache 이름, 입력값)별로 결과를 저장하며, cache 이름(서비스)별 TTL이 지나면 다시 조회
+- 최대 갯수를 넘으면 가장 오래 사용하지 않은 항목부터 제거(LRU)
+- 같은 key를 동시에 조회하는 경우 한 번만 요청하고 나머지는 결과를 기다림(single-flight)
+  TTL이 0인 이름도 저장만 하지 않을 뿐 flight.single_flight로 병합
+- 주문 함수는 invalidate_cache로 해당 종목의 시세 항목을 제거
+- TTL은 환경변수로 변경 가능(0일 경우 cache하지 않음)
+    ex) PYEFRIEND__CACHE_TTLS='SCP=0.5,product_name=3600'
+
+* 반환값은 cache된 객체 그대로이므로 수정하지 않아야 합니다.
+"""
+import os
+import time
+import inspect
+import functools
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from .const import Service
+from .flight import single_flight
+from .metrics import metrics
+
+
+# cache 이름별 기본 TTL(초), 없는 경우 cache하지 않음
+DEFAULT_TTLS: Dict[str, float] = {
+    Service.SCP: 1.,  # 국내 현재가
+    Service.SCPH: 1.,  # 국내 호가
+    Service.OS_ST02: 1.,  # 해외 현재가(OS_ST02 + OS_ST01)
+    Service.KST03010100: 1.,  # 종목 정보(현재가 포함)
+    'product_name': 60 * 60 * 24.,  # 종목명
+}
+
+# 주문 후 제거할 cache 이름(시세)
+ORDER_INVALIDATES = (
+    Service.SCP,
+    Service.SCPH,
+    Service.OS_ST02,
+    Service.KST03010100,
+)
+
+# 기본 최대 항목 수
+DEFAULT_MAXSIZE = 4096
+
+
+# [Section] Modules
+
+def parse_ttls(value: str) -> Dict[str, float]:
+    """ 'SCP=1,product_name=86400' -> {'SCP': 1., 'product_name': 86400.} """
+    ttls = {}
+    for item in value.split(','):
+        if not item.strip():
+            continue
+        name, ttl = item.split('=')
+        ttls[name.strip()] = float(ttl)
+    return ttls
+
+
+class CacheStat:
+    """ cache 이름별 통계 """
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0  # 진행중인 요청의 결과를 기다린 횟수
+        self.invalidated = 0
+
+
+class TTLCache:
+    """
+    :param ttls: {cache 이름: TTL(초)}, 설정하지 않은 이름은 DEFAULT_TTLS 혹은 환경변수 값 사용
+    :param maxsize: 최대 항목 수
+    """
+    def __init__(self, ttls: Dict[str, float] = None, maxsize: int = None):
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(parse_ttls(os.getenv('PYEFRIEND__CACHE_TTLS', '')))
+        self.ttls.update(ttls or {})
+        self.maxsize = maxsize or int(os.getenv('PYEFRIEND__CACHE_SIZE', DEFAULT_MAXSIZE))
+        self.evicted = 0
+
+        # {(name, key): (만료 시각, 값)}
+        self.entries: 'OrderedDict[Tuple[str, Hashable], Tuple[float, Any]]' = OrderedDict()
+        self.stats: Dict[str, CacheStat] = {}
+        self._inflight: Dict[Tuple[str, Hashable], Future] = {}
+        self._lock = threading.Lock()
+
+    def _stat(self, name: str) -> CacheStat:
+        stat = self.stats.get(name)
+        if stat is None:
+            stat = self.stats[name] = CacheStat()
+        return stat
+
+    def get_or_load(self, name: str, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """ cache된 값이 없거나 만료되었을 경우 loader() 결과를 저장 후 반환 """
+        ttl = self.ttls.get(name)
+        if not ttl:
+            return single_flight.do(name, key, loader)
+
+        cache_key = (name, key)
+
+        with self._lock:
+            stat = self._stat(name)
+            entry = self.entries.get(cache_key)
+
+            if entry is not None and entry[0] > time.monotonic():
+                self.entries.move_to_end(cache_key)
+                stat.hits += 1
+                return entry[1]
+
+            future = self._inflight.get(cache_key)
+            if future is not None:
+                stat.coalesced += 1
+                owner = False
+            else:
+                stat.misses += 1
+                future = self._inflight[cache_key] = Future()
+                owner = True
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = loader()
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(cache_key, None)
+            future.set_exception(e)
+            raise
+
+        self.put(name, key, value, ttl=ttl)
+
+        with self._lock:
+            self._inflight.pop(cache_key, None)
+        future.set_result(value)
+
+        return value
+
+    def peek(self, name: str, key: Hashable) -> Tuple[bool, Any]:
+        """ 만료되지 않은 값이 있으면 (True, 값), 없으면 (False, None)(조회하지 않음) """
+        with self._lock:
+            entry = self.entries.get((name, key))
+
+            if entry is None or entry[0] <= time.monotonic():
+                return False, None
+
+            self.entries.move_to_end((name, key))
+            self._stat(name).hits += 1
+            return True, entry[1]
+
+    def put(self, name: str, key: Hashable, value: Any, ttl: float = None):
+        ttl = self.ttls.get(name) if ttl is None else ttl
+        if not ttl:
+            return
+
+        cache_key = (name, key)
+
+        with self._lock:
+            self.entries[cache_key] = (time.monotonic() + ttl, value)
+            self.entries.move_to_end(cache_key)
+
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evicted += 1
+
+    def invalidate(self, *names: str, match: Any = None) -> int:
+        """
+        항목 제거
+
+        :param names: 제거할 cache 이름(없을 경우 전체)
+        :param match: 설정한 경우 key(입력값)에 match가 포함된 항목만 제거(ex. 종목코드)
+        :return: 제거한 항목 수
+        """
+        with self._lock:
+            targets = [
+                cache_key for cache_key in self.entries
+                if (not names or cache_key[0] in names) and (match is None or match in cache_key[1])
+            ]
+            for cache_key in targets:
+                del self.entries[cache_key]
+                self._stat(cache_key[0]).invalidated += 1
+
+        return len(targets)
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+
+    def snapshot(self) -> dict:
+        """ cache 이름별 hit/miss """
+        with self._lock:
+            return {
+                'size': len(self.entries),
+                'maxsize': self.maxsize,
+                'evicted': self.evicted,
+                'names': {
+                    name: {
+                        'ttl': self.ttls.get(name),
+                        'hits': stat.hits,
+                        'misses': stat.misses,
+                        'coalesced': stat.coalesced,
+                        'invalidated': stat.invalidated,
+                        'hit_rate': stat.hits / (stat.hits + stat.misses) if stat.hits + stat.misses else 0.,
+                    }
+                    for name, stat in self.stats.items()
+                }
+            }
+
+
+def _bind_key(signature: inspect.Signature, args: tuple, kwargs: dict) -> tuple:
+    """ (self, *args, **kwargs) -> self를 제외한 입력값 tuple(positional/keyword 호출 모두 같은 key) """
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    key = []
+    for value in list(bound.arguments.values())[1:]:
+        if isinstance(value, dict):
+            value = tuple(sorted(value.items()))
+        key.append(value)
+    return tuple(key)
+
+
+def cached(name: str):
+    """
+    Api 함수 결과를 quote_cache에 저장하는 decorator
+
+    - use_cache=False로 호출하면 cache를 사용하지 않고 조회(결과는 저장)
+    - func.peek(self, *args, **kwargs)로 조회하지 않고 cache된 값만 확인 가능(TTLCache.peek)
+    """
+    def decorator(func: Callable):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, use_cache: bool = True, **kwargs):
+            key = _bind_key(signature, args, kwargs)
+
+            if not use_cache:
+                value = func(*args, **kwargs)
+                quote_cache.put(name, key, value)
+                return value
+
+            return quote_cache.get_or_load(name, key, lambda: func(*args, **kwargs))
+
+        def peek(*args, **kwargs) -> Tuple[bool, Any]:
+            return quote_cache.peek(name, _bind_key(signature, args, kwargs))
+
+        wrapper.peek = peek
+        return wrapper
+
+    return decorator
+
+
+def invalidate_cache(func: Callable):
+    """ 주문 함수용 decorator, 실행 후 해당 종목(product_code)의 시세 항목 제거(종목이 없을 경우 전체 시세) """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            bound = signature.bind(*args, **kwargs)
+            quote_cache.invalidate(*ORDER_INVALIDATES, match=bound.arguments.get('product_code'))
+
+    return wrapper
+
+
+# [Section] Variables
+
+quote_cache = TTLCache()
+
+metrics.register('cache', quote_cache.snapshot)
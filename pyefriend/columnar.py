@@ -0,0 +1,190 @@
+"""
+# Columnar
+
+다건(Multi) 조회 결과를 column 단위 array로 보관
+
+- int/float column은 array.array('q'/'d'), 그 외 column은 list로 보관
+- row(dict) 형태가 필요한 경우 rows()로 변환
+- column 정의(list of dict)는 ExtractionPlan으로 한 번만 compile하여 (service, block_index, column 정의)별로 재사용
+"""
+from array import array
+from functools import partial
+from itertools import compress
+from typing import Any, Callable, Dict, List, NamedTuple, Sequence, Tuple
+
+
+# dtype별 array typecode
+TYPECODES = {
+    int: 'q',
+    float: 'd',
+}
+
+
+# 캐시할 ExtractionPlan 최대 갯수(초과시 초기화)
+PLAN_CACHE_SIZE = 1024
+
+# [Section] Variables
+
+_plans: Dict[tuple, 'ExtractionPlan'] = {}
+
+
+# [Section] Modules
+
+def _identity(values: List[str]) -> List[str]:
+    return values
+
+
+def _to_array(typecode: str, dtype: Callable, values: List[str]) -> array:
+    return array(typecode, map(dtype, values))
+
+
+def _to_list(dtype: Callable, values: List[str]) -> list:
+    return list(map(dtype, values))
+
+
+def column_converter(dtype: Callable = str) -> Callable[[List[str]], Sequence]:
+    """ dtype -> column 전체를 변환하는 함수 """
+    if dtype is str:
+        return _identity
+
+    typecode = TYPECODES.get(dtype)
+
+    if typecode is not None:
+        return partial(_to_array, typecode, dtype)
+
+    return partial(_to_list, dtype)
+
+
+def convert_column(values: List[str], dtype: Callable = str) -> Sequence:
+    """ column 전체를 한 번에 type 변환 """
+    return column_converter(dtype)(values)
+
+
+class ColumnarData:
+    """
+    column 단위 조회 결과
+
+    :param columns: {column key: array 혹은 list}, 모든 column의 길이는 같아야 함
+    """
+    def __init__(self, columns: Dict[str, Sequence]):
+        self.columns = columns
+        self._length = len(next(iter(columns.values()))) if columns else 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, key: str) -> Sequence:
+        return self.columns[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.columns
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(columns={list(self.columns)}, length={self._length})'
+
+    def keys(self) -> List[str]:
+        return list(self.columns)
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """ index 번째 record를 dict로 반환 """
+        return {key: values[index] for key, values in self.columns.items()}
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """ 전체 record를 dict list로 반환 """
+        keys = list(self.columns)
+        return [dict(zip(keys, values)) for values in zip(*self.columns.values())]
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """ {column key: numpy.ndarray} """
+        import numpy as np
+
+        return {key: np.asarray(values) for key, values in self.columns.items()}
+
+    def to_frame(self):
+        """ pandas.DataFrame 변환 """
+        import pandas as pd
+
+        return pd.DataFrame(self.to_numpy(), columns=self.keys())
+
+
+class ExtractionPlan(NamedTuple):
+    """
+    compile된 column 정의(immutable)
+
+    :param keys: column key
+    :param indexes: field index
+    :param converters: column 변환 함수
+    :param not_null: not_null column 위치(값이 ''인 record 제외)
+    :param nullable: 나머지 column 위치
+    """
+    keys: Tuple[str, ...]
+    indexes: Tuple[int, ...]
+    converters: Tuple[Callable[[List[str]], Sequence], ...]
+    not_null: Tuple[int, ...]
+    nullable: Tuple[int, ...]
+
+    @classmethod
+    def compile(cls, columns: List[Dict]) -> 'ExtractionPlan':
+        """ [{'key': ..., 'index': ..., 'dtype': ..., 'not_null': ...}, ...] -> ExtractionPlan """
+        not_null = tuple(pos for pos, column in enumerate(columns) if column.get('not_null', False))
+
+        return cls(keys=tuple(column['key'] for column in columns),
+                   indexes=tuple(column['index'] for column in columns),
+                   converters=tuple(column_converter(column.get('dtype', str)) for column in columns),
+                   not_null=not_null,
+                   nullable=tuple(pos for pos in range(len(columns)) if pos not in not_null))
+
+    def execute(self,
+                get_multi_data: Callable[[int, int, int], str],
+                block_index: int,
+                record_count: int) -> ColumnarData:
+        """
+        - not_null column을 먼저 조회하여 유효한 record를 선별한 뒤, 나머지 column은 유효한 record만 조회
+        - type 변환은 column 단위로 한 번에 수행
+
+        :param get_multi_data: controller.GetMultiData
+        """
+        indexes = self.indexes
+        records = range(record_count)
+        raw: List[List[str]] = [None] * len(indexes)
+
+        for i, pos in enumerate(self.not_null):
+            index = indexes[pos]
+            values = [get_multi_data(block_index, record_idx, index) for record_idx in records]
+
+            if '' in values:
+                mask = [value != '' for value in values]
+                records = list(compress(records, mask))
+                values = list(compress(values, mask))
+
+                for prev in self.not_null[:i]:
+                    raw[prev] = list(compress(raw[prev], mask))
+
+            raw[pos] = values
+
+        for pos in self.nullable:
+            index = indexes[pos]
+            raw[pos] = [get_multi_data(block_index, record_idx, index) for record_idx in records]
+
+        return ColumnarData({
+            key: convert(values)
+            for key, convert, values in zip(self.keys, self.converters, raw)
+        })
+
+
+def get_plan(service: str, block_index: int, columns: List[Dict]) -> ExtractionPlan:
+    """ (service, block_index, column 정의)별로 캐시된 ExtractionPlan 반환 """
+    cache_key = (service, block_index, tuple(
+        (column['key'], column['index'], column.get('dtype', str), column.get('not_null', False))
+        for column in columns
+    ))
+
+    plan = _plans.get(cache_key)
+
+    if plan is None:
+        if len(_plans) >= PLAN_CACHE_SIZE:
+            _plans.clear()
+
+        plan = _plans[cache_key] = ExtractionPlan.compile(columns)
+
+    return plan
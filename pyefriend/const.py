@@ -6,6 +6,12 @@ class System:
     PROGID = 'ITGExpertCtl.ITGExpertCtlCtrl.1'
 
 
+class Backend(str, Enum):
+    """ Controller backend """
+    QAX = 'qax'  # efriend expert(QAxWidget)
+    SIMULATOR = 'simulator'  # in-process simulator(benchmark/test 용)
+
+
 class Market(str, Enum):
     """ 타겟 """
     DOMESTIC = 'domestic'  # 국내
@@ -51,6 +57,50 @@ class Service:
     OS_COMM = 'OS_COMM'
 
 
+class ServiceClass(str, Enum):
+    """ 서비스 분류(요청 제한/우선순위 단위) """
+    QUOTE = 'quote'  # 시세 조회
+    ACCOUNT = 'account'  # 계좌/주문내역 조회
+    ORDER = 'order'  # 주문
+    HISTORY = 'history'  # 일/주/월별, 분별 히스토리 조회
+
+    @classmethod
+    def of(cls, service: str) -> 'ServiceClass':
+        return SERVICE_CLASSES.get(service, cls.QUOTE)
+
+
+# 분류되지 않은 서비스는 QUOTE
+SERVICE_CLASSES = {
+    # 주문
+    Service.SCABO: ServiceClass.ORDER,
+    Service.SCAAO: ServiceClass.ORDER,
+    Service.SMCO: ServiceClass.ORDER,
+    Service.OS_US_BUY: ServiceClass.ORDER,
+    Service.OS_US_SEL: ServiceClass.ORDER,
+    Service.OS_US_CNC: ServiceClass.ORDER,
+
+    # 계좌
+    Service.SCAP: ServiceClass.ACCOUNT,
+    Service.SATPS: ServiceClass.ACCOUNT,
+    Service.TC8001R: ServiceClass.ACCOUNT,
+    Service.SMCP: ServiceClass.ACCOUNT,
+    Service.OS_CH_DNCL: ServiceClass.ACCOUNT,
+    Service.OS_US_DNCL: ServiceClass.ACCOUNT,
+    Service.OS_US_CBLC: ServiceClass.ACCOUNT,
+    Service.OS_OS3004R: ServiceClass.ACCOUNT,
+    Service.OS_US_CCLD: ServiceClass.ACCOUNT,
+    Service.OS_US_NCCS: ServiceClass.ACCOUNT,
+
+    # 히스토리
+    Service.SCPD: ServiceClass.HISTORY,
+    Service.PST01010300: ServiceClass.HISTORY,
+    Service.PUP02100200: ServiceClass.HISTORY,
+    Service.OS_ST03: ServiceClass.HISTORY,
+    Service.PFX06910200: ServiceClass.HISTORY,
+    Service.PFX06910000: ServiceClass.HISTORY,
+}
+
+
 class MarketCode(str, Enum):
     # 한국증시
     KRX = 'KRX'
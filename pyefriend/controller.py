@@ -1,15 +1,15 @@
 import sys
 import time
 from typing import Optional, Union
-from PyQt5.QtWidgets import QApplication
-from PyQt5.QAxContainer import QAxWidget
-from PyQt5.QtCore import QEventLoop
 
 from .const import System
 from .log import logger as pyefriend_logger
+from .metrics import metrics
+from .throttle import Throttle
 
 
-app: Optional[QApplication] = None
+# QApplication instance(PyQt5는 Controller 생성 시점에 import)
+app = None
 
 
 # [Section] Modules
@@ -18,22 +18,141 @@ def run_app():
     global app
 
     if app is None:
+        from PyQt5.QtWidgets import QApplication
+
         app = QApplication(sys.argv)
         pyefriend_logger.info('Start APP')
 
     return app
 
 
-class Controller:
+class BaseController:
+    """
+    Controller 공통 인터페이스(Backend Protocol)
+
+    Api는 아래에 정의된 함수들만 사용하므로 QAxWidget 기반 Controller 대신
+    다른 backend(ex. simulator.SimulatedController)로 교체하여 사용할 수 있습니다.
+
+    :param throttle: 서비스 분류별 요청 제한, RequestData/RequestNextData 호출 전 throttle.acquire(service) 호출
+    """
+    def __init__(self, logger=None, throttle: Throttle = None):
+        if not logger:
+            logger = pyefriend_logger
+        self.logger = logger
+        self.throttle = throttle or Throttle()
+        self.last_service: Optional[str] = None  # 직전 요청 서비스명(metrics)
+        self.request_count = 0  # RequestData/RequestNextData 호출 수(연속 조회 사이에 다른 요청이 있었는지 확인)
+
+    # Event
+    def set_receive_error_data_handler(self, handler):
+        raise NotImplementedError('해당 함수가 설정되어야 합니다.')
+
+    def set_receive_data_event_handler(self, handler):
+        raise NotImplementedError('해당 함수가 설정되어야 합니다.')
+
+    def set_receive_real_data_handler(self, handler):
+        raise NotImplementedError('해당 함수가 설정되어야 합니다.')
+
+    def process_events(self):
+        """ 대기중인 이벤트 처리(실시간 데이터 수신용), event loop가 없는 backend는 무시 """
+
+    # Input
+    def SetSingleData(self, field_index: int, value: str) -> str:
+        raise NotImplementedError('해당 함수가 설정되어야 합니다.')
+
+    def SetSingleDataEx(self, block_index: int, field_index: int, value: str) -> str:
+        raise NotImplementedError('해당 함수가 설정되어야 합니다.')
+
+    def SetMultiData(self, record_index: int, field_index: int, value: str) -> str:
+        raise NotImplementedError('해당 함수가 설정되어야 합니다.')
+
+    def SetMultiBlockData(self, block_index: int, record_index: int, field_index: int, value: str) -> bool:
+        raise NotImplementedError('해당 함수가 설정되어야 합니다.')
+
+    # Request
+    def RequestData(self, service: str):
+        raise NotImplementedError('해당 함수가 설정되어야 합니다.')
+
+    def RequestNextData(self, service: str):
+        raise NotImplementedError('해당 함수가 설정되어야 합니다.')
+
+    def IsMoreNextData(self) -> str:
+        raise NotImplementedError('해당 함수가 설정되어야 합니다.')
+
+    def RequestRealData(self, query: str, code: str):
+        raise NotImplementedError('해당 함수가 설정되어야 합니다.')
+
+    def UnRequestRealData(self, query: str, code: str):
+        raise NotImplementedError('해당 함수가 설정되어야 합니다.')
+
+    def UnRequestAllRealData(self):
+        raise NotImplementedError('해당 함수가 설정되어야 합니다.')
+
+    # Output
+    def GetSingleFieldCount(self) -> int:
+        raise NotImplementedError('해당 함수가 설정되어야 합니다.')
+
+    def GetMultiBlockCount(self) -> int:
+        raise NotImplementedError('해당 함수가 설정되어야 합니다.')
+
+    def GetMultiRecordCount(self, block_index: int) -> int:
+        raise NotImplementedError('해당 함수가 설정되어야 합니다.')
+
+    def GetMultiFieldCount(self, block_index: int, record_index: int) -> int:
+        raise NotImplementedError('해당 함수가 설정되어야 합니다.')
+
+    def GetSingleData(self, field_index: int, attribute_type: int) -> str:
+        raise NotImplementedError('해당 함수가 설정되어야 합니다.')
+
+    def GetSingleDataEx(self, block_index: int, field_index: int, attribute_type: int) -> str:
+        raise NotImplementedError('해당 함수가 설정되어야 합니다.')
+
+    def GetMultiData(self, block_index: int, record_index: int, field_index: int, attribute_type: int = 0) -> str:
+        raise NotImplementedError('해당 함수가 설정되어야 합니다.')
+
+    # Message
+    def GetReqMsgCode(self) -> str:
+        raise NotImplementedError('해당 함수가 설정되어야 합니다.')
+
+    def GetRtCode(self) -> str:
+        raise NotImplementedError('해당 함수가 설정되어야 합니다.')
+
+    def GetReqMessage(self) -> str:
+        raise NotImplementedError('해당 함수가 설정되어야 합니다.')
+
+    # Account
+    def GetAccountCount(self) -> int:
+        raise NotImplementedError('해당 함수가 설정되어야 합니다.')
+
+    def GetAccount(self, account_index: int) -> str:
+        raise NotImplementedError('해당 함수가 설정되어야 합니다.')
+
+    def GetAccountBrcode(self, account: str) -> str:
+        raise NotImplementedError('해당 함수가 설정되어야 합니다.')
+
+    def GetEncryptPassword(self, raw_password) -> str:
+        raise NotImplementedError('해당 함수가 설정되어야 합니다.')
+
+    def GetOverSeasStockSise(self) -> str:
+        raise NotImplementedError('해당 함수가 설정되어야 합니다.')
+
+    def GetSingleDataStockMaster(self, product_code: str, field_index: int) -> str:
+        raise NotImplementedError('해당 함수가 설정되어야 합니다.')
+
+    def IsVTS(self) -> bool:
+        raise NotImplementedError('해당 함수가 설정되어야 합니다.')
+
+
+class Controller(BaseController):
     """ QAxWidget을 통해 Controller Instance 생성(Low-Level) """
-    def __init__(self, logger=None):
+    def __init__(self, logger=None, throttle: Throttle = None):
+        super().__init__(logger=logger, throttle=throttle)
+        from PyQt5.QAxContainer import QAxWidget
+
         run_app()
         self.instance = QAxWidget(System.PROGID)
         self._event_loop = None
         self._error = None
-        if not logger:
-            logger = pyefriend_logger
-        self.logger = logger
 
     def dynamic_call(self, func_name: str, *args, log: bool = False):
         if log:
@@ -50,8 +169,7 @@ class Controller:
         return self
 
     def execute_event_loop(self):
-        # delay 추가
-        time.sleep(0.01)
+        from PyQt5.QtCore import QEventLoop
 
         self.logger.debug('Start Event Loop')
         self._event_loop = QEventLoop()  # 이벤트루프 할당
@@ -90,6 +208,23 @@ class Controller:
         """
         self._set_event_handler(self.instance.ReceiveData, handler)
 
+    def set_receive_real_data_handler(self, handler):
+        """ReceiveRealData 이벤트에 대한 핸들러를 등록한다
+        ReceiveRealData 이벤트: RequestRealData로 등록한 실시간 데이터를 받았을 때 발생되는 이벤트
+        (조회 event loop와 무관하므로 clear_event_loop를 호출하지 않음)
+        """
+        def decorated_handler(*args):
+            try:
+                handler()
+            except Exception as e:
+                self.logger.error(f'{e.__class__.__name__}: {str(e)}')
+
+        self.instance.ReceiveRealData.connect(decorated_handler)
+
+    def process_events(self):
+        """ 대기중인 Qt 이벤트 처리(ReceiveRealData 수신) """
+        run_app().processEvents()
+
     # Wrapper
     def SetSingleData(self, field_index: int, value: str) -> str:
         """ 사용자가 요청할 서비스의 Input 이 단건(Single 형) 데이터 값일 때 사용하는 공통함수 """
@@ -202,17 +337,23 @@ class Controller:
 
         :param service: 요청할 서비스명
         """
-        # transaction
-        time.sleep(0.1)
+        # 요청 제한(허용량이 소진된 경우에만 대기)
+        self.throttle.acquire(service)
+        self.last_service = service
+        self.request_count += 1
+        started = time.perf_counter()
 
-        # call
-        self.dynamic_call("RequestData(QString)", service, log=True)
+        try:
+            # call
+            self.dynamic_call("RequestData(QString)", service, log=True)
 
-        # clear and execute
-        return (
-            self.clear_event_loop()
-                .execute_event_loop()
-        )
+            # clear and execute
+            return (
+                self.clear_event_loop()
+                    .execute_event_loop()
+            )
+        finally:
+            metrics.record_request(service, time.perf_counter() - started)
 
     def RequestNextData(self, service: str):
         """
@@ -222,22 +363,45 @@ class Controller:
 
         :param service: 요청할 서비스명
         """
-        self.dynamic_call("RequestData(QString)", service)
+        # 요청 제한(허용량이 소진된 경우에만 대기)
+        self.throttle.acquire(service)
+        self.last_service = service
+        self.request_count += 1
+        started = time.perf_counter()
 
-        # clear and execute
-        return (
-            self.clear_event_loop()
-                .execute_event_loop()
-        )
+        try:
+            self.dynamic_call("RequestNextData(QString)", service)
+
+            # clear and execute
+            return (
+                self.clear_event_loop()
+                    .execute_event_loop()
+            )
+        finally:
+            metrics.record_request(service, time.perf_counter() - started)
 
     def RequestRealData(self, query: str, code: str):
-        raise NotImplementedError('Not yet')
+        """
+        실시간 데이터 등록 공통함수
+        등록 이후 해당 종목의 데이터가 수신될 때마다 ReceiveRealData 이벤트가 발생하며, GetSingleData로 값을 얻습니다.
+
+        :param query: 실시간 서비스명
+        :param code: 종목코드
+        """
+        return self.dynamic_call("RequestRealData(QString, QString)", query, code, log=True)
 
     def UnRequestRealData(self, query: str, code: str):
-        raise NotImplementedError('Not yet')
+        """
+        실시간 데이터 등록 해제 공통함수
+
+        :param query: 실시간 서비스명
+        :param code: 종목코드
+        """
+        return self.dynamic_call("UnRequestRealData(QString, QString)", query, code, log=True)
 
     def UnRequestAllRealData(self):
-        raise NotImplementedError('Not yet')
+        """ 등록된 모든 실시간 데이터 해제 공통함수 """
+        return self.dynamic_call("UnRequestAllRealData()", log=True)
 
     def SetMultiBlockData(self, block_index: int, record_index: int, field_index: int, value: str) -> bool:
         """
@@ -37,3 +37,19 @@ class NotInVTSException(UnExpectedException):
 
 class BiddingException(UnExpectedException):
     """ 모의투자 주문처리 불가(매매불가 종목) """
+
+
+class RateLimitException(UnExpectedException):
+    """ 초당 요청 제한 초과 """
+
+
+class QueueFullException(UnExpectedException):
+    """ 요청 대기열 초과 """
+
+
+class RequestExpiredException(UnExpectedException):
+    """ 대기 시간 초과로 실행되지 않은 요청 """
+
+
+class StreamInterruptedException(UnExpectedException):
+    """ stream을 다시 시작하기 전에 다른 요청이 실행되어 중단된 연속 조회 """
@@ -0,0 +1,133 @@
+"""
+# Executor
+
+Qt/COM 호출을 전담하는 단일 controller thread
+
+- QAxWidget은 생성한 thread에서만 사용할 수 있으므로, 모든 Api 호출을 하나의 thread로 모아서 실행
+- 등록한 함수는 PriorityScheduler의 우선순위(주문 > 계좌 > 시세 > 히스토리)에 따라 실행되며
+  concurrent.futures.Future를 반환
+"""
+import threading
+from concurrent.futures import Future
+from typing import Callable, Optional
+
+from .const import ServiceClass
+from .log import logger as pyefriend_logger
+from .metrics import metrics
+from .scheduler import Job, PriorityScheduler
+
+
+# [Section] Variables
+
+controller_thread: Optional['ControllerThread'] = None
+
+_lock = threading.Lock()
+
+
+# [Section] Modules
+
+class ControllerThread(threading.Thread):
+    """
+    Qt/COM(STA) 호출 전용 thread
+
+    :param scheduler: 요청 대기열, None일 경우 기본 설정의 PriorityScheduler
+    :param idle_interval: 요청이 없을 때 controller 이벤트(실시간 데이터)를 처리하는 주기(초)
+    """
+    def __init__(self,
+                 name: str = 'pyefriend-controller',
+                 scheduler: PriorityScheduler = None,
+                 idle_interval: float = 0.01,
+                 logger=None):
+        super().__init__(name=name, daemon=True)
+        if not logger:
+            logger = pyefriend_logger
+        self.logger = logger
+        self.scheduler = scheduler or PriorityScheduler()
+        self.idle_interval = idle_interval
+
+    def run(self):
+        # COM apartment 초기화(Windows, pywin32)
+        try:
+            import pythoncom
+            pythoncom.CoInitialize()
+        except ImportError:
+            pythoncom = None
+
+        self.logger.info(f'Start controller thread: {self.name}')
+
+        try:
+            while True:
+                job = self.scheduler.get(timeout=self.idle_interval)
+
+                if job is not None:
+                    job.run()
+
+                elif self.scheduler.closed:
+                    break
+
+                else:
+                    self.on_idle()
+        finally:
+            if pythoncom is not None:
+                pythoncom.CoUninitialize()
+
+    def on_idle(self):
+        """ 대기중인 controller 이벤트 처리(ReceiveRealData) """
+        from . import api
+
+        if api.controller is not None:
+            try:
+                api.controller.process_events()
+            except Exception as e:
+                self.logger.error(f'{e.__class__.__name__}: {str(e)}')
+
+    @property
+    def in_thread(self) -> bool:
+        """ 현재 thread가 controller thread인지 여부 """
+        return threading.current_thread() is self
+
+    def schedule(self,
+                 func: Callable,
+                 args: tuple = (),
+                 kwargs: dict = None,
+                 service_class: ServiceClass = ServiceClass.ACCOUNT,
+                 deadline: float = None) -> Future:
+        """
+        controller thread에서 func(*args, **kwargs) 실행
+
+        :param service_class: 우선순위 분류
+        :param deadline: time.monotonic() 기준 만료 시각, None일 경우 분류별 기본값
+        """
+        job = Job(func, args, kwargs, service_class=service_class, deadline=deadline)
+
+        if self.in_thread:
+            # controller thread 내부에서 호출한 경우 바로 실행(deadlock 방지)
+            job.run()
+            return job.future
+
+        return self.scheduler.put(job)
+
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        """ 분류를 지정하지 않은 요청은 ACCOUNT(deadline 없음)로 처리 """
+        return self.schedule(func, args, kwargs)
+
+    def call(self, func: Callable, *args, timeout: float = None, **kwargs):
+        """ submit 후 결과를 기다려서 반환(동기) """
+        return self.submit(func, *args, **kwargs).result(timeout=timeout)
+
+    def shutdown(self, wait: bool = True):
+        self.scheduler.close()
+        if wait and not self.in_thread:
+            self.join()
+
+
+def get_or_create_controller_thread(logger=None) -> ControllerThread:
+    global controller_thread
+
+    with _lock:
+        if controller_thread is None or not controller_thread.is_alive():
+            controller_thread = ControllerThread(logger=logger)
+            controller_thread.start()
+            metrics.register('scheduler', controller_thread.scheduler.snapshot)
+
+    return controller_thread
@@ -0,0 +1,180 @@
+"""
+# Fan-out
+
+여러 client가 구독한 종목 시세를 하나의 upstream(주기 조회 혹은 실시간 데이터)으로 받아 전달(asyncio)
+
+- 종목별 구독자 수와 관계없이 upstream 조회는 주기마다 종목당 한 번(QuoteHub.fetch)
+- 실시간 데이터 등 다른 upstream은 QuoteHub.publish로 직접 전달
+- client별 Conflator는 종목별 최신 값만 보관하므로, 느린 client는 중간 값을 건너뛰고 최신 값만 받음
+- 값이 바뀐 경우에만 전달하며, 새로 구독한 client에게는 마지막 값을 바로 전달
+
+example)
+    hub = QuoteHub(fetch=lambda keys: api.iter_product_prices(keys))
+    client = hub.connect()
+    hub.subscribe(client, ['005930', '000660'])
+    while True:
+        quotes = await client.get()  # {종목: 최신 값}
+"""
+import time
+import asyncio
+from typing import Any, AsyncIterator, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from .log import logger as pyefriend_logger
+from .metrics import Histogram
+
+
+# [Section] Modules
+
+class Conflator:
+    """ client 하나의 전달 대기열(종목별 최신 값만 보관) """
+    def __init__(self):
+        self.pending: Dict[Hashable, Any] = {}
+        self.keys: Set[Hashable] = set()  # 구독 중인 종목
+        self.delivered = 0
+        self.conflated = 0  # 전달하기 전에 새 값으로 교체된 횟수
+        self._event = asyncio.Event()
+
+    def put(self, key: Hashable, value: Any):
+        if key in self.pending:
+            self.conflated += 1
+        self.pending[key] = value
+        self._event.set()
+
+    async def get(self) -> Dict[Hashable, Any]:
+        """ 전달할 값이 생길 때까지 대기 후 {종목: 최신 값} 반환 """
+        while not self.pending:
+            self._event.clear()
+            await self._event.wait()
+
+        pending, self.pending = self.pending, {}
+        self.delivered += len(pending)
+        return pending
+
+
+class QuoteHub:
+    """
+    :param fetch: 종목 list를 받아 (종목, 값, 에러)를 반환하는 async iterator 함수(ex. AsyncApi.iter_product_prices)
+    :param interval: upstream 조회 주기(초)
+    """
+    def __init__(self,
+                 fetch: Callable[[List[Hashable]], AsyncIterator[Tuple[Hashable, Any, Optional[Exception]]]] = None,
+                 interval: float = 1.,
+                 logger=None):
+        if not logger:
+            logger = pyefriend_logger
+
+        self.fetch = fetch
+        self.interval = interval
+        self.logger = logger
+
+        self.clients: Set[Conflator] = set()
+        self.subscribers: Dict[Hashable, Set[Conflator]] = {}
+        self.latest: Dict[Hashable, Any] = {}
+
+        self.polls = 0
+        self.fetched = 0
+        self.published = 0
+        self.errors = 0
+        self.closed_delivered = 0  # 연결 종료된 client의 delivered/conflated 합계
+        self.closed_conflated = 0
+        self.poll_time = Histogram(scale=1e6)  # 한 주기 upstream 조회 시간(초)
+
+        self._task: Optional[asyncio.Task] = None
+
+    def connect(self) -> Conflator:
+        client = Conflator()
+        self.clients.add(client)
+        return client
+
+    def disconnect(self, client: Conflator):
+        self.unsubscribe(client)
+
+        if client in self.clients:
+            self.clients.discard(client)
+            self.closed_delivered += client.delivered
+            self.closed_conflated += client.conflated
+
+    def subscribe(self, client: Conflator, keys: Iterable[Hashable]):
+        for key in keys:
+            self.subscribers.setdefault(key, set()).add(client)
+            client.keys.add(key)
+
+            if key in self.latest:
+                client.put(key, self.latest[key])
+
+        self._ensure_running()
+
+    def unsubscribe(self, client: Conflator, keys: Iterable[Hashable] = None):
+        """ keys가 None일 경우 전체 구독 해제 """
+        for key in list(client.keys if keys is None else keys):
+            client.keys.discard(key)
+            subscribers = self.subscribers.get(key)
+
+            if subscribers is not None:
+                subscribers.discard(client)
+                if not subscribers:
+                    del self.subscribers[key]
+                    self.latest.pop(key, None)
+
+    def publish(self, key: Hashable, value: Any):
+        """ 값이 바뀐 경우 구독 중인 client에게 전달 """
+        if self.latest.get(key) == value:
+            return
+
+        self.latest[key] = value
+        self.published += 1
+
+        for client in self.subscribers.get(key, ()):
+            client.put(key, value)
+
+    def _ensure_running(self):
+        if self.fetch is not None and self.subscribers and (self._task is None or self._task.done()):
+            self._task = asyncio.ensure_future(self._run())
+
+    async def _run(self):
+        """ 구독자가 있는 동안 interval마다 구독 중인 종목을 한 번씩 조회 """
+        while self.subscribers:
+            started = time.monotonic()
+
+            try:
+                async for key, value, error in self.fetch(list(self.subscribers)):
+                    self.fetched += 1
+                    if error is not None:
+                        self.errors += 1
+                    elif key in self.subscribers:
+                        self.publish(key, value)
+
+            except Exception as e:
+                self.errors += 1
+                self.logger.error(f'{e.__class__.__name__}: {str(e)}')
+
+            elapsed = time.monotonic() - started
+            self.polls += 1
+            self.poll_time.record(elapsed)
+
+            await asyncio.sleep(max(0., self.interval - elapsed))
+
+    async def close(self):
+        for client in list(self.clients):
+            self.disconnect(client)
+
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def snapshot(self) -> dict:
+        return {
+            'clients': len(self.clients),
+            'symbols': len(self.subscribers),
+            'subscriptions': sum(len(clients) for clients in self.subscribers.values()),
+            'polls': self.polls,
+            'fetched': self.fetched,
+            'published': self.published,
+            'errors': self.errors,
+            'delivered': self.closed_delivered + sum(client.delivered for client in self.clients),
+            'conflated': self.closed_conflated + sum(client.conflated for client in self.clients),
+            'poll_time': self.poll_time.snapshot(),
+        }
@@ -0,0 +1,134 @@
+"""
+# Single Flight
+
+같은 입력값으로 동시에 실행 중인 조회 요청 병합
+
+- key별로 진행 중인 요청(Future)이 있으면 새로 요청하지 않고 그 결과를 함께 반환
+- 요청이 끝나면 key를 제거하므로 결과를 저장하지 않음(저장이 필요한 경우 cache.TTLCache 사용)
+- 이름(함수)별 요청/병합 횟수와 병합 비율(coalesced / calls)을 metrics에 'single_flight'로 등록
+
+* 반환값은 병합된 요청끼리 같은 객체를 공유하므로 수정하지 않아야 합니다.
+"""
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from .metrics import metrics
+
+
+# [Section] Modules
+
+class FlightStat:
+    """ 이름별 통계 """
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0  # 진행 중인 요청의 결과를 함께 받은 횟수
+
+
+class SingleFlight:
+    def __init__(self):
+        self.stats: Dict[str, FlightStat] = {}
+        self._inflight: Dict[Tuple[str, Hashable], Future] = {}
+        self._lock = threading.Lock()
+
+    def join(self, name: str, key: Hashable) -> Tuple[Future, bool]:
+        """
+        (name, key)로 진행 중인 Future 반환, 없을 경우 새로 등록
+
+        :return: (Future, 새로 등록하여 직접 실행해야 하는지 여부)
+        """
+        flight_key = (name, key)
+
+        with self._lock:
+            stat = self.stats.get(name)
+            if stat is None:
+                stat = self.stats[name] = FlightStat()
+            stat.calls += 1
+
+            future = self._inflight.get(flight_key)
+            if future is not None:
+                stat.coalesced += 1
+                return future, False
+
+            future = self._inflight[flight_key] = Future()
+            return future, True
+
+    def land(self, name: str, key: Hashable, future: Future, value: Any = None, error: BaseException = None):
+        """ 직접 실행한 요청의 결과 전달 후 제거 """
+        with self._lock:
+            self._inflight.pop((name, key), None)
+
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(value)
+
+    def do(self, name: str, key: Hashable, func: Callable[[], Any]) -> Any:
+        """ func() 실행(진행 중인 같은 요청이 있으면 그 결과를 대기) """
+        future, owner = self.join(name, key)
+        if not owner:
+            return future.result()
+
+        try:
+            value = func()
+        except BaseException as e:
+            self.land(name, key, future, error=e)
+            raise
+
+        self.land(name, key, future, value=value)
+        return value
+
+    def submit(self, name: str, key: Hashable, start: Callable[[], Future]) -> Future:
+        """
+        start()로 실행한 Future(ex. ControllerThread.schedule) 반환
+        진행 중인 같은 요청이 있으면 start()를 호출하지 않고 그 Future 반환
+        """
+        future, owner = self.join(name, key)
+        if not owner:
+            return future
+
+        def callback(inner: Future):
+            try:
+                self.land(name, key, future, value=inner.result())
+            except BaseException as e:
+                self.land(name, key, future, error=e)
+
+        try:
+            start().add_done_callback(callback)
+        except BaseException as e:
+            self.land(name, key, future, error=e)
+
+        return future
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            calls = sum(stat.calls for stat in self.stats.values())
+            coalesced = sum(stat.coalesced for stat in self.stats.values())
+            return {
+                'inflight': len(self._inflight),
+                'calls': calls,
+                'coalesced': coalesced,
+                'ratio': coalesced / calls if calls else 0.,
+                'names': {
+                    name: {
+                        'calls': stat.calls,
+                        'coalesced': stat.coalesced,
+                        'ratio': stat.coalesced / stat.calls if stat.calls else 0.,
+                    }
+                    for name, stat in self.stats.items()
+                }
+            }
+
+
+def make_key(args: tuple, kwargs: dict) -> Hashable:
+    """ (args, kwargs) -> hashable key, hash할 수 없는 값이 있으면 TypeError """
+    key = (args, tuple(sorted(kwargs.items())))
+    hash(key)
+    return key
+
+
+# [Section] Variables
+
+single_flight = SingleFlight()
+
+metrics.register('single_flight', single_flight.snapshot)
@@ -0,0 +1,223 @@
+"""
+# FX
+
+USD -> KRW 환율 service
+
+- broker 환율(OS_OS3004R)이 기본값: Api.currency 조회시 마지막 broker 갱신 후 interval이 지났으면
+  controller thread(executor)에 Api.refresh_currency()를 낮은 우선순위(HISTORY)로 등록(조회는 기다리지 않음)
+- background thread는 외부 환율(Currency.URL) 조회(fallback): broker 환율이 interval 안에 갱신된 경우 조회하지 않음
+- 외부 조회는 connection pool을 사용하는 requests.Session + timeout으로 수행
+- 갱신된 환율은 시각/출처(source)와 함께 history로 보관
+- get()은 갱신을 기다리지 않고 저장된 환율을 바로 반환하며, 한 번도 갱신되지 않은 경우 Currency.BASE(source == 'base')
+  환율이 필요한 쪽에서 FxRate.source/age/is_fresh로 확인(ex. 리밸런싱 주문)
+- 갱신 주기(초)/timeout(초)/주문에 사용할 수 있는 최대 경과 시간(초)은 환경변수로 변경 가능
+    ex) PYEFRIEND__FX_INTERVAL=600, PYEFRIEND__FX_TIMEOUT=3, PYEFRIEND__FX_MAX_AGE=1800
+"""
+import os
+import time
+import threading
+from collections import deque
+from typing import List, NamedTuple, Optional
+
+from .const import Currency
+from .log import logger as pyefriend_logger
+from .metrics import metrics
+
+
+# 갱신 주기(초)
+FX_INTERVAL = float(os.getenv('PYEFRIEND__FX_INTERVAL', 600))
+
+# 외부 환율 조회 timeout(초)
+FX_TIMEOUT = float(os.getenv('PYEFRIEND__FX_TIMEOUT', 3))
+
+# 주문에 사용할 수 있는 환율의 최대 경과 시간(초, FxRate.is_fresh)
+FX_MAX_AGE = float(os.getenv('PYEFRIEND__FX_MAX_AGE', 1800))
+
+# broker 환율 조회 실패시 다시 조회하기까지의 시간(초)
+BROKER_RETRY_INTERVAL = 60.
+
+# [Section] Variables
+
+fx_service: Optional['FxService'] = None
+
+_lock = threading.Lock()
+
+
+# [Section] Modules
+
+class FxRate(NamedTuple):
+    """ 환율 """
+    rate: float
+    source: str  # 'broker' / 'http' / 'base'
+    updated: float  # 갱신 시각(time.time())
+
+    @property
+    def age(self) -> Optional[float]:
+        """ 갱신 후 지난 시간(초), 갱신된 적이 없으면 None """
+        return time.time() - self.updated if self.updated else None
+
+    def is_fresh(self, max_age: float = FX_MAX_AGE) -> bool:
+        """ 외부(broker/http)에서 max_age초 안에 갱신된 환율인지 여부 """
+        return self.source != 'base' and self.age is not None and self.age <= max_age
+
+
+class FxService:
+    """
+    :param interval: 외부 환율 갱신 주기(초)
+    :param timeout: 외부 환율 조회 timeout(초)
+    :param history_size: 보관할 환율 갯수
+    """
+    def __init__(self,
+                 interval: float = FX_INTERVAL,
+                 timeout: float = FX_TIMEOUT,
+                 url: str = Currency.URL,
+                 history_size: int = 1024,
+                 logger=None):
+        if not logger:
+            logger = pyefriend_logger
+
+        self.interval = interval
+        self.timeout = timeout
+        self.url = url
+        self.logger = logger
+
+        self.latest = FxRate(rate=Currency.BASE, source='base', updated=0.)
+        self.history = deque(maxlen=history_size)
+        self.refreshes = 0
+        self.failures = 0
+        self.broker_attempted = 0.  # 마지막 broker 조회 시도(등록) 시각(time.time())
+        self._warned = False  # Currency.BASE 사용 경고 여부
+
+        self._session = None
+        self._thread: Optional[threading.Thread] = None
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._updated = threading.Condition()
+
+    @property
+    def rate(self) -> float:
+        """ 저장된 최신 환율(대기 없음) """
+        return self.latest.rate
+
+    @property
+    def session(self):
+        """ connection pool을 사용하는 requests.Session """
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=2, max_retries=1))
+            self._session = session
+
+        return self._session
+
+    def update(self, rate: float, source: str) -> FxRate:
+        """ 환율 저장 """
+        fx_rate = FxRate(rate=float(rate), source=source, updated=time.time())
+
+        with self._updated:
+            self.latest = fx_rate
+            self.history.append(fx_rate)
+            self._updated.notify_all()
+
+        return fx_rate
+
+    def fetch(self) -> float:
+        """ 외부 환율 조회 """
+        response = self.session.get(self.url, timeout=self.timeout)
+        response.raise_for_status()
+        return float(response.json()[0]['basePrice'])
+
+    def refresh(self) -> Optional[FxRate]:
+        """ 외부 환율 조회 후 저장, 실패시 None """
+        try:
+            fx_rate = self.update(self.fetch(), source='http')
+            self.refreshes += 1
+            return fx_rate
+
+        except Exception as e:
+            self.failures += 1
+            self.logger.warning(f'환율 정보를 불러오는 데 실패하였습니다. {e.__class__.__name__}: {str(e)}')
+            return None
+
+    def broker_due(self) -> bool:
+        """ broker 환율을 다시 조회할 때인지 여부(마지막 broker 갱신 후 interval, 실패 후 BROKER_RETRY_INTERVAL) """
+        now = time.time()
+        latest = self.latest
+
+        if latest.source == 'broker' and now - latest.updated < self.interval:
+            return False
+
+        return now - self.broker_attempted >= min(self.interval, BROKER_RETRY_INTERVAL)
+
+    def get(self) -> FxRate:
+        """
+        저장된 최신 환율(대기 없음)
+        한 번도 갱신되지 않은 경우 Currency.BASE(source == 'base') 반환, 경고는 한 번만 출력
+        """
+        latest = self.latest
+
+        if latest.source == 'base' and not self._warned:
+            self._warned = True
+            self.logger.warning(f'갱신된 환율이 없어 기본 환율(Currency.BASE={latest.rate})을 사용합니다.')
+
+        return latest
+
+    def refresh_later(self):
+        """ background thread에서 바로 갱신 """
+        self._wakeup.set()
+
+    def wait(self, timeout: float = None) -> bool:
+        """ 한 번 이상 갱신될 때까지 대기(시작시 최신 환율이 필요한 경우 직접 호출) """
+        with self._updated:
+            return self._updated.wait_for(lambda: self.latest.source != 'base', timeout)
+
+    def start(self) -> 'FxService':
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name='pyefriend-fx', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        self._wakeup.set()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            # broker 환율이 interval 안에 갱신된 경우 외부 조회 생략(fallback)
+            latest = self.latest
+            if not (latest.source == 'broker' and latest.is_fresh(self.interval)):
+                self.refresh()
+
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+
+    def get_history(self, since: float = None) -> List[FxRate]:
+        """ since(time.time()) 이후 환율 """
+        with self._updated:
+            return [fx_rate for fx_rate in self.history if since is None or fx_rate.updated >= since]
+
+    def snapshot(self) -> dict:
+        latest = self.latest
+        return {
+            'rate': latest.rate,
+            'source': latest.source,
+            'age': latest.age,
+            'refreshes': self.refreshes,
+            'failures': self.failures,
+            'history': len(self.history),
+        }
+
+
+def get_or_create_fx_service(logger=None) -> FxService:
+    """ background 갱신을 시작한 FxService 반환 """
+    global fx_service
+
+    with _lock:
+        if fx_service is None:
+            fx_service = FxService(logger=logger).start()
+            metrics.register('fx', fx_service.snapshot)
+
+    return fx_service
@@ -0,0 +1,346 @@
+"""
+# Stock Master
+
+국내 주식 종목 마스터(종목코드, 종목명, 시장, 그룹, 업종, 표준코드) 메모리 index
+
+- 종목 목록은 한국투자증권 종목 마스터 파일(kospi_code.mst / kosdaq_code.mst)에서 일괄 로드
+- 업종 코드는 controller.GetSingleDataStockMaster로 채움(efriend expert의 local 마스터 조회, transaction 없음)
+- column별 list/array로 보관하고, 종목코드 hash index와 종목명 prefix index(정렬 + bisect)로 조회
+- 하루에 한 번 갱신하며, 환경변수 'PYEFRIEND__STOCK_MASTER'에 json 경로를 설정한 경우 파일로 저장/로드
+- get_or_create_stock_master는 대기하지 않음: 갱신은 background thread에서 실행하며, 갱신 중에는 이전 마스터
+  (없으면 None, Api는 transaction으로 대신 조회) 반환
+- background 갱신시 업종 코드는 controller thread(executor.ControllerThread)가 실행 중인 경우에만
+  SECTOR_CHUNK 종목씩 나눠서 채움(다른 요청이 사이에 실행될 수 있도록 히스토리 우선순위로 실행)
+  대기 중 만료된 chunk는 업종 코드 없이(이전 마스터가 있으면 이전 업종 코드로) 두고 나머지는 그대로 사용
+- 갱신에 실패한 경우 REFRESH_RETRY_INTERVAL 후 다시 시도
+
+example)
+    master = get_or_create_stock_master()
+    master.name('005930')  # '삼성전자'
+    master.search('삼성')  # [{'product_code': '005930', 'product_name': '삼성전자', ...}, ...]
+"""
+import io
+import os
+import json
+import bisect
+import zipfile
+import time
+import threading
+from array import array
+from datetime import date
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .log import logger as pyefriend_logger
+
+
+# 저장 경로(None일 경우 저장하지 않음)
+STOCK_MASTER = os.getenv('PYEFRIEND__STOCK_MASTER')
+
+# 마스터 파일 조회 timeout(초)
+DOWNLOAD_TIMEOUT = 10.
+
+# controller thread 작업 하나에서 업종 코드를 채우는 종목 수
+SECTOR_CHUNK = 200
+
+# 갱신 실패시 다시 시도하기까지의 시간(초)
+REFRESH_RETRY_INTERVAL = 300.
+
+
+class MasterFile(NamedTuple):
+    """ 한국투자증권 종목 마스터 파일 """
+    market: str
+    url: str
+    tail: int  # 행 끝의 고정길이 상세정보 길이(개행 포함)
+
+
+MASTER_FILES = (
+    MasterFile('KOSPI', 'https://new.real.download.dws.co.kr/common/master/kospi_code.mst.zip', 228),
+    MasterFile('KOSDAQ', 'https://new.real.download.dws.co.kr/common/master/kosdaq_code.mst.zip', 222),
+)
+
+# GetSingleDataStockMaster field index
+SECTOR_FIELD = 6  # 업종코드
+
+# 시장 코드(array 저장용)
+MARKETS = ('KOSPI', 'KOSDAQ')
+
+DATE_FORMAT = '%Y%m%d'
+
+# [Section] Variables
+
+stock_master: Optional['StockMaster'] = None
+
+# 마지막 갱신 시도 시각(time.time(), 실패한 경우 REFRESH_RETRY_INTERVAL 동안 다시 시도하지 않음)
+_attempted: float = 0.
+
+# background 갱신 thread
+_refresh_thread: Optional[threading.Thread] = None
+
+_lock = threading.Lock()
+
+
+# [Section] Modules
+
+class MasterRecord(NamedTuple):
+    product_code: str
+    product_name: str
+    market: str
+    group: str  # 증권그룹구분코드(ST: 주권, EF: ETF, EN: ETN 등)
+    standard_code: str  # 표준코드(ISIN)
+    sector_code: str = ''
+
+
+def parse_master_file(text: str, market: str, tail: int) -> List[MasterRecord]:
+    """ mst 파일(cp949 decode 결과) -> MasterRecord list """
+    records = []
+
+    for row in text.splitlines(keepends=True):
+        if len(row) <= tail:
+            continue
+
+        head, detail = row[:len(row) - tail], row[len(row) - tail:]
+        records.append(MasterRecord(product_code=head[0:9].rstrip(),
+                                    product_name=head[21:].strip(),
+                                    market=market,
+                                    group=detail[0:2].strip(),
+                                    standard_code=head[9:21].rstrip()))
+
+    return records
+
+
+def download_master_files(timeout: float = DOWNLOAD_TIMEOUT) -> List[MasterRecord]:
+    """ 한국투자증권 종목 마스터 파일 다운로드 """
+    import requests
+
+    records = []
+
+    with requests.Session() as session:
+        for master_file in MASTER_FILES:
+            response = session.get(master_file.url, timeout=timeout)
+            response.raise_for_status()
+
+            with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+                text = archive.read(archive.namelist()[0]).decode('cp949', errors='replace')
+
+            records += parse_master_file(text, master_file.market, master_file.tail)
+
+    return records
+
+
+class StockMaster:
+    """
+    종목 마스터 table
+
+    :param records: MasterRecord list
+    :param updated: 갱신 일자(YYYYMMDD)
+    """
+    def __init__(self, records: Iterable[MasterRecord] = (), updated: str = None):
+        records = sorted(records, key=lambda record: record.product_code)
+
+        self.updated = updated
+        self.codes: List[str] = [record.product_code for record in records]
+        self.names: List[str] = [record.product_name for record in records]
+        self.markets = array('b', (MARKETS.index(record.market) for record in records))
+        self.groups: List[str] = [record.group for record in records]
+        self.standard_codes: List[str] = [record.standard_code for record in records]
+        self.sectors: List[str] = [record.sector_code for record in records]
+
+        # 종목코드 -> 행 번호
+        self.index: Dict[str, int] = {code: row for row, code in enumerate(self.codes)}
+
+        # (정규화된 종목명, 행 번호) 정렬
+        self.name_index: List[Tuple[str, int]] = sorted(
+            (self.normalize(name), row) for row, name in enumerate(self.names)
+        )
+        self._name_keys = [key for key, _ in self.name_index]
+
+    @staticmethod
+    def normalize(name: str) -> str:
+        return name.replace(' ', '').upper()
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __contains__(self, product_code: str) -> bool:
+        return product_code in self.index
+
+    @property
+    def is_stale(self) -> bool:
+        """ 오늘 갱신되지 않았는지 여부 """
+        return self.updated != date.today().strftime(DATE_FORMAT)
+
+    def record(self, row: int) -> MasterRecord:
+        return MasterRecord(product_code=self.codes[row],
+                            product_name=self.names[row],
+                            market=MARKETS[self.markets[row]],
+                            group=self.groups[row],
+                            standard_code=self.standard_codes[row],
+                            sector_code=self.sectors[row])
+
+    def get(self, product_code: str) -> Optional[dict]:
+        row = self.index.get(product_code)
+        return None if row is None else self.record(row)._asdict()
+
+    def sector(self, product_code: str) -> str:
+        row = self.index.get(product_code)
+        return '' if row is None else self.sectors[row]
+
+    def name(self, product_code: str) -> Optional[str]:
+        row = self.index.get(product_code)
+        return None if row is None else self.names[row]
+
+    def search(self, prefix: str, limit: int = 20) -> List[dict]:
+        """ 종목명이 prefix로 시작하는 종목(공백/대소문자 무시) """
+        prefix = self.normalize(prefix)
+        start = bisect.bisect_left(self._name_keys, prefix)
+        result = []
+
+        for key, row in self.name_index[start:]:
+            if not key.startswith(prefix) or len(result) >= limit:
+                break
+            result.append(self.record(row)._asdict())
+
+        return result
+
+    def fill_sectors(self, controller, start: int = 0, end: int = None) -> 'StockMaster':
+        """ controller.GetSingleDataStockMaster로 [start, end) 행의 업종코드 채움(controller thread에서 호출) """
+        get = controller.GetSingleDataStockMaster
+        end = len(self.codes) if end is None else end
+        self.sectors[start:end] = [get(code, SECTOR_FIELD) or '' for code in self.codes[start:end]]
+        return self
+
+    def fill_sectors_in_chunks(self, controller, executor, chunk: int = SECTOR_CHUNK,
+                               previous: 'StockMaster' = None, logger=None) -> 'StockMaster':
+        """
+        업종코드를 chunk 종목씩 controller thread(executor)에서 채움(다른 thread에서 호출)
+        대기 중 만료된 chunk는 previous(이전 마스터)의 업종코드로 채우고, 이미 채운 chunk는 그대로 유지
+        """
+        from .const import ServiceClass
+        from .exceptions import RequestExpiredException
+
+        if not logger:
+            logger = pyefriend_logger
+
+        expired = 0
+
+        for start in range(0, len(self.codes), chunk):
+            try:
+                executor.schedule(self.fill_sectors, (controller, start, start + chunk),
+                                  service_class=ServiceClass.HISTORY).result()
+
+            except RequestExpiredException:
+                expired += len(self.codes[start:start + chunk])
+
+                if previous is not None:
+                    self.sectors[start:start + chunk] = [previous.sector(code) for code in self.codes[start:start + chunk]]
+
+        if expired:
+            logger.warning(f'업종 코드 조회가 만료되어 {expired}개 종목의 업종 코드를 채우지 못했습니다.')
+
+        return self
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        with open(f'{path}.tmp', 'w', encoding='utf-8') as f:
+            json.dump({
+                'updated': self.updated,
+                'records': [self.record(row) for row in range(len(self))],
+            }, f, ensure_ascii=False)
+
+        os.replace(f'{path}.tmp', path)
+
+    @classmethod
+    def load(cls, path: str) -> 'StockMaster':
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+
+        return cls(records=[MasterRecord(*record) for record in data['records']], updated=data['updated'])
+
+    @classmethod
+    def build(cls, controller=None, timeout: float = DOWNLOAD_TIMEOUT) -> 'StockMaster':
+        """ 마스터 파일 다운로드 후 생성, controller가 있는 경우 업종코드 추가 """
+        master = cls(download_master_files(timeout=timeout), updated=date.today().strftime(DATE_FORMAT))
+
+        if controller is not None:
+            master.fill_sectors(controller)
+
+        return master
+
+
+def refresh_stock_master(controller=None, logger=None) -> 'StockMaster':
+    """ 종목 마스터 다시 생성 후 저장 """
+    global stock_master
+
+    if not logger:
+        logger = pyefriend_logger
+
+    master = StockMaster.build(controller=controller)
+    logger.info(f'종목 마스터를 갱신하였습니다.: {len(master)}')
+
+    if STOCK_MASTER:
+        master.save(STOCK_MASTER)
+
+    stock_master = master
+    return master
+
+
+def refresh_in_background(controller=None, logger=None):
+    """ 마스터 파일 다운로드/생성(background thread), 업종 코드는 controller thread가 실행 중인 경우에만 채움 """
+    global stock_master
+
+    from . import executor
+
+    if not logger:
+        logger = pyefriend_logger
+
+    try:
+        master = StockMaster(download_master_files(), updated=date.today().strftime(DATE_FORMAT))
+
+        controller_thread = executor.controller_thread
+        if controller is not None and controller_thread is not None and controller_thread.is_alive():
+            master.fill_sectors_in_chunks(controller, controller_thread, previous=stock_master, logger=logger)
+
+        if STOCK_MASTER:
+            master.save(STOCK_MASTER)
+
+        stock_master = master
+        logger.info(f'종목 마스터를 갱신하였습니다.: {len(master)}')
+
+    except Exception as e:
+        logger.warning(f'종목 마스터를 갱신하지 못했습니다. {e.__class__.__name__}: {str(e)}')
+
+
+def get_or_create_stock_master(controller=None, logger=None) -> Optional[StockMaster]:
+    """
+    저장된 종목 마스터 반환(대기 없음)
+    오늘 갱신되지 않은 경우 background thread에서 갱신을 시작하고, 갱신이 끝날 때까지 이전 마스터(없으면 None) 반환
+    갱신에 실패한 경우 마지막 시도 후 REFRESH_RETRY_INTERVAL이 지나면 다시 시도
+    """
+    global stock_master, _attempted, _refresh_thread
+
+    with _lock:
+        if stock_master is None and STOCK_MASTER and os.path.exists(STOCK_MASTER):
+            stock_master = StockMaster.load(STOCK_MASTER)
+
+        now = time.time()
+        refreshing = _refresh_thread is not None and _refresh_thread.is_alive()
+
+        if (stock_master is None or stock_master.is_stale) \
+                and not refreshing and now - _attempted >= REFRESH_RETRY_INTERVAL:
+            _attempted = now
+            _refresh_thread = threading.Thread(target=refresh_in_background,
+                                               args=(controller, logger),
+                                               name='pyefriend-stock-master',
+                                               daemon=True)
+            _refresh_thread.start()
+
+    return stock_master
+
+
+def set_stock_master(master: Optional[StockMaster]) -> Optional[StockMaster]:
+    """ 사용할 종목 마스터 교체 """
+    global stock_master
+
+    stock_master = master
+    return stock_master
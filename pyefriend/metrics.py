@@ -0,0 +1,186 @@
+"""
+# Metrics
+
+서비스(TR)별 요청 지연, get_data 추출 시간, 반환 record 수, 에러 코드 수집
+
+- 값은 HDR histogram과 같은 log-linear bucket(2의 거듭제곱 구간마다 16개 bucket, 상대 오차 약 6%)에 누적
+- 기록 비용은 bucket index 계산과 dict 갱신 정도로, 요청 경로에 주는 부담은 무시할 수준
+- throttle/scheduler 등 다른 구성요소의 snapshot은 register로 등록하여 snapshot()에서 함께 반환
+- 환경변수 'PYEFRIEND__METRICS=0'일 경우 수집하지 않음
+
+example)
+    from pyefriend.metrics import metrics
+    metrics.snapshot()['services']['SCP']['latency']['p99']
+"""
+import os
+import threading
+from collections import Counter
+from typing import Callable, Dict, Optional, Tuple
+
+
+# 2의 거듭제곱 구간별 bucket 갯수(bit 수)
+SUB_BUCKET_BITS = 4
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+
+# snapshot에 포함할 percentile
+PERCENTILES = (50., 90., 99., 99.9)
+
+
+# [Section] Modules
+
+def bucket_index(value: int) -> int:
+    """ 0 이상의 정수 -> bucket index """
+    if value < 2 * SUB_BUCKET_COUNT:
+        return value
+
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    return SUB_BUCKET_COUNT * shift + (value >> shift)
+
+
+def bucket_bounds(index: int) -> Tuple[int, int]:
+    """ bucket index -> (하한, 상한) """
+    if index < 2 * SUB_BUCKET_COUNT:
+        return index, index
+
+    shift = index // SUB_BUCKET_COUNT - 1
+    mantissa = index - SUB_BUCKET_COUNT * shift
+    return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+
+class Histogram:
+    """
+    log-linear bucket histogram
+
+    :param scale: 기록 단위, record(value)는 int(value * scale)로 저장(ex. 초 단위 값을 microsecond로 저장할 경우 1e6)
+    """
+    def __init__(self, scale: float = 1.):
+        self.scale = scale
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def record(self, value: float):
+        value = int(value * self.scale)
+        if value < 0:
+            value = 0
+        index = bucket_index(value)
+
+        with self._lock:
+            self.counts[index] = self.counts.get(index, 0) + 1
+            self.count += 1
+            self.total += value
+            if self.min is None or value < self.min:
+                self.min = value
+            if self.max is None or value > self.max:
+                self.max = value
+
+    def percentile(self, q: float) -> float:
+        """ q(0~100) percentile, bucket 상한값 기준 """
+        with self._lock:
+            if not self.count:
+                return 0.
+
+            target = max(1, int(self.count * q / 100. + 0.5))
+            seen = 0
+
+            for index in sorted(self.counts):
+                seen += self.counts[index]
+                if seen >= target:
+                    return min(bucket_bounds(index)[1], self.max) / self.scale
+
+            return self.max / self.scale
+
+    def snapshot(self) -> dict:
+        result = {
+            'count': self.count,
+            'mean': self.total / self.count / self.scale if self.count else 0.,
+            'min': (self.min or 0) / self.scale,
+            'max': (self.max or 0) / self.scale,
+        }
+        for q in PERCENTILES:
+            result[f'p{q:g}'.replace('.', '_')] = self.percentile(q)
+        return result
+
+
+class ServiceMetrics:
+    """ 서비스 하나의 지표 """
+    def __init__(self):
+        self.latency = Histogram(scale=1e6)  # 요청 ~ ReceiveData(초, microsecond 단위로 저장)
+        self.extraction = Histogram(scale=1e6)  # get_data 추출 시간(초)
+        self.records = Histogram()  # get_data 반환 record 수
+        self.errors = Counter()  # {msg_code: 횟수}
+
+    def snapshot(self) -> dict:
+        return {
+            'latency': self.latency.snapshot(),
+            'extraction': self.extraction.snapshot(),
+            'records': self.records.snapshot(),
+            'errors': dict(self.errors),
+        }
+
+
+class Metrics:
+    """ 서비스별 지표 및 구성요소 snapshot 모음 """
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.services: Dict[str, ServiceMetrics] = {}
+        self.components: Dict[str, Callable[[], dict]] = {}
+        self._lock = threading.Lock()
+
+    def service(self, service: str) -> ServiceMetrics:
+        service_metrics = self.services.get(service)
+
+        if service_metrics is None:
+            with self._lock:
+                service_metrics = self.services.setdefault(service, ServiceMetrics())
+
+        return service_metrics
+
+    def record_request(self, service: str, seconds: float):
+        if self.enabled:
+            self.service(service).latency.record(seconds)
+
+    def record_extraction(self, service: str, seconds: float, records: int):
+        if self.enabled:
+            service_metrics = self.service(service)
+            service_metrics.extraction.record(seconds)
+            service_metrics.records.record(records)
+
+    def record_error(self, service: str, msg_code: str):
+        if self.enabled:
+            service_metrics = self.service(service)
+            with self._lock:
+                service_metrics.errors[msg_code] += 1
+
+    def register(self, name: str, snapshot: Callable[[], dict]):
+        """ 구성요소(throttle, scheduler 등)의 snapshot 함수 등록, 같은 name은 교체 """
+        self.components[name] = snapshot
+
+    def unregister(self, name: str):
+        self.components.pop(name, None)
+
+    def reset(self):
+        with self._lock:
+            self.services.clear()
+
+    def snapshot(self) -> dict:
+        components = {}
+        for name, snapshot in list(self.components.items()):
+            try:
+                components[name] = snapshot()
+            except Exception as e:
+                components[name] = {'error': f'{e.__class__.__name__}: {str(e)}'}
+
+        return {
+            'services': {service: service_metrics.snapshot()
+                         for service, service_metrics in list(self.services.items())},
+            'components': components,
+        }
+
+
+# [Section] Variables
+
+metrics = Metrics(enabled=os.getenv('PYEFRIEND__METRICS', '1') not in ('0', 'false', 'False'))
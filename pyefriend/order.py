@@ -0,0 +1,147 @@
+"""
+# Order
+
+여러 주문을 한 번에 제출(Api.submit_orders)할 때 사용하는 주문/결과
+
+- 제출 전에 전체 주문을 검증하여 하나라도 잘못된 경우 아무것도 주문하지 않음(InvalidOrderException)
+- 주문 간격은 controller throttle(ServiceClass.ORDER)이 조절하며, 허용량이 남아있으면 대기 없이 연속으로 제출
+- 주문별 에러는 중단하지 않고 결과에 기록(stop_on_error=True일 경우 남은 주문은 제출하지 않음)
+
+example)
+    batch = api.submit_orders([
+        dict(side='sell', product_code='005930', count=10),
+        dict(side='buy', product_code='000660', count=5, price=120000),
+    ])
+    batch.order_nums  # ['0000012345', '0000012346']
+    batch.errors      # {}
+"""
+from typing import Dict, Iterable, List, NamedTuple, Optional, Union
+
+from .exceptions import UnExpectedException
+
+
+# [Section] Variables
+
+SIDES = ('buy', 'sell')
+
+
+# [Section] Modules
+
+class InvalidOrderException(UnExpectedException):
+    """ 주문 입력값 오류(제출 전 검증) """
+
+
+class Order(NamedTuple):
+    """ 주문 하나 """
+    side: str  # 'buy' / 'sell'
+    product_code: str
+    count: int
+    price: float = 0  # 0 이하일 경우 시장가(국내)
+    market_code: Optional[str] = None  # 해외 거래소 코드
+
+
+class OrderResult(NamedTuple):
+    """ 주문 하나의 결과 """
+    order: Order
+    order_num: Optional[str] = None
+    error: Optional[str] = None
+    submitted: bool = False  # 제출 여부(stop_on_error로 제출하지 않은 경우 False)
+
+    @property
+    def ok(self) -> bool:
+        return self.order_num is not None and self.error is None
+
+
+class OrderBatch:
+    """ submit_orders 결과 """
+    def __init__(self, results: List[OrderResult], elapsed: float):
+        self.results = results
+        self.elapsed = elapsed
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def __iter__(self):
+        return iter(self.results)
+
+    @property
+    def order_nums(self) -> List[Optional[str]]:
+        return [result.order_num for result in self.results]
+
+    @property
+    def errors(self) -> Dict[int, str]:
+        """ {주문 index: 에러} """
+        return {index: result.error for index, result in enumerate(self.results) if result.error is not None}
+
+    @property
+    def succeeded(self) -> int:
+        return sum(result.ok for result in self.results)
+
+    @property
+    def failed(self) -> int:
+        return len(self.results) - self.succeeded
+
+    def to_dict(self) -> dict:
+        return {
+            'succeeded': self.succeeded,
+            'failed': self.failed,
+            'elapsed': self.elapsed,
+            'results': [
+                dict(**result.order._asdict(),
+                     order_num=result.order_num,
+                     error=result.error,
+                     submitted=result.submitted)
+                for result in self.results
+            ],
+        }
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(orders={len(self)}, succeeded={self.succeeded}, failed={self.failed})'
+
+
+def to_order(order: Union[Order, dict]) -> Order:
+    if isinstance(order, Order):
+        return order
+
+    if not isinstance(order, dict):
+        raise TypeError(f'Order 혹은 dict여야 합니다: {order!r}')
+
+    return Order(**{key: value for key, value in order.items() if key in Order._fields})
+
+
+def validate_orders(orders: Iterable[Union[Order, dict]], is_domestic: bool = True) -> List[Order]:
+    """
+    전체 주문 검증 후 Order 리스트로 반환
+
+    :param is_domestic: 국내 주문 여부(해외 주문은 market_code와 price 필수)
+    """
+    validated, errors = [], []
+
+    for index, order in enumerate(orders):
+        try:
+            order = to_order(order)
+        except TypeError as e:
+            errors.append(f'[{index}] {str(e)}')
+            continue
+
+        if order.side not in SIDES:
+            errors.append(f"[{index}] side는 {SIDES} 중 하나여야 합니다: {order.side!r}")
+        if not order.product_code:
+            errors.append(f'[{index}] product_code가 없습니다.')
+        if not isinstance(order.count, int) or isinstance(order.count, bool) or order.count <= 0:
+            errors.append(f'[{index}] count는 1 이상의 정수여야 합니다: {order.count!r}')
+        if not isinstance(order.price, (int, float)) or order.price < 0:
+            errors.append(f'[{index}] price는 0 이상이어야 합니다: {order.price!r}')
+
+        if not is_domestic:
+            if not order.market_code:
+                errors.append(f'[{index}] 해외 주문은 market_code가 필요합니다.')
+            if isinstance(order.price, (int, float)) and order.price <= 0:
+                errors.append(f'[{index}] 해외 주문은 지정가(price > 0)만 가능합니다.')
+
+        validated.append(order)
+
+    if errors:
+        raise InvalidOrderException('\n'.join(errors))
+
+    return validated
@@ -0,0 +1,275 @@
+"""
+# Real-time
+
+실시간 데이터(RequestRealData / ReceiveRealData) 구독 관리
+
+- 종목별 구독은 reference count로 관리하여 같은 종목을 여러 곳에서 구독해도 실시간 등록은 한 번만 수행
+- ReceiveRealData 이벤트마다 Tick으로 decode하여 구독자별 ring buffer(최대 길이 고정)에 전달
+- ring buffer가 가득 찬 경우 가장 오래된 Tick을 버림(dropped)
+
+example)
+    manager = RealTimeManager(query='<실시간 서비스명>')
+    subscription = manager.subscribe(['005930', '000660'])
+    ...
+    for tick in subscription.drain():
+        print(tick.code, tick.price)
+    subscription.close()
+"""
+import time
+import threading
+from collections import deque
+from typing import Callable, Dict, Iterable, List, NamedTuple, Set
+
+from .controller import BaseController
+from .executor import ControllerThread
+from .log import logger as pyefriend_logger
+from .metrics import metrics
+
+
+# [Section] Modules
+
+class Tick(NamedTuple):
+    """ 실시간 체결 데이터 """
+    code: str
+    time: str
+    price: float
+    volume: int
+    received: float  # 수신 시각(time.time())
+
+
+class TickDecoder:
+    """
+    ReceiveRealData 수신 데이터(GetSingleData) -> Tick
+
+    :param code_index: 종목코드 field index
+    :param time_index: 체결시간 field index
+    :param price_index: 현재가 field index
+    :param volume_index: 체결량 field index
+    * field index는 실시간 서비스의 output 레이아웃에 맞춰 설정해야 합니다.
+    """
+    def __init__(self,
+                 code_index: int = 0,
+                 time_index: int = 1,
+                 price_index: int = 2,
+                 volume_index: int = 3,
+                 price_type: Callable = float):
+        self.code_index = code_index
+        self.time_index = time_index
+        self.price_index = price_index
+        self.volume_index = volume_index
+        self.price_type = price_type
+
+    def decode(self, controller: BaseController) -> Tick:
+        get_single_data = controller.GetSingleData
+        return Tick(code=get_single_data(self.code_index, 0),
+                    time=get_single_data(self.time_index, 0),
+                    price=self.price_type(get_single_data(self.price_index, 0) or 0),
+                    volume=int(get_single_data(self.volume_index, 0) or 0),
+                    received=time.time())
+
+
+class RingBuffer:
+    """ 최대 길이가 고정된 thread-safe buffer, 가득 찬 경우 가장 오래된 값을 버림 """
+    def __init__(self, maxlen: int = 1024):
+        self.maxlen = maxlen
+        self.dropped = 0
+        self._items = deque(maxlen=maxlen)
+        self._condition = threading.Condition()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def put(self, item):
+        with self._condition:
+            if len(self._items) == self.maxlen:
+                self.dropped += 1
+            self._items.append(item)
+            self._condition.notify()
+
+    def get(self, timeout: float = None):
+        """ 가장 오래된 값 반환, timeout 내에 값이 없으면 None """
+        with self._condition:
+            if not self._items:
+                self._condition.wait(timeout)
+            return self._items.popleft() if self._items else None
+
+    def drain(self) -> list:
+        """ 쌓여있는 값 전체 반환 """
+        with self._condition:
+            items = list(self._items)
+            self._items.clear()
+            return items
+
+
+class Subscription(RingBuffer):
+    """ 구독자(consumer) 하나, 구독한 종목의 Tick만 전달받음 """
+    def __init__(self, manager: 'RealTimeManager', codes: Iterable[str], maxlen: int = 1024):
+        super().__init__(maxlen=maxlen)
+        self.manager = manager
+        self.codes: Set[str] = set(codes)
+        self.closed = False
+
+    def close(self):
+        if not self.closed:
+            self.manager.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class RealTimeManager:
+    """
+    실시간 서비스(query) 하나에 대한 구독 관리
+
+    :param query: 실시간 서비스명
+    :param controller: None일 경우 api.get_or_create_controller()
+    :param decoder: 수신 데이터 -> Tick
+    :param executor: 설정한 경우 RequestRealData/UnRequestRealData를 controller thread에서 실행
+    """
+    def __init__(self,
+                 query: str,
+                 controller: BaseController = None,
+                 decoder: TickDecoder = None,
+                 executor: ControllerThread = None,
+                 logger=None):
+        if controller is None:
+            from .api import get_or_create_controller
+            controller = get_or_create_controller()
+
+        if not logger:
+            logger = pyefriend_logger
+
+        self.query = query
+        self.controller = controller
+        self.decoder = decoder or TickDecoder()
+        self.executor = executor
+        self.logger = logger
+
+        self.ref_counts: Dict[str, int] = {}
+        self.subscriptions: Dict[str, List[Subscription]] = {}
+        self.received = 0
+        self.delivered = 0
+        self._lock = threading.RLock()
+
+        # RequestRealData/UnRequestRealData 호출 순서 보장(controller thread 대기 중에도 on_receive는 _lock만 사용)
+        self._register_lock = threading.Lock()
+
+        controller.set_receive_real_data_handler(self.on_receive)
+        metrics.register(f'realtime:{query}', self.snapshot)
+
+    def _call(self, func: Callable, *args):
+        if self.executor is not None:
+            return self.executor.call(func, *args)
+        return func(*args)
+
+    def subscribe(self, codes: Iterable[str], maxlen: int = 1024) -> Subscription:
+        """ codes에 대한 구독자 생성, 처음 구독하는 종목만 RequestRealData 호출 """
+        subscription = Subscription(self, codes, maxlen=maxlen)
+
+        with self._register_lock:
+            # 구독 정보만 lock 안에서 갱신(on_receive가 controller thread에서 같은 lock 사용)
+            with self._lock:
+                requests = []
+                for code in subscription.codes:
+                    self.subscriptions.setdefault(code, []).append(subscription)
+                    self.ref_counts[code] = self.ref_counts.get(code, 0) + 1
+
+                    if self.ref_counts[code] == 1:
+                        requests.append(code)
+
+            # controller thread 호출은 lock 밖에서 실행
+            registered = []
+            try:
+                for code in requests:
+                    self._call(self.controller.RequestRealData, self.query, code)
+                    registered.append(code)
+                    self.logger.debug(f"실시간 등록: '{self.query}' / '{code}'")
+
+            except Exception:
+                # 등록에 실패한 경우 구독 전체를 되돌림(등록되지 않은 종목이 구독 중으로 남지 않도록)
+                self._rollback(subscription, registered)
+                raise
+
+        return subscription
+
+    def _rollback(self, subscription: Subscription, registered: List[str]):
+        """ subscribe 실패시 구독 정보 제거, 이번에 등록한 종목(registered)은 UnRequestRealData """
+        with self._lock:
+            subscription.closed = True
+
+            requests = []
+            for code in subscription.codes:
+                subscribers = self.subscriptions.get(code, [])
+                if subscription in subscribers:
+                    subscribers.remove(subscription)
+                    self.ref_counts[code] -= 1
+
+                if self.ref_counts.get(code) == 0:
+                    del self.ref_counts[code]
+                    del self.subscriptions[code]
+                    if code in registered:
+                        requests.append(code)
+
+        for code in requests:
+            try:
+                self._call(self.controller.UnRequestRealData, self.query, code)
+            except Exception as e:
+                self.logger.error(f'{e.__class__.__name__}: {str(e)}')
+
+    def unsubscribe(self, subscription: Subscription):
+        """ 구독 해제, 구독자가 없는 종목은 UnRequestRealData 호출 """
+        with self._register_lock:
+            with self._lock:
+                subscription.closed = True
+
+                requests = []
+                for code in subscription.codes:
+                    subscribers = self.subscriptions.get(code, [])
+                    if subscription in subscribers:
+                        subscribers.remove(subscription)
+                        self.ref_counts[code] -= 1
+
+                    if self.ref_counts.get(code) == 0:
+                        del self.ref_counts[code]
+                        del self.subscriptions[code]
+                        requests.append(code)
+
+            for code in requests:
+                self._call(self.controller.UnRequestRealData, self.query, code)
+                self.logger.debug(f"실시간 해제: '{self.query}' / '{code}'")
+
+    def close(self):
+        """ 모든 구독 해제 """
+        with self._lock:
+            subscriptions = {id(s): s for subscribers in self.subscriptions.values() for s in subscribers}
+
+        for subscription in subscriptions.values():
+            self.unsubscribe(subscription)
+
+    def on_receive(self):
+        """ ReceiveRealData 핸들러 """
+        tick = self.decoder.decode(self.controller)
+        self.received += 1
+
+        with self._lock:
+            subscribers = list(self.subscriptions.get(tick.code, ()))
+
+        for subscription in subscribers:
+            subscription.put(tick)
+
+        self.delivered += len(subscribers)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                'query': self.query,
+                'codes': len(self.ref_counts),
+                'subscriptions': len({id(s) for subscribers in self.subscriptions.values() for s in subscribers}),
+                'received': self.received,
+                'delivered': self.delivered,
+                'dropped': sum(s.dropped for subscribers in self.subscriptions.values() for s in subscribers),
+            }
+
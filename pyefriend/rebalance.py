@@ -0,0 +1,214 @@
+"""
+# Rebalance
+
+목표 비중에 맞춘 주문 계획(numpy)
+
+- 종목별 보유 수량/현재가/목표 비중/국내·해외 여부/주문 단위(lot)를 배열로 받아 한 번에 계산
+- 금액은 원화 기준(해외 종목은 현재가 * 환율)
+- 운용 금액 = (예수금 + 보유 평가금액 + additional_amount) * available_limit
+- 국내/해외 종목은 각각 운용 금액 * domestic_limit / overseas_limit 안에서 목표 비중(그룹 안에서 정규화)대로 배분
+- 목표 수량은 주문 단위로 내림, 주문 수량은 주문 단위의 배수(매수는 내림, 매도는 올림(보유 수량까지))
+- 매수 금액이 (예수금 + 매도 금액)보다 큰 경우 매수 수량을 같은 비율로 줄임
+- 주문 순서: 매도(금액 큰 순) -> 매수(금액 큰 순)
+- 목표 비중이 0인(혹은 목표에 없는) 보유 종목은 전량 매도
+
+example)
+    plan = plan_rebalance(product_codes=['005930', 'AAPL'],
+                          counts=[10, 0],
+                          prices=[70000, 150.],
+                          weights=[1., 1.],
+                          is_overseas=[False, True],
+                          cash=1_000_000,
+                          currency=1200.,
+                          limits=RebalanceLimits(available_limit=0.9, domestic_limit=0.5, overseas_limit=0.4))
+    plan.orders()  # [{'product_code': '005930', 'side': 'sell', 'count': 3, ...}, ...]
+"""
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+
+# [Section] Modules
+
+class RebalanceLimits(NamedTuple):
+    """ setting 테이블의 REBALANCE section """
+    available_limit: float = 0.9  # 계좌 전체 금액 중 사용할 금액 비율
+    domestic_limit: float = 0.19  # available_limit 중 국내 주식 비율
+    overseas_limit: float = 0.27  # available_limit 중 해외 주식 비율
+    additional_amount: float = 0.  # 계좌 전체 금액 계산시 추가할 금액(타 계좌에 존재하는 자본금)
+
+
+class RebalancePlan:
+    """ plan_rebalance 결과(종목별 배열) """
+    def __init__(self,
+                 product_codes: np.ndarray,
+                 market_codes: np.ndarray,
+                 is_overseas: np.ndarray,
+                 prices: np.ndarray,
+                 krw_prices: np.ndarray,
+                 counts: np.ndarray,
+                 deltas: np.ndarray,
+                 total_amount: float,
+                 budget: float,
+                 cash: float,
+                 currency: float):
+        self.product_codes = product_codes
+        self.market_codes = market_codes
+        self.is_overseas = is_overseas
+        self.prices = prices
+        self.krw_prices = krw_prices
+        self.counts = counts
+        self.deltas = deltas
+        self.total_amount = total_amount
+        self.budget = budget
+        self.cash = cash
+        self.currency = currency
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.deltas))
+
+    @property
+    def targets(self) -> np.ndarray:
+        """ 주문 후 수량 """
+        return self.counts + self.deltas
+
+    @property
+    def amounts(self) -> np.ndarray:
+        """ 주문 금액(원화, 매도는 음수) """
+        return self.deltas * self.krw_prices
+
+    def order_index(self) -> np.ndarray:
+        """ 주문할 종목 index(매도 -> 매수, 각각 금액 큰 순) """
+        index = np.flatnonzero(self.deltas)
+        amounts = self.amounts[index]
+        return index[np.lexsort((-np.abs(amounts), amounts > 0))]
+
+    def orders(self) -> List[Dict]:
+        index = self.order_index()
+        keys = ('product_code', 'market_code', 'is_overseas', 'side', 'count', 'price', 'amount',
+                'current_count', 'target_count')
+        columns = (
+            self.product_codes[index].tolist(),
+            self.market_codes[index].tolist(),
+            self.is_overseas[index].tolist(),
+            np.where(self.deltas[index] > 0, 'buy', 'sell').tolist(),
+            np.abs(self.deltas[index]).tolist(),
+            self.prices[index].tolist(),
+            np.abs(self.amounts[index]).tolist(),
+            self.counts[index].tolist(),
+            self.targets[index].tolist(),
+        )
+        return [dict(zip(keys, values)) for values in zip(*columns)]
+
+    def summary(self) -> Dict:
+        amounts = self.amounts
+        sell_amount = float(-amounts[amounts < 0].sum())
+        buy_amount = float(amounts[amounts > 0].sum())
+        target_values = self.targets * self.krw_prices
+
+        return {
+            'total_amount': self.total_amount,
+            'budget': self.budget,
+            'currency': self.currency,
+            'cash': self.cash,
+            'sell_amount': sell_amount,
+            'buy_amount': buy_amount,
+            'cash_after': self.cash + sell_amount - buy_amount,
+            'domestic_amount': float(target_values[~self.is_overseas].sum()),
+            'overseas_amount': float(target_values[self.is_overseas].sum()),
+            'orders': len(self),
+        }
+
+
+def plan_rebalance(product_codes: Sequence[str],
+                   counts: Sequence[int],
+                   prices: Sequence[float],
+                   weights: Sequence[float],
+                   is_overseas: Sequence[bool] = None,
+                   lots: Sequence[int] = None,
+                   market_codes: Sequence[Optional[str]] = None,
+                   cash: float = 0.,
+                   currency: float = 1.,
+                   limits: RebalanceLimits = RebalanceLimits(),
+                   min_amount: float = 0.) -> RebalancePlan:
+    """
+    :param product_codes: 종목코드
+    :param counts: 보유 수량
+    :param prices: 현재가(종목 통화, 해외는 USD)
+    :param weights: 목표 비중(국내/해외 그룹 안에서 합이 1이 되도록 정규화)
+    :param is_overseas: 해외 종목 여부(없을 경우 전체 국내)
+    :param lots: 주문 단위(없을 경우 1)
+    :param market_codes: 해외 거래소 코드(주문시 사용)
+    :param cash: 예수금(원화)
+    :param currency: 1 달러 -> 원 환율
+    :param limits: RebalanceLimits
+    :param min_amount: 주문 금액(원화)이 이보다 작은 종목은 주문하지 않음
+    """
+    size = len(product_codes)
+
+    product_codes = np.asarray(product_codes, dtype=object)
+    counts = np.asarray(counts, dtype=np.int64)
+    prices = np.asarray(prices, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    is_overseas = np.zeros(size, dtype=bool) if is_overseas is None else np.asarray(is_overseas, dtype=bool)
+    lots = np.ones(size, dtype=np.int64) if lots is None else np.maximum(np.asarray(lots, dtype=np.int64), 1)
+    market_codes = np.full(size, None, dtype=object) if market_codes is None else np.asarray(market_codes, dtype=object)
+
+    for name, values in (('counts', counts), ('prices', prices), ('weights', weights),
+                         ('is_overseas', is_overseas), ('lots', lots), ('market_codes', market_codes)):
+        if values.shape != (size,):
+            raise ValueError(f"'{name}'의 길이가 product_codes와 다릅니다: {values.shape} != ({size},)")
+
+    if size and (prices <= 0).any():
+        raise ValueError(f'현재가가 0 이하인 종목이 있습니다: {product_codes[prices <= 0].tolist()}')
+
+    if (weights < 0).any() or (counts < 0).any():
+        raise ValueError('목표 비중과 보유 수량은 0 이상이어야 합니다.')
+
+    # 원화 기준 금액
+    krw_prices = prices * np.where(is_overseas, currency, 1.)
+    total_amount = float(cash + (counts * krw_prices).sum() + limits.additional_amount)
+    budget = total_amount * limits.available_limit
+
+    # 국내/해외 그룹별 목표 금액
+    group_budget = np.where(is_overseas, budget * limits.overseas_limit, budget * limits.domestic_limit)
+    group_weight = np.where(is_overseas, weights[is_overseas].sum(), weights[~is_overseas].sum())
+    ratio = np.divide(weights, group_weight, out=np.zeros(size), where=group_weight > 0)
+
+    # 목표 수량(주문 단위로 내림)
+    targets = np.floor(group_budget * ratio / (krw_prices * lots)).astype(np.int64) * lots
+    deltas = targets - counts
+
+    # 매수 수량은 주문 단위로 내림(보유 수량이 주문 단위의 배수가 아닌 경우)
+    buys = deltas > 0
+    deltas[buys] = deltas[buys] // lots[buys] * lots[buys]
+
+    # 매도 수량은 주문 단위로 올림(보유 수량까지)
+    sells = deltas < 0
+    deltas[sells] = -np.minimum(-(deltas[sells] // lots[sells]) * lots[sells], counts[sells])
+
+    # 작은 주문 제외
+    if min_amount > 0:
+        deltas[np.abs(deltas) * krw_prices < min_amount] = 0
+
+    # 매수 금액이 예수금 + 매도 금액을 넘는 경우 매수 수량을 같은 비율로 줄임
+    amounts = deltas * krw_prices
+    available = cash - amounts[amounts < 0].sum()
+    buy_amount = amounts[amounts > 0].sum()
+
+    if buy_amount > available:
+        buys = deltas > 0
+        scale = max(available, 0.) / buy_amount
+        deltas[buys] = np.floor(deltas[buys] * scale / lots[buys]).astype(np.int64) * lots[buys]
+
+    return RebalancePlan(product_codes=product_codes,
+                         market_codes=market_codes,
+                         is_overseas=is_overseas,
+                         prices=prices,
+                         krw_prices=krw_prices,
+                         counts=counts,
+                         deltas=deltas,
+                         total_amount=total_amount,
+                         budget=budget,
+                         cash=float(cash),
+                         currency=float(currency))
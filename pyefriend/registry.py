@@ -0,0 +1,177 @@
+"""
+# Api Registry
+
+생성한 DomesticApi/OverSeasApi 재사용
+
+- Api 생성시 매번 수행하던 password 암호화(GetEncryptPassword), 계좌 목록 조회, IsVTS 확인을
+  (market, account, 인증정보 hash)별로 한 번만 수행
+- 인증정보는 process별 임의 key로 HMAC한 값만 보관(원문 password는 저장하지 않음)
+- idle_timeout(초) 동안 사용하지 않은 Api는 제거
+- 연결/계좌 관련 에러가 발생한 경우 report_error로 해당 Api를 제거하여 다음 요청에서 다시 검증
+- idle_timeout은 환경변수로 변경 가능
+    ex) PYEFRIEND__API_IDLE_TIMEOUT=1800
+
+example)
+    api = get_or_create_api_registry().get(market='domestic', account='5005775101', password='password')
+"""
+import os
+import hmac
+import time
+import hashlib
+import threading
+from typing import Dict, NamedTuple, Optional, Union
+
+from .api import DomesticApi, OverSeasApi
+from .const import Market
+from .exceptions import (UnExpectedException, NotConnectedException, AccountNotExistsException,
+                         UnAuthorizedAccountException)
+from .helper import load_api
+from .log import logger as pyefriend_logger
+from .metrics import metrics
+
+
+# 사용하지 않은 Api를 제거하기까지의 시간(초)
+API_IDLE_TIMEOUT = float(os.getenv('PYEFRIEND__API_IDLE_TIMEOUT', 1800))
+
+# 발생시 Api를 다시 검증해야 하는 에러(UnExpectedException이 아닌 에러 포함)
+REVALIDATE_EXCEPTIONS = (
+    NotConnectedException,
+    AccountNotExistsException,
+    UnAuthorizedAccountException,
+)
+
+# [Section] Variables
+
+api_registry: Optional['ApiRegistry'] = None
+
+_lock = threading.Lock()
+
+
+# [Section] Modules
+
+class RegistryKey(NamedTuple):
+    market: str
+    account: str
+    credential: str  # 인증정보 HMAC
+
+
+class ApiRegistry:
+    """
+    :param idle_timeout: 사용하지 않은 Api를 제거하기까지의 시간(초)
+    """
+    def __init__(self, idle_timeout: float = API_IDLE_TIMEOUT, logger=None):
+        if not logger:
+            logger = pyefriend_logger
+
+        self.idle_timeout = idle_timeout
+        self.logger = logger
+
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self.invalidated = 0
+
+        # {key: [Api, 마지막 사용 시각]}
+        self.entries: Dict[RegistryKey, list] = {}
+        self._secret = os.urandom(32)
+        self._lock = threading.RLock()
+
+    def make_key(self,
+                 market: Market,
+                 account: str,
+                 password: str = None,
+                 encrypted_password: str = None) -> RegistryKey:
+        credential = f'{"e" if encrypted_password else "p"}:{encrypted_password or password or ""}'
+        digest = hmac.new(self._secret, credential.encode('utf-8'), hashlib.sha256).hexdigest()
+        return RegistryKey(market=Market(market).value, account=account, credential=digest)
+
+    def get(self,
+            market: Market,
+            account: str,
+            password: str = None,
+            encrypted_password: str = None,
+            logger=None) -> Union[DomesticApi, OverSeasApi]:
+        """ 생성된 Api 반환(없을 경우 helper.load_api로 생성 후 저장) """
+        key = self.make_key(market, account, password=password, encrypted_password=encrypted_password)
+        now = time.monotonic()
+
+        with self._lock:
+            self.evict_idle(now)
+
+            entry = self.entries.get(key)
+            if entry is not None:
+                entry[1] = now
+                self.hits += 1
+                return entry[0]
+
+            self.misses += 1
+            api = load_api(market=market,
+                           account=account,
+                           password=password,
+                           encrypted_password=encrypted_password,
+                           logger=logger or self.logger)
+            self.entries[key] = [api, now]
+
+        return api
+
+    def evict_idle(self, now: float = None) -> int:
+        """ idle_timeout 동안 사용하지 않은 Api 제거 """
+        now = time.monotonic() if now is None else now
+
+        with self._lock:
+            targets = [key for key, (_, last_used) in self.entries.items()
+                       if now - last_used > self.idle_timeout]
+            for key in targets:
+                del self.entries[key]
+            self.evicted += len(targets)
+
+        return len(targets)
+
+    def invalidate(self, api: Union[DomesticApi, OverSeasApi] = None) -> int:
+        """ 해당 Api(없을 경우 전체) 제거, 다음 get에서 다시 생성/검증 """
+        with self._lock:
+            targets = [key for key, (entry_api, _) in self.entries.items()
+                       if api is None or entry_api is api]
+            for key in targets:
+                del self.entries[key]
+            self.invalidated += len(targets)
+
+        if targets:
+            self.logger.debug(f'Api를 다시 검증합니다.: {len(targets)}')
+
+        return len(targets)
+
+    def report_error(self, api: Union[DomesticApi, OverSeasApi], error: BaseException) -> bool:
+        """
+        Api 호출 중 발생한 에러 전달, 연결/계좌 관련 에러(혹은 예상하지 못한 에러)일 경우 제거
+
+        :return: 제거 여부
+        """
+        if isinstance(error, REVALIDATE_EXCEPTIONS) or not isinstance(error, UnExpectedException):
+            return self.invalidate(api) > 0
+        return False
+
+    def clear(self):
+        self.invalidate()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                'size': len(self.entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evicted': self.evicted,
+                'invalidated': self.invalidated,
+                'idle_timeout': self.idle_timeout,
+            }
+
+
+def get_or_create_api_registry(logger=None) -> ApiRegistry:
+    global api_registry
+
+    with _lock:
+        if api_registry is None:
+            api_registry = ApiRegistry(logger=logger)
+            metrics.register('api_registry', api_registry.snapshot)
+
+    return api_registry
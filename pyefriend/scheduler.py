@@ -0,0 +1,247 @@
+"""
+# Scheduler
+
+controller thread 앞단의 우선순위 요청 대기열
+
+- 우선순위: 주문(ORDER) > 계좌 조회(ACCOUNT) > 시세 조회(QUOTE) > 히스토리 조회(HISTORY)
+- 분류별 대기열 최대 길이를 넘으면 QueueFullException
+- deadline이 지난 조회 요청은 실행하지 않고 RequestExpiredException으로 종료(주문은 deadline 없음)
+"""
+import time
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Deque, Dict, Optional
+
+from .const import ServiceClass
+from .exceptions import QueueFullException, RequestExpiredException
+
+
+# 우선순위(앞에 있을수록 먼저 실행)
+PRIORITIES = (
+    ServiceClass.ORDER,
+    ServiceClass.ACCOUNT,
+    ServiceClass.QUOTE,
+    ServiceClass.HISTORY,
+)
+
+# 분류별 대기열 최대 길이(None일 경우 제한 없음)
+DEFAULT_LIMITS: Dict[ServiceClass, Optional[int]] = {
+    ServiceClass.ORDER: None,
+    ServiceClass.ACCOUNT: 100,
+    ServiceClass.QUOTE: 200,
+    ServiceClass.HISTORY: 50,
+}
+
+# 분류별 최대 대기 시간(초), 지나면 실행하지 않음(None일 경우 제한 없음)
+DEFAULT_DEADLINES: Dict[ServiceClass, Optional[float]] = {
+    ServiceClass.ORDER: None,
+    ServiceClass.ACCOUNT: None,
+    ServiceClass.QUOTE: 5.,
+    ServiceClass.HISTORY: 30.,
+}
+
+# Api 함수/property별 분류(없을 경우 QUOTE)
+API_METHOD_CLASSES: Dict[str, ServiceClass] = {
+    # 주문
+    'buy_stock': ServiceClass.ORDER,
+    'sell_stock': ServiceClass.ORDER,
+    'cancel_order': ServiceClass.ORDER,
+    'cancel_all_unprocessed_orders': ServiceClass.ORDER,
+    'submit_orders': ServiceClass.ORDER,
+
+    # 계좌
+    'domestic_deposit': ServiceClass.ACCOUNT,
+    'overseas_deposit': ServiceClass.ACCOUNT,
+    'domestic_stocks': ServiceClass.ACCOUNT,
+    'overseas_stocks': ServiceClass.ACCOUNT,
+    'get_deposit': ServiceClass.ACCOUNT,
+    'get_stocks': ServiceClass.ACCOUNT,
+    'evaluate_amount': ServiceClass.ACCOUNT,
+    'currency': ServiceClass.ACCOUNT,
+    'currency_info': ServiceClass.ACCOUNT,
+    'refresh_currency': ServiceClass.ACCOUNT,
+    'get_processed_orders': ServiceClass.ACCOUNT,
+    'get_unprocessed_orders': ServiceClass.ACCOUNT,
+
+    # 히스토리
+    'get_kospi_histories': ServiceClass.HISTORY,
+    'get_sp500_histories': ServiceClass.HISTORY,
+    'list_product_histories': ServiceClass.HISTORY,
+    'list_product_histories_daily': ServiceClass.HISTORY,
+    'iter_product_histories_daily': ServiceClass.HISTORY,
+    'fetch_product_histories_daily': ServiceClass.HISTORY,
+    'iter_fetch_product_histories_daily': ServiceClass.HISTORY,
+    'list_sector_histories': ServiceClass.HISTORY,
+    'iter_sector_histories': ServiceClass.HISTORY,
+    'get_product_chart': ServiceClass.HISTORY,
+    'get_sector_chart': ServiceClass.HISTORY,
+}
+
+
+# [Section] Modules
+
+class Job:
+    """ 대기열에 등록된 요청 """
+    __slots__ = ('future', 'func', 'args', 'kwargs', 'service_class', 'enqueued', 'deadline')
+
+    def __init__(self,
+                 func: Callable,
+                 args: tuple = (),
+                 kwargs: dict = None,
+                 service_class: ServiceClass = ServiceClass.QUOTE,
+                 deadline: float = None):
+        self.future = Future()
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.service_class = service_class
+        self.enqueued = time.monotonic()
+        self.deadline = deadline
+
+    def run(self):
+        if not self.future.set_running_or_notify_cancel():
+            return
+
+        try:
+            result = self.func(*self.args, **self.kwargs)
+        except BaseException as e:
+            self.future.set_exception(e)
+        else:
+            self.future.set_result(result)
+
+
+class QueueStat:
+    """ 분류별 대기열 통계 """
+    def __init__(self):
+        self.submitted = 0
+        self.executed = 0
+        self.rejected = 0
+        self.expired = 0
+        self.total_wait = 0.
+        self.max_wait = 0.
+
+
+class PriorityScheduler:
+    """
+    분류별 FIFO 대기열, get()은 우선순위가 가장 높은 분류의 요청부터 반환
+
+    :param limits: {ServiceClass: 대기열 최대 길이}
+    :param deadlines: {ServiceClass: 최대 대기 시간(초)}
+    """
+    def __init__(self,
+                 limits: Dict[ServiceClass, Optional[int]] = None,
+                 deadlines: Dict[ServiceClass, Optional[float]] = None):
+        self.limits = dict(DEFAULT_LIMITS, **(limits or {}))
+        self.deadlines = dict(DEFAULT_DEADLINES, **(deadlines or {}))
+        self.queues: Dict[ServiceClass, Deque[Job]] = {service_class: deque() for service_class in PRIORITIES}
+        self.stats: Dict[ServiceClass, QueueStat] = {service_class: QueueStat() for service_class in PRIORITIES}
+        self._closed = False
+        self._condition = threading.Condition()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def put(self, job: Job) -> Future:
+        with self._condition:
+            if self._closed:
+                raise RuntimeError('scheduler가 종료되었습니다.')
+
+            queue = self.queues[job.service_class]
+            stat = self.stats[job.service_class]
+            limit = self.limits.get(job.service_class)
+
+            if limit is not None and len(queue) >= limit:
+                stat.rejected += 1
+                raise QueueFullException(f"'{job.service_class.value}' 대기열이 가득 찼습니다.(limit: {limit})")
+
+            if job.deadline is None:
+                max_wait = self.deadlines.get(job.service_class)
+                if max_wait is not None:
+                    job.deadline = job.enqueued + max_wait
+
+            queue.append(job)
+            stat.submitted += 1
+            self._condition.notify()
+
+        return job.future
+
+    def submit(self,
+               func: Callable,
+               *args,
+               service_class: ServiceClass = ServiceClass.QUOTE,
+               **kwargs) -> Future:
+        return self.put(Job(func, args, kwargs, service_class=service_class))
+
+    def _pop(self) -> Optional[Job]:
+        """ 우선순위가 가장 높은 요청 반환, deadline이 지난 요청은 제거 """
+        now = time.monotonic()
+
+        for service_class in PRIORITIES:
+            queue = self.queues[service_class]
+            stat = self.stats[service_class]
+
+            while queue:
+                job = queue.popleft()
+                wait = now - job.enqueued
+
+                if job.deadline is not None and now > job.deadline:
+                    stat.expired += 1
+                    if job.future.set_running_or_notify_cancel():
+                        job.future.set_exception(
+                            RequestExpiredException(f"'{service_class.value}' 요청이 {wait:.3f}초 대기 후 만료되었습니다.")
+                        )
+                    continue
+
+                stat.executed += 1
+                stat.total_wait += wait
+                stat.max_wait = max(stat.max_wait, wait)
+                return job
+
+        return None
+
+    def get(self, timeout: float = None) -> Optional[Job]:
+        """ 다음 요청 반환(없으면 대기), 종료되었거나 timeout일 경우 None """
+        with self._condition:
+            end = None if timeout is None else time.monotonic() + timeout
+
+            while True:
+                if self._closed:
+                    return None
+
+                job = self._pop()
+                if job is not None:
+                    return job
+
+                remaining = None if end is None else end - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+
+                self._condition.wait(remaining)
+
+    def close(self):
+        """ 종료, 대기중인 요청은 모두 취소 """
+        with self._condition:
+            self._closed = True
+            for queue in self.queues.values():
+                while queue:
+                    queue.popleft().future.cancel()
+            self._condition.notify_all()
+
+    def snapshot(self) -> Dict[str, dict]:
+        """ 분류별 대기열 길이 및 대기 시간 """
+        with self._condition:
+            return {
+                service_class.value: {
+                    'depth': len(self.queues[service_class]),
+                    'limit': self.limits.get(service_class),
+                    'submitted': stat.submitted,
+                    'executed': stat.executed,
+                    'rejected': stat.rejected,
+                    'expired': stat.expired,
+                    'avg_wait': stat.total_wait / stat.executed if stat.executed else 0.,
+                    'max_wait': stat.max_wait,
+                }
+                for service_class, stat in self.stats.items()
+            }
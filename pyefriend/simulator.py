@@ -0,0 +1,361 @@
+"""
+# Simulator
+
+efriend expert 없이(Linux CI 등) Api의 전체 요청 경로를 실행하기 위한 in-process backend
+
+- 서비스별 응답은 Fixture로 설정하며, 입력값에 따라 응답을 바꾸고 싶다면 Fixture 대신 callable을 등록
+- RequestData 호출시 설정한 latency(+jitter)만큼 대기하여 실제 transaction 지연을 흉내냄
+
+example)
+    from pyefriend.api import set_controller
+    from pyefriend.simulator import SimulatedController, Fixture
+
+    set_controller(SimulatedController(fixtures={'SCP': Fixture(single={11: '70000'})}))
+"""
+import json
+import random
+import time
+from typing import Callable, Dict, List, Optional, Union
+
+from .controller import BaseController
+from .exceptions import UnExpectedException
+from .metrics import metrics
+from .throttle import Throttle
+
+
+# [Section] Modules
+
+def _to_dict(values: Union[Dict[int, str], List[str], None]) -> Dict[int, str]:
+    if values is None:
+        return {}
+
+    if isinstance(values, dict):
+        return {int(k): str(v) for k, v in values.items()}
+
+    return {i: str(v) for i, v in enumerate(values)}
+
+
+class Fixture:
+    """
+    서비스 하나의 응답 데이터
+
+    :param single: 단건 output(block 0). {field_index: value} 혹은 [value, ...]
+    :param single_ex: block별 단건 output. {block_index: {field_index: value} 혹은 [value, ...]}
+    :param multi: block별 다건 output. {block_index: [[value, ...], ...]} (record x field)
+    :param default: 설정되지 않은 field 조회시 반환할 값
+    :param latency: 응답 지연(초), None일 경우 SimulatedController 기본값 사용
+    :param rt_code: '0'이 아닐 경우 ReceiveErrorData 이벤트 발생
+    :param next_pages: 연속 조회(RequestNextData)시 순서대로 반환할 Fixture 리스트
+    """
+    def __init__(self,
+                 single: Union[Dict[int, str], List[str]] = None,
+                 single_ex: Dict[int, Union[Dict[int, str], List[str]]] = None,
+                 multi: Dict[int, List[List[str]]] = None,
+                 default: str = '',
+                 latency: float = None,
+                 rt_code: str = '0',
+                 msg_code: str = '00000000',
+                 message: str = '정상처리 되었습니다.',
+                 next_pages: List['Fixture'] = None):
+        self.single_ex = {int(block): _to_dict(values) for block, values in (single_ex or {}).items()}
+        self.single_ex.setdefault(0, _to_dict(single))
+        self.multi = {int(block): [[str(v) for v in row] for row in rows] for block, rows in (multi or {}).items()}
+        self.default = default
+        self.latency = latency
+        self.rt_code = rt_code
+        self.msg_code = msg_code
+        self.message = message
+        self.next_pages = list(next_pages or [])
+
+    @classmethod
+    def filled(cls,
+               value: str = '1',
+               single_fields: int = 100,
+               records: int = 100,
+               fields: int = 70,
+               blocks: int = 4,
+               **kwargs) -> 'Fixture':
+        """ 모든 block/field가 value로 채워진 Fixture(처리량 측정용) """
+        row = [value] * fields
+        return cls(single_ex={block: [value] * single_fields for block in range(blocks)},
+                   multi={block: [list(row) for _ in range(records)] for block in range(blocks)},
+                   default=value,
+                   **kwargs)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Fixture':
+        """ json 등에서 읽은 dict로 Fixture 생성(block/field index key는 문자열이어도 무방) """
+        data = dict(data)
+        if 'single_ex' in data:
+            data['single_ex'] = {int(block): values for block, values in data['single_ex'].items()}
+        if 'multi' in data:
+            data['multi'] = {int(block): rows for block, rows in data['multi'].items()}
+        if 'next_pages' in data:
+            data['next_pages'] = [cls.from_dict(page) for page in data['next_pages']]
+        return cls(**data)
+
+
+# service별 fixture 혹은 입력값(SimulatedRequest)을 받아 Fixture를 반환하는 callable
+FixtureLike = Union[Fixture, Callable[['SimulatedRequest'], Fixture]]
+
+
+class SimulatedRequest:
+    """ RequestData 호출 전까지 Set* 함수로 입력된 값 """
+    def __init__(self):
+        self.single: Dict[int, str] = {}
+        self.single_ex: Dict[int, Dict[int, str]] = {}
+        self.multi: Dict[int, Dict[int, Dict[int, str]]] = {}
+
+    def get(self, field_index: int, block_index: int = None, default: str = None) -> Optional[str]:
+        if block_index is None:
+            return self.single.get(field_index, default)
+        return self.single_ex.get(block_index, {}).get(field_index, default)
+
+
+class SimulatedController(BaseController):
+    """
+    efriend expert를 흉내내는 pure-python Controller
+
+    :param fixtures: {service: Fixture 혹은 callable(SimulatedRequest) -> Fixture}
+    :param default_fixture: fixtures에 없는 service 요청시 사용할 Fixture(None일 경우 에러)
+    :param accounts: 로그인된 계좌 리스트
+    :param latency: transaction 평균 지연(초)
+    :param jitter: 지연 표준편차(초)
+    :param stock_master: {product_code: {field_index: value}}
+    """
+    def __init__(self,
+                 fixtures: Dict[str, FixtureLike] = None,
+                 default_fixture: Optional[FixtureLike] = None,
+                 accounts: List[str] = ('5005775101',),
+                 latency: float = 0.05,
+                 jitter: float = 0.01,
+                 is_vts: bool = True,
+                 stock_master: Dict[str, Dict[int, str]] = None,
+                 seed: int = None,
+                 throttle: Throttle = None,
+                 logger=None):
+        super().__init__(logger=logger, throttle=throttle)
+        self.fixtures: Dict[str, FixtureLike] = dict(fixtures or {})
+        self.default_fixture = default_fixture
+        self.accounts = list(accounts)
+        self.latency = latency
+        self.jitter = jitter
+        self.is_vts = is_vts
+        self.stock_master = stock_master or {}
+
+        self._random = random.Random(seed)
+        self._request = SimulatedRequest()
+        self._response: Optional[Fixture] = None
+        self._next_pages: List[Fixture] = []
+        self._receive_data_handler = None
+        self._receive_error_data_handler = None
+        self._receive_real_data_handler = None
+        self.real_data = set()
+
+    @classmethod
+    def from_json(cls, path: str, **kwargs) -> 'SimulatedController':
+        """
+        json 파일로부터 fixture 로드
+        {"fixtures": {"SCP": {"single": {"11": "70000"}}, ...}, "default_fixture": {...}}
+        """
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+
+        fixtures = {service: Fixture.from_dict(fixture) for service, fixture in data.get('fixtures', {}).items()}
+        default_fixture = data.get('default_fixture')
+        if default_fixture is not None:
+            default_fixture = Fixture.from_dict(default_fixture)
+
+        return cls(fixtures=fixtures, default_fixture=default_fixture, **kwargs)
+
+    def add_fixture(self, service: str, fixture: FixtureLike):
+        self.fixtures[service] = fixture
+        return self
+
+    def _resolve(self, service: str) -> Fixture:
+        fixture = self.fixtures.get(service, self.default_fixture)
+
+        if fixture is None:
+            raise UnExpectedException(f"'{service}'에 대한 fixture가 설정되지 않았습니다.")
+
+        if callable(fixture):
+            fixture = fixture(self._request)
+
+        return fixture
+
+    def _wait(self, fixture: Fixture):
+        latency = self.latency if fixture.latency is None else fixture.latency
+        delay = self._random.gauss(latency, self.jitter) if self.jitter else latency
+        if delay > 0:
+            time.sleep(delay)
+
+    def _receive(self, fixture: Fixture):
+        self._response = fixture
+
+        if fixture.rt_code != '0':
+            handler = self._receive_error_data_handler
+        else:
+            handler = self._receive_data_handler
+
+        # 입력값 초기화
+        self._request = SimulatedRequest()
+
+        if handler is not None:
+            handler()
+
+    # Event
+    def set_receive_error_data_handler(self, handler):
+        self._receive_error_data_handler = handler
+
+    def set_receive_data_event_handler(self, handler):
+        self._receive_data_handler = handler
+
+    def set_receive_real_data_handler(self, handler):
+        self._receive_real_data_handler = handler
+
+    def push_real_data(self, query: str, code: str, values: Union[Dict[int, str], List[str]]) -> bool:
+        """
+        실시간 데이터 수신(ReceiveRealData 이벤트) 발생
+
+        :return: 등록된 (query, code)여서 이벤트가 발생했는지 여부
+        """
+        if (query, code) not in self.real_data:
+            return False
+
+        self._response = Fixture(single=values)
+
+        if self._receive_real_data_handler is not None:
+            self._receive_real_data_handler()
+
+        return True
+
+    # Input
+    def SetSingleData(self, field_index: int, value: str) -> str:
+        self._request.single[field_index] = value
+        return ''
+
+    def SetSingleDataEx(self, block_index: int, field_index: int, value: str) -> str:
+        self._request.single_ex.setdefault(block_index, {})[field_index] = value
+        return ''
+
+    def SetMultiData(self, record_index: int, field_index: int, value: str) -> str:
+        return self.SetMultiBlockData(0, record_index, field_index, value)
+
+    def SetMultiBlockData(self, block_index: int, record_index: int, field_index: int, value: str) -> bool:
+        self._request.multi.setdefault(block_index, {}).setdefault(record_index, {})[field_index] = value
+        return True
+
+    # Request
+    def RequestData(self, service: str):
+        self.logger.debug(f'Call RequestData(QString) with args: {service}')
+
+        self.throttle.acquire(service)
+        self.last_service = service
+        started = time.perf_counter()
+
+        try:
+            fixture = self._resolve(service)
+            self._next_pages = list(fixture.next_pages)
+            self._wait(fixture)
+            self.request_count += 1
+            self._receive(fixture)
+            return self
+        finally:
+            metrics.record_request(service, time.perf_counter() - started)
+
+    def RequestNextData(self, service: str):
+        self.logger.debug(f'Call RequestNextData(QString) with args: {service}')
+
+        if not self._next_pages:
+            raise UnExpectedException(f"'{service}'에 대한 다음 조회 데이터가 없습니다.")
+
+        self.throttle.acquire(service)
+        self.last_service = service
+        started = time.perf_counter()
+
+        try:
+            fixture = self._next_pages.pop(0)
+            self._wait(fixture)
+            self.request_count += 1
+            self._receive(fixture)
+            return self
+        finally:
+            metrics.record_request(service, time.perf_counter() - started)
+
+    def IsMoreNextData(self) -> str:
+        return '1' if self._next_pages else '0'
+
+    def RequestRealData(self, query: str, code: str):
+        self.real_data.add((query, code))
+
+    def UnRequestRealData(self, query: str, code: str):
+        self.real_data.discard((query, code))
+
+    def UnRequestAllRealData(self):
+        self.real_data.clear()
+
+    # Output
+    def GetSingleFieldCount(self) -> int:
+        return len(self._response.single_ex[0]) if self._response else 0
+
+    def GetMultiBlockCount(self) -> int:
+        return len(self._response.multi) if self._response else 0
+
+    def GetMultiRecordCount(self, block_index: int) -> int:
+        if self._response is None:
+            return 0
+        return len(self._response.multi.get(block_index, ()))
+
+    def GetMultiFieldCount(self, block_index: int, record_index: int) -> int:
+        if self._response is None:
+            return 0
+        rows = self._response.multi.get(block_index, ())
+        return len(rows[record_index]) if record_index < len(rows) else 0
+
+    def GetSingleData(self, field_index: int, attribute_type: int = 0) -> str:
+        return self.GetSingleDataEx(0, field_index, attribute_type)
+
+    def GetSingleDataEx(self, block_index: int, field_index: int, attribute_type: int = 0) -> str:
+        if self._response is None:
+            return ''
+        return self._response.single_ex.get(block_index, {}).get(field_index, self._response.default)
+
+    def GetMultiData(self, block_index: int, record_index: int, field_index: int, attribute_type: int = 0) -> str:
+        if self._response is None:
+            return ''
+        try:
+            return self._response.multi[block_index][record_index][field_index]
+        except (KeyError, IndexError):
+            return self._response.default
+
+    # Message
+    def GetReqMsgCode(self) -> str:
+        return self._response.msg_code if self._response else ''
+
+    def GetRtCode(self) -> str:
+        return self._response.rt_code if self._response else '0'
+
+    def GetReqMessage(self) -> str:
+        return self._response.message if self._response else ''
+
+    # Account
+    def GetAccountCount(self) -> int:
+        return len(self.accounts)
+
+    def GetAccount(self, account_index: int) -> str:
+        return self.accounts[account_index]
+
+    def GetAccountBrcode(self, account: str) -> str:
+        return '01'
+
+    def GetEncryptPassword(self, raw_password) -> str:
+        return f'encrypted:{raw_password}'
+
+    def GetOverSeasStockSise(self) -> str:
+        return 'SIMULATED'
+
+    def GetSingleDataStockMaster(self, product_code: str, field_index: int) -> str:
+        return self.stock_master.get(product_code, {}).get(field_index, '')
+
+    def IsVTS(self) -> bool:
+        return self.is_vts
@@ -0,0 +1,270 @@
+"""
+# History Store
+
+일별 시세(list_product_histories_daily) local 저장소
+
+- 종목별로 numpy structured array(.npy) 하나와, 조회를 마친 기간 정보(.json)를 저장
+    {root}/{market}/{product_code}.npy
+    {root}/{market}/{product_code}.json  # {"ranges": [["20200101", "20211130"], ...]}
+- 요청한 기간 중 조회하지 않은 기간(gap)만 서버에 요청하여 추가하므로, 이미 받은 기간은 local에서 바로 반환
+- 확정되지 않은(장중 변동) 일자의 데이터는 저장하지 않고 매번 조회
+  (시장별 확정 시각 FINAL_AFTER 기준, 해외 시세는 한국 시간 다음날 오전까지 변동)
+- 연속 조회가 중간에 끝난 경우(max_pages) 받은 기간만 조회를 마친 기간으로 저장
+- 환경변수 'PYEFRIEND__HISTORY_STORE'에 저장 경로를 설정한 경우에만 사용
+"""
+import os
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .log import logger as pyefriend_logger
+
+
+# 저장 경로(None일 경우 저장소를 사용하지 않음)
+HISTORY_STORE = os.getenv('PYEFRIEND__HISTORY_STORE')
+
+# 저장 형식
+DTYPE = np.dtype([
+    ('standard_date', 'U8'),
+    ('minimum', 'f8'),
+    ('maximum', 'f8'),
+    ('opening', 'f8'),
+    ('closing', 'f8'),
+    ('volume', 'i8'),
+])
+
+DATE_FORMAT = '%Y%m%d'
+
+KST = timezone(timedelta(hours=9))
+
+# 시장별 일별 시세 확정 시각: 일자 D의 시세는 D 00:00(KST) + FINAL_AFTER 이후 확정
+# - domestic: 당일 18:00(시간외 단일가 종료)
+# - overseas: 다음날 07:00(미국 정규장 종료 05:00~06:00 KST, 서머타임과 관계없이 여유)
+FINAL_AFTER = {
+    'domestic': timedelta(hours=18),
+    'overseas': timedelta(days=1, hours=7),
+}
+
+# [Section] Variables
+
+history_store: Optional['HistoryStore'] = None
+
+_lock = threading.Lock()
+
+
+# [Section] Modules
+
+def shift_date(value: str, days: int) -> str:
+    """ 'YYYYMMDD' +- days """
+    return (datetime.strptime(value, DATE_FORMAT) + timedelta(days=days)).strftime(DATE_FORMAT)
+
+
+def merge_ranges(ranges: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """ 겹치거나 이어지는 기간 병합 """
+    merged: List[Tuple[str, str]] = []
+
+    for start, end in sorted(ranges):
+        if merged and start <= shift_date(merged[-1][1], 1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+
+    return merged
+
+
+def subtract_ranges(start: str, end: str, covered: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """ [start, end] 중 covered에 포함되지 않은 기간 """
+    gaps = []
+    cursor = start
+
+    for covered_start, covered_end in covered:
+        if covered_end < cursor:
+            continue
+        if covered_start > end:
+            break
+        if covered_start > cursor:
+            gaps.append((cursor, shift_date(covered_start, -1)))
+        cursor = shift_date(covered_end, 1)
+        if cursor > end:
+            break
+
+    if cursor <= end:
+        gaps.append((cursor, end))
+
+    return gaps
+
+
+def last_final_date(market: str, now: datetime = None) -> str:
+    """ market의 일별 시세 중 확정된 가장 최근 일자('YYYYMMDD') """
+    now = now or datetime.now(KST)
+    return (now.astimezone(KST) - FINAL_AFTER.get(market, FINAL_AFTER['overseas'])).strftime(DATE_FORMAT)
+
+
+class HistoryStore:
+    """
+    :param root: 저장 경로
+    """
+    def __init__(self, root: str, logger=None):
+        if not logger:
+            logger = pyefriend_logger
+
+        self.root = root
+        self.logger = logger
+        self._arrays: Dict[Tuple[str, str], np.ndarray] = {}
+        self._ranges: Dict[Tuple[str, str], List[Tuple[str, str]]] = {}
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, market: str, product_code: str, ext: str) -> str:
+        return os.path.join(self.root, market, f'{product_code}.{ext}')
+
+    def _key_lock(self, key: Tuple[str, str]) -> threading.Lock:
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def load(self, market: str, product_code: str) -> np.ndarray:
+        """ 저장된 일별 시세(standard_date 오름차순) """
+        key = (market, product_code)
+        array = self._arrays.get(key)
+
+        if array is None:
+            path = self._path(market, product_code, 'npy')
+            array = np.load(path) if os.path.exists(path) else np.empty(0, dtype=DTYPE)
+            self._arrays[key] = array
+
+        return array
+
+    def covered(self, market: str, product_code: str) -> List[Tuple[str, str]]:
+        """ 조회를 마친 기간 """
+        key = (market, product_code)
+        ranges = self._ranges.get(key)
+
+        if ranges is None:
+            path = self._path(market, product_code, 'json')
+            if os.path.exists(path):
+                with open(path, encoding='utf-8') as f:
+                    ranges = [tuple(r) for r in json.load(f)['ranges']]
+            else:
+                ranges = []
+            self._ranges[key] = ranges
+
+        return ranges
+
+    def missing(self, market: str, product_code: str, start_date: str, end_date: str) -> List[Tuple[str, str]]:
+        """ [start_date, end_date] 중 조회하지 않은 기간 """
+        return subtract_ranges(start_date, end_date, self.covered(market, product_code))
+
+    def write(self,
+              market: str,
+              product_code: str,
+              records: List[Dict],
+              start_date: str,
+              end_date: str):
+        """ [start_date, end_date] 조회 결과 저장(확정되지 않은 일자의 데이터 및 기간은 제외) """
+        end_date = min(end_date, last_final_date(market))
+
+        if start_date > end_date:
+            return
+
+        new = np.array([
+            tuple(record[name] for name in DTYPE.names)
+            for record in records
+            if start_date <= record['standard_date'] <= end_date
+        ], dtype=DTYPE)
+
+        # 기존 데이터와 병합(같은 일자는 새 데이터로 교체)
+        array = self.load(market, product_code)
+        array = np.concatenate([array[~np.isin(array['standard_date'], new['standard_date'])], new])
+        array = array[np.argsort(array['standard_date'], kind='stable')]
+
+        ranges = merge_ranges(self.covered(market, product_code) + [(start_date, end_date)])
+
+        directory = os.path.join(self.root, market)
+        os.makedirs(directory, exist_ok=True)
+
+        # 임시 파일에 저장 후 교체
+        path = self._path(market, product_code, 'npy')
+        with open(f'{path}.tmp', 'wb') as f:
+            np.save(f, array)
+        os.replace(f'{path}.tmp', path)
+
+        path = self._path(market, product_code, 'json')
+        with open(f'{path}.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'ranges': ranges}, f)
+        os.replace(f'{path}.tmp', path)
+
+        self._arrays[(market, product_code)] = array
+        self._ranges[(market, product_code)] = ranges
+
+    def read(self, market: str, product_code: str, start_date: str, end_date: str) -> List[Dict]:
+        """ 저장된 [start_date, end_date] 일별 시세(최근 일자부터) """
+        array = self.load(market, product_code)
+        dates = array['standard_date']
+        selected = array[(dates >= start_date) & (dates <= end_date)][::-1]
+        return [dict(zip(DTYPE.names, row)) for row in selected.tolist()]
+
+    def get_or_fetch(self,
+                     market: str,
+                     product_code: str,
+                     start_date: str,
+                     end_date: str,
+                     fetch: Callable[[str, str], List[Dict]]) -> List[Dict]:
+        """
+        조회하지 않은 기간만 fetch(start_date, end_date)로 받아서 저장한 뒤 [start_date, end_date] 반환
+
+        :param fetch: 서버 조회 함수((일별 시세 dict list, 기간 전체를 조회했는지 여부) 반환)
+        """
+        if start_date > end_date:
+            return []
+
+        final_date = last_final_date(market)
+
+        with self._key_lock((market, product_code)):
+            live = []
+
+            for gap_start, gap_end in self.missing(market, product_code, start_date, end_date):
+                self.logger.debug(f"일별 시세 조회: '{product_code}' {gap_start} ~ {gap_end}")
+                records, complete = fetch(gap_start, gap_end)
+
+                if not complete:
+                    # 연속 조회가 중간에 끝난 경우(최근 일자부터 조회) 받은 가장 오래된 일자부터 저장
+                    gap_start = min((record['standard_date'] for record in records), default=shift_date(gap_end, 1))
+                    self.logger.debug(f"일별 시세 일부만 조회: '{product_code}' {gap_start} ~ {gap_end}")
+
+                self.write(market, product_code, records, gap_start, gap_end)
+
+                # 확정되지 않은 일자의 데이터는 저장하지 않고 그대로 반환
+                live += [record for record in records if record['standard_date'] > final_date]
+
+            stored = self.read(market, product_code, start_date, end_date)
+
+        live = sorted(
+            ({name: record[name] for name in DTYPE.names} for record in live
+             if start_date <= record['standard_date'] <= end_date),
+            key=lambda record: record['standard_date'],
+            reverse=True,
+        )
+        return live + stored
+
+
+def get_history_store() -> Optional[HistoryStore]:
+    """ 환경변수 'PYEFRIEND__HISTORY_STORE'가 설정된 경우 HistoryStore 반환 """
+    global history_store
+
+    if history_store is None and HISTORY_STORE:
+        with _lock:
+            if history_store is None:
+                history_store = HistoryStore(HISTORY_STORE)
+
+    return history_store
+
+
+def set_history_store(store: Optional[HistoryStore]) -> Optional[HistoryStore]:
+    """ 사용할 HistoryStore 교체(None일 경우 환경변수 설정을 따름) """
+    global history_store
+
+    history_store = store
+    return history_store
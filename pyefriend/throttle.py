@@ -0,0 +1,239 @@
+"""
+# Throttle
+
+서비스 분류(ServiceClass)별 token bucket 요청 제한
+
+- 허용량이 남아있으면 대기 없이 바로 요청, 소진된 경우에만 대기
+- 서버가 요청 제한 메시지 코드를 반환하면 해당 분류의 요청 속도를 절반으로 낮추고(backoff),
+  정상 응답마다 조금씩 설정값까지 회복
+- 분류별 요청 속도는 환경변수로 변경 가능(history는 quote 한도를 공유하므로 설정할 수 없음)
+    ex) PYEFRIEND__THROTTLE_RATES='quote=20,account=10,order=5'
+"""
+import os
+import time
+import threading
+from collections import deque
+from typing import Dict, Optional
+
+from .const import ServiceClass
+
+
+# 분류별 기본 초당 요청 수(None 혹은 0 이하일 경우 제한 없음)
+DEFAULT_RATES: Dict[ServiceClass, Optional[float]] = {
+    ServiceClass.QUOTE: 20.,
+    ServiceClass.ACCOUNT: 10.,
+    ServiceClass.ORDER: 5.,
+}
+
+# 같은 token bucket을 사용하는 분류(히스토리 조회는 시세 조회 한도를 공유)
+SHARED_CLASSES = {
+    ServiceClass.HISTORY: ServiceClass.QUOTE,
+}
+
+# 요청 제한 초과시 서버가 반환하는 메시지 코드
+THROTTLE_MSG_CODES = (
+    'EGW00201',  # 초당 거래건수를 초과하였습니다.
+)
+
+# 실제 요청 속도 계산시 사용할 구간(초)
+RATE_WINDOW = 10.
+
+
+# [Section] Modules
+
+def check_shared(rates: Dict[ServiceClass, Optional[float]]):
+    """ 다른 분류의 token bucket을 사용하는 분류(SHARED_CLASSES)에 설정한 값이 있으면 ValueError """
+    for service_class, rate in rates.items():
+        if service_class in SHARED_CLASSES and rate is not None:
+            raise ValueError(f"'{service_class.value}'는 '{SHARED_CLASSES[service_class].value}'의 요청 한도를 "
+                             f"공유하므로 따로 설정할 수 없습니다.")
+
+
+def parse_rates(value: str) -> Dict[ServiceClass, float]:
+    """ 'quote=20,account=10' -> {ServiceClass.QUOTE: 20., ServiceClass.ACCOUNT: 10.} """
+    rates = {}
+    for item in value.split(','):
+        if not item.strip():
+            continue
+        name, rate = item.split('=')
+        rates[ServiceClass(name.strip().lower())] = float(rate)
+
+    check_shared(rates)
+    return rates
+
+
+class TokenBucket:
+    """
+    :param rate: 초당 허용 요청 수
+    :param capacity: 한 번에 허용하는 최대 요청 수(burst), None일 경우 rate
+    :param min_rate: backoff시 최소 요청 속도
+    """
+    def __init__(self,
+                 rate: float,
+                 capacity: float = None,
+                 min_rate: float = None,
+                 backoff_factor: float = 0.5,
+                 recover_step: float = None):
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = capacity or max(1., rate)
+        self.min_rate = min_rate or max(rate * 0.1, 0.1)
+        self.backoff_factor = backoff_factor
+        self.recover_step = recover_step or rate * 0.05
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """ token 하나를 예약하고, 사용 가능할 때까지 대기해야 하는 시간(초)을 반환 """
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens -= 1
+
+            if self.tokens >= 0:
+                return 0.
+
+            return -self.tokens / self.rate
+
+    def backoff(self):
+        """ 요청 제한 응답시 요청 속도를 낮추고 남은 token 제거 """
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = max(self.min_rate, self.rate * self.backoff_factor)
+            self.tokens = min(self.tokens, 0.)
+
+    def recover(self):
+        """ 정상 응답시 요청 속도를 설정값까지 조금씩 회복 """
+        if self.rate < self.base_rate:
+            with self._lock:
+                self._refill(time.monotonic())
+                self.rate = min(self.base_rate, self.rate + self.recover_step)
+
+
+class ThrottleStat:
+    """ 분류별 요청 통계 """
+    def __init__(self):
+        self.requests = 0
+        self.throttled = 0
+        self.delayed = 0
+        self.total_wait = 0.
+        self.max_wait = 0.
+        self.timestamps = deque()
+
+    def record(self, now: float, wait: float):
+        self.requests += 1
+        self.timestamps.append(now + wait)
+        # effective_rate를 조회하지 않아도 RATE_WINDOW 이전 기록은 보관하지 않음
+        self.prune(now)
+
+        if wait > 0:
+            self.delayed += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def prune(self, now: float):
+        while self.timestamps and self.timestamps[0] < now - RATE_WINDOW:
+            self.timestamps.popleft()
+
+    def effective_rate(self, now: float) -> float:
+        self.prune(now)
+        return len(self.timestamps) / RATE_WINDOW
+
+
+class Throttle:
+    """
+    ServiceClass별 TokenBucket 모음
+
+    :param rates: {ServiceClass: 초당 요청 수}, 설정하지 않은 분류는 DEFAULT_RATES 혹은 환경변수 값 사용
+                  (SHARED_CLASSES의 분류는 공유하는 분류의 값을 사용하므로 설정할 수 없음)
+    :param burst: {ServiceClass: 최대 burst}
+    """
+    def __init__(self,
+                 rates: Dict[ServiceClass, Optional[float]] = None,
+                 burst: Dict[ServiceClass, float] = None):
+        rates = rates or {}
+        burst = burst or {}
+        check_shared(rates)
+        check_shared(burst)
+
+        _rates = dict(DEFAULT_RATES)
+        _rates.update(parse_rates(os.getenv('PYEFRIEND__THROTTLE_RATES', '')))
+        _rates.update(rates)
+
+        self.buckets: Dict[ServiceClass, Optional[TokenBucket]] = {
+            service_class: TokenBucket(rate, capacity=burst.get(service_class)) if rate and rate > 0 else None
+            for service_class, rate in _rates.items()
+        }
+        self.stats: Dict[ServiceClass, ThrottleStat] = {service_class: ThrottleStat() for service_class in _rates}
+        self.last_class: Optional[ServiceClass] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def unlimited(cls) -> 'Throttle':
+        """ 요청 제한 없음(benchmark 용) """
+        return cls(rates={service_class: None for service_class in ServiceClass if service_class not in SHARED_CLASSES})
+
+    def acquire(self, service: str) -> float:
+        """ service 요청 전 호출, 허용량이 소진된 경우에만 대기 후 대기 시간(초) 반환 """
+        service_class = ServiceClass.of(service)
+        service_class = SHARED_CLASSES.get(service_class, service_class)
+        bucket = self.buckets.get(service_class)
+        wait = bucket.reserve() if bucket is not None else 0.
+
+        with self._lock:
+            self.last_class = service_class
+            self.stats[service_class].record(time.monotonic(), wait)
+
+        if wait > 0:
+            time.sleep(wait)
+
+        return wait
+
+    def feedback(self, msg_code: str) -> bool:
+        """
+        직전 요청의 응답 메시지 코드 반영
+
+        :return: 요청 제한 응답 여부
+        """
+        service_class = self.last_class
+        if service_class is None:
+            return False
+
+        bucket = self.buckets.get(service_class)
+        throttled = msg_code in THROTTLE_MSG_CODES
+
+        if throttled:
+            self.stats[service_class].throttled += 1
+
+        if bucket is not None:
+            if throttled:
+                bucket.backoff()
+            else:
+                bucket.recover()
+
+        return throttled
+
+    def snapshot(self) -> Dict[str, dict]:
+        """ 분류별 요청 속도 및 대기 시간 """
+        now = time.monotonic()
+        result = {}
+
+        with self._lock:
+            for service_class, stat in self.stats.items():
+                bucket = self.buckets.get(service_class)
+                result[service_class.value] = {
+                    'rate_limit': bucket.rate if bucket is not None else None,
+                    'effective_rate': stat.effective_rate(now),
+                    'requests': stat.requests,
+                    'delayed': stat.delayed,
+                    'throttled': stat.throttled,
+                    'total_wait': stat.total_wait,
+                    'avg_wait': stat.total_wait / stat.requests if stat.requests else 0.,
+                    'max_wait': stat.max_wait,
+                }
+
+        return result
@@ -3,6 +3,7 @@ RUN command in source:
     uvicorn pyefriend_api.api:app --host 0.0.0.0 --port 8000 --reload
 """
 import os
+import asyncio
 
 from fastapi import FastAPI, Request, status
 from fastapi.staticfiles import StaticFiles
@@ -10,9 +11,11 @@ from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html, get_swagger_ui_oauth2_redirect_html
 
-from pyefriend_api.settings import BASE_DIR
+from pyefriend_api import settings
+from pyefriend_api.settings import BASE_DIR, logger
 from pyefriend_api.app.auth import r as auth_router
 from pyefriend_api.app.router import r as app_router
+from pyefriend_api.app.v1.stock.router import subscribe_quotes
 from pyefriend.exceptions import UnExpectedException
 
 # rebalance app info
@@ -64,6 +67,9 @@ def create_app(debug: bool = True) -> FastAPI:
                   docs_url=None,
                   redoc_url=None)
 
+    # logger/sqlalchemy 설정은 import 시점이 아닌 startup에서 실행
+    app.add_event_handler('startup', settings.initialize)
+
     app.mount("/static", StaticFiles(directory=os.path.join(BASE_DIR, "static")), name="static")
 
     # docs
@@ -93,17 +99,22 @@ def create_app(debug: bool = True) -> FastAPI:
     @app.exception_handler(RequestValidationError)
     async def auth_exception_handler(request: Request, exc: RequestValidationError):
         msg = exc.errors()[0].get('msg')
-        print('validation error:', msg)
-        print('exc.body: ', exc.body)
+        logger.info(f'validation error: {msg}, body: {exc.body}')
         return JSONResponse(content={'detail': msg}, status_code=status.HTTP_400_BAD_REQUEST)
 
     @app.exception_handler(UnExpectedException)
     async def auth_exception_handler(request: Request, exc: UnExpectedException):
-        print(exc.detail)
+        logger.info(exc.detail)
         return JSONResponse(content={'detail': exc.detail}, status_code=status.HTTP_400_BAD_REQUEST)
 
+    @app.exception_handler(asyncio.TimeoutError)
+    async def broker_timeout_handler(request: Request, exc: asyncio.TimeoutError):
+        return JSONResponse(content={'detail': 'broker 요청 제한 시간을 초과하였습니다.'},
+                            status_code=status.HTTP_504_GATEWAY_TIMEOUT)
+
     app.include_router(auth_router)
     app.include_router(app_router)
+    app.add_api_websocket_route('/api/v1/stock/quote/ws', subscribe_quotes)
 
     return app
 
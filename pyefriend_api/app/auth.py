@@ -1,30 +1,67 @@
 import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
 from pydantic import BaseModel
 
+from pyefriend.metrics import metrics
 from pyefriend_api.config import Config
 from pyefriend_api.utils.password import verify_password, get_hashed_password
 from pyefriend_api.exceptions import CredentialException
 
 
-# fastapi 비밀번호가 담긴 환경변수명
-PASSWORD_ENV = Config.get('fastapi', 'PASSWORD_ENV')
+ALGORITHM = "HS256"
 
-# ADMIN USER 한개만 존재
-ADMIN_USER = {
-    "username": Config.get('fastapi', 'USERNAME'),
-    "hashed_password": get_hashed_password(PASSWORD_ENV),
-}
+# config.yml의 인증 설정(import시 읽지 않고 처음 사용할 때 get_auth_settings에서 load)
+auth_settings: Optional['AuthSettings'] = None
 
-# api secret_key
-SECRET_KEY = Config.get('fastapi', 'SECRET_KEY')
-ACCESS_TOKEN_EXPIRE_MINUTES = Config.get_int('fastapi', 'ACCESS_TOKEN_EXPIRE_MINUTES')
-ALGORITHM = "HS256"
+_settings_lock = threading.Lock()
+
+_lock = threading.Lock()
+
+
+class AuthSettings:
+    """ config.yml의 fastapi section 인증 설정 """
+    def __init__(self):
+        # fastapi 비밀번호가 담긴 환경변수명
+        self.password_env = Config.get('fastapi', 'PASSWORD_ENV')
+
+        # ADMIN USER 한개만 존재
+        # hashed_password(미리 계산한 bcrypt hash)가 없는 경우 처음 로그인할 때 password_env로 한 번 계산
+        self.admin_user = {
+            "username": Config.get('fastapi', 'USERNAME'),
+            "hashed_password": Config.get('fastapi', 'HASHED_PASSWORD'),
+        }
+
+        # api secret_key
+        self.secret_key = Config.get('fastapi', 'SECRET_KEY')
+        self.access_token_expire_minutes = Config.get_int('fastapi', 'ACCESS_TOKEN_EXPIRE_MINUTES')
+
+        # 검증한 token을 보관할 최대 갯수(0일 경우 보관하지 않음)
+        self.token_cache_size = Config.get_int('fastapi', 'TOKEN_CACHE_SIZE', default=1024)
+
+
+def get_auth_settings() -> AuthSettings:
+    global auth_settings
+
+    if auth_settings is None:
+        with _settings_lock:
+            if auth_settings is None:
+                auth_settings = AuthSettings()
+
+    return auth_settings
+
+
+def get_admin_user() -> dict:
+    """ ADMIN USER(username, hashed_password) """
+    return get_auth_settings().admin_user
 
 
 # BaseModels
@@ -49,6 +86,97 @@ class LoginManager(OAuth2PasswordBearer):
     """ Name Aliasing """
 
 
+class TokenCache:
+    """
+    검증한 token LRU
+
+    - key는 token의 sha256 digest(token 원문은 보관하지 않음)
+    - exp가 지난 token은 제거 후 다시 검증(jwt.decode에서 만료 에러)
+    - exp가 없는 token은 보관하지 않음
+
+    :param maxsize: 최대 갯수(None일 경우 처음 사용할 때 설정값 TOKEN_CACHE_SIZE 사용)
+    """
+    def __init__(self, maxsize: int = None):
+        self._maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+
+        # {digest: (TokenData, exp)}
+        self.entries: 'OrderedDict[bytes, Tuple[TokenData, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def maxsize(self) -> int:
+        if self._maxsize is None:
+            self._maxsize = get_auth_settings().token_cache_size
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, value: int):
+        self._maxsize = value
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode('utf-8')).digest()
+
+    def get(self, token: str, now: float = None) -> Optional[TokenData]:
+        key = self.digest(token)
+        now = time.time() if now is None else now
+
+        with self._lock:
+            entry = self.entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            token_data, exp = entry
+            if exp <= now:
+                del self.entries[key]
+                self.expired += 1
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return token_data
+
+    def put(self, token: str, token_data: TokenData, exp: Optional[float]):
+        if self.maxsize <= 0 or exp is None:
+            return
+
+        key = self.digest(token)
+
+        with self._lock:
+            self.entries[key] = (token_data, float(exp))
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self.entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'expired': self.expired,
+                'hit_rate': self.hits / total if total else 0.,
+            }
+
+
+token_cache = TokenCache()
+
+metrics.register('auth_token_cache', token_cache.snapshot)
+
+
 # Auth Router
 r = APIRouter(prefix='/auth',
               tags=['auth', ])
@@ -57,9 +185,20 @@ r = APIRouter(prefix='/auth',
 manager = LoginManager(tokenUrl="/auth/token")
 
 
+def get_admin_hashed_password() -> str:
+    """ ADMIN USER의 bcrypt hash(설정에 없는 경우 처음 한 번만 계산) """
+    settings = get_auth_settings()
+
+    with _lock:
+        if not settings.admin_user['hashed_password']:
+            settings.admin_user['hashed_password'] = get_hashed_password(settings.password_env)
+
+    return settings.admin_user['hashed_password']
+
+
 def get_user(username: str) -> Optional[UserInDB]:
-    if username == ADMIN_USER['username']:
-        return UserInDB(**ADMIN_USER)
+    if username == get_admin_user()['username']:
+        return UserInDB(username=username, hashed_password=get_admin_hashed_password())
 
 
 def authenticate_user(username: str, password: str):
@@ -78,13 +217,18 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     else:
         expire = datetime.utcnow() + timedelta(minutes=15)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, get_auth_settings().secret_key, algorithm=ALGORITHM)
     return encoded_jwt
 
 
-async def login_required(token: str = Depends(manager)) -> TokenData:
+def decode_access_token(token: str) -> TokenData:
+    # 검증한 token(만료 전)은 다시 decode하지 않음
+    token_data = token_cache.get(token)
+    if token_data is not None:
+        return token_data
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, get_auth_settings().secret_key, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
 
         if username is None:
@@ -96,9 +240,14 @@ async def login_required(token: str = Depends(manager)) -> TokenData:
     except JWTError:
         raise CredentialException
 
+    token_cache.put(token, token_data, exp=payload.get("exp"))
     return token_data
 
 
+async def login_required(token: str = Depends(manager)) -> TokenData:
+    return decode_access_token(token)
+
+
 async def get_current_user(token_data: TokenData = Depends(login_required)):
     user = get_user(username=token_data.username)
 
@@ -117,7 +266,7 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token_expires = timedelta(minutes=get_auth_settings().access_token_expire_minutes)
     access_token = create_access_token(
         data={"sub": user.username}, expires_delta=access_token_expires
     )
@@ -132,4 +281,5 @@ async def get_current_user(current_user: User = Depends(get_current_user)):
 # for import
 __all__ = [
     'login_required',
+    'decode_access_token',
 ]
@@ -0,0 +1,6 @@
+from .router import r
+
+
+__all__ = [
+    'r',
+]
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends, status
+
+from pyefriend.metrics import metrics
+from pyefriend_api.app.auth import login_required
+
+r = APIRouter(prefix='/metrics',
+              tags=['metrics'])
+
+
+@r.get('/', status_code=status.HTTP_200_OK)
+async def get_metrics(user=Depends(login_required)):
+    """### 서비스별 요청 지연/추출 시간/record 수/에러 코드 및 throttle, scheduler 상태 """
+    return metrics.snapshot()
+
+
+@r.post('/reset', status_code=status.HTTP_200_OK)
+async def reset_metrics(user=Depends(login_required)):
+    """### 서비스별 지표 초기화 """
+    metrics.reset()
+    return metrics.snapshot()
@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 from .database.router import r as database_router
+from .metrics.router import r as metrics_router
 from .setting.router import r as setting_router
 from .stock.router import r as stock_router
 
@@ -7,5 +8,6 @@ from .stock.router import r as stock_router
 r = APIRouter(prefix='/v1')
 
 r.include_router(database_router)
+r.include_router(metrics_router)
 r.include_router(setting_router)
 r.include_router(stock_router)
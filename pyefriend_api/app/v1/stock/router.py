@@ -1,14 +1,241 @@
+import asyncio
+from contextvars import ContextVar
+from itertools import groupby
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from datetime import date
-from fastapi import APIRouter, status, Depends, HTTPException
+from fastapi import APIRouter, status, Depends, Header, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 
-from pyefriend import load_api
+from pyefriend import AsyncApi
+from pyefriend.api import Api
 from pyefriend.exceptions import NotConnectedException, AccountNotExistsException
-from pyefriend_api.app.auth import login_required
+from pyefriend.fanout import QuoteHub
+from pyefriend.fx import FX_MAX_AGE, FxRate
+from pyefriend.metrics import metrics
+from pyefriend.registry import RegistryKey, get_or_create_api_registry
+from pyefriend_api.app.auth import login_required, decode_access_token
+from pyefriend_api.exceptions import CredentialException
+from pyefriend_api.config import Config
+from pyefriend_api.models.setting import Setting
 from pyefriend_api.utils.const import *
+from pyefriend_api.utils.response import rows_response, dumps, get_row_encoder
 from .schema import *
 
+# 현재 요청에서 사용한 Api
+current_api: ContextVar[Optional[Api]] = ContextVar('current_api', default=None)
+
+broker_limiter: Optional[asyncio.Semaphore] = None
+
+# {ApiRegistry key(market, account, 인증정보 hash): QuoteHub}
+quote_hubs: Dict[RegistryKey, QuoteHub] = {}
+
+
+def get_broker_concurrency() -> int:
+    """ broker(controller thread)로 동시에 보내는 요청 수(config.yml fastapi.BROKER_CONCURRENCY) """
+    return Config.get_int('fastapi', 'BROKER_CONCURRENCY', default=8)
+
+
+def get_broker_timeout() -> float:
+    """
+    broker 요청 제한 시간(초, limiter 대기 제외, stream은 page 단위), 초과시 504(pyefriend_api.api)
+    config.yml fastapi.BROKER_TIMEOUT
+    """
+    return Config.get_float('fastapi', 'BROKER_TIMEOUT', default=30)
+
+
+def get_quote_interval() -> float:
+    """ WebSocket 시세 upstream 조회 주기(초, config.yml fastapi.QUOTE_INTERVAL) """
+    return Config.get_float('fastapi', 'QUOTE_INTERVAL', default=1)
+
+
+def get_broker_limiter() -> asyncio.Semaphore:
+    """ event loop 안에서 생성(python 3.10 미만에서는 생성시 event loop에 묶임) """
+    global broker_limiter
+
+    if broker_limiter is None:
+        broker_limiter = asyncio.Semaphore(get_broker_concurrency())
+
+    return broker_limiter
+
+
+async def get_api(request: LoginInput) -> AsyncApi:
+    """
+    요청한 계좌의 AsyncApi 반환(ApiRegistry에 생성된 Api 재사용)
+    broker 호출은 모두 controller thread에서 실행되므로 event loop를 block하지 않음
+    """
+    api = await AsyncApi.load(**request.dict(include={'market', 'account', 'password'}),
+                              limiter=get_broker_limiter(),
+                              timeout=get_broker_timeout())
+    current_api.set(api.api)
+    return api
+
+
+async def get_order_api(request: LoginInput) -> AsyncApi:
+    """
+    get_api와 같으나 timeout 없음
+    여러 주문을 제출하는 경우 주문 수에 비례해 오래 걸리며, timeout으로 중간에 취소되지 않도록 함
+    """
+    api = await get_api(request)
+    return AsyncApi(api.api, executor=api.executor, limiter=api.limiter)
+
+
+async def revalidate_on_error():
+    """ endpoint에서 연결/계좌 관련 에러 발생시 사용한 Api를 제거하여 다음 요청에서 다시 검증 """
+    token = current_api.set(None)
+    try:
+        yield
+
+    except (HTTPException, asyncio.TimeoutError):
+        raise
+
+    except Exception as e:
+        api = current_api.get()
+        if api is not None:
+            get_or_create_api_registry().report_error(api, e)
+        raise
+
+    finally:
+        current_api.reset(token)
+
+
+def get_quote_hub(request: LoginInput) -> Tuple[RegistryKey, QuoteHub]:
+    """
+    계좌(ApiRegistry key)별 QuoteHub(구독자 수와 관계없이 종목당 한 번 조회)
+    - upstream(fetch)은 hub 생성시 한 번만 설정하며, 같은 계좌/인증정보로 접속한 client끼리만 공유
+    """
+    key = get_or_create_api_registry().make_key(request.market, request.account, password=request.password)
+    hub = quote_hubs.get(key)
+
+    if hub is None:
+        hub = quote_hubs[key] = QuoteHub(fetch=quote_fetcher(request), interval=get_quote_interval())
+        metrics.register(f'quote_hub:{key.market}:{key.account}', hub.snapshot)
+
+    return key, hub
+
+
+async def release_quote_hub(key: RegistryKey, hub: QuoteHub, client):
+    """ client 연결 해제, 남은 client가 없으면 hub 종료 """
+    hub.disconnect(client)
+
+    if not hub.clients and quote_hubs.get(key) is hub:
+        del quote_hubs[key]
+        metrics.unregister(f'quote_hub:{key.market}:{key.account}')
+        await hub.close()
+
+
+def quote_fetcher(request: LoginInput):
+    """
+    QuoteHub.fetch: (product_code, market_code) list를 market_code별로 나누어 AsyncApi.iter_product_prices로 조회
+    - 조회할 때마다 ApiRegistry에서 Api를 가져오므로 에러로 제거된 Api는 다시 검증
+    """
+    keys = list(ProductPrice.__fields__)
+
+    async def fetch(targets: List[tuple]):
+        groups: Dict[Optional[str], List[str]] = {}
+        for product_code, market_code in targets:
+            groups.setdefault(market_code, []).append(product_code)
+
+        api = await get_api(request)
+        for market_code, product_codes in groups.items():
+            async for product_code, prices, error in api.iter_product_prices(product_codes, market_code=market_code):
+                yield (product_code, market_code), (None if error else dict(zip(keys, prices))), error
+
+    return fetch
+
+
+def stream_histories(pages: AsyncIterator[List[Dict]]) -> StreamingResponse:
+    """
+    page(PriceHistory dict list) 단위 async iterator -> NDJSON(한 줄에 한 record)
+    - 응답을 시작한 뒤 조회가 실패하면 마지막 줄에 {"error": "..."} record 반환
+    """
+    encoder = get_row_encoder(PriceHistory)
+
+    async def lines():
+        try:
+            async for page in pages:
+                yield b''.join(dumps(record) + b'\n' for record in encoder.rows(page))
+        except Exception as e:
+            yield dumps({'error': f'{e.__class__.__name__}: {str(e)}'}) + b'\n'
+
+    return StreamingResponse(lines(), media_type='application/x-ndjson')
+
+
+def load_rebalance_limits():
+    """ setting 테이블의 REBALANCE section -> rebalance.RebalanceLimits """
+    from pyefriend.rebalance import RebalanceLimits
+
+    try:
+        Setting.validate()
+    except (AssertionError, TypeError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f'REBALANCE 설정값이 올바르지 않습니다. {str(e)}')
+
+    return RebalanceLimits(**{
+        field: Setting.get_value('REBALANCE', field.upper(), dtype=float)
+        for field in RebalanceLimits._fields
+    })
+
+
+async def collect_portfolio(request: RebalanceInput,
+                            domestic: AsyncApi) -> Tuple[Dict[str, dict], float, float, FxRate]:
+    """
+    보유 종목과 목표 종목의 수량/현재가/비중
+
+    :return: ({종목코드: {count, price, weight, is_overseas, market_code, lot}}, 예수금(원화), 달러 예수금, 환율)
+    """
+    # evaluate_amount의 deposit은 원화/달러 합산이므로 따로 조회하여 환율 적용
+    stocks = await domestic.get_stocks(overall=True)
+    currency = await domestic.currency_info
+    overseas_deposit = await domestic.overseas_deposit
+    deposit = await domestic.domestic_deposit + overseas_deposit * currency.rate
+
+    portfolio = {
+        stock['product_code']: dict(count=stock['count'],
+                                    price=stock['current'],
+                                    weight=0.,
+                                    is_overseas=stock['unit'] == Unit.USD,
+                                    market_code=stock.get('market_code'),
+                                    lot=1)
+        for stock in stocks
+    }
+
+    # 보유하지 않은 목표 종목은 현재가 조회(국내 / 해외 거래소별)
+    missing: Dict[Optional[str], List[str]] = {}
+
+    for target in request.targets:
+        item = portfolio.get(target.product_code)
+        if item is None:
+            item = portfolio[target.product_code] = dict(count=0,
+                                                         price=None,
+                                                         is_overseas=target.market_code is not None,
+                                                         market_code=target.market_code)
+            missing.setdefault(target.market_code, []).append(target.product_code)
+
+        item.update(weight=target.weight, lot=target.lot)
+
+    errors = {}
+    for market_code, product_codes in missing.items():
+        api = domestic
+        if market_code is not None:
+            api = await get_api(request.copy(update={'market': Market.OVERSEAS}))
+
+        async for product_code, prices, error in api.iter_product_prices(product_codes, market_code=market_code):
+            if error is None:
+                portfolio[product_code]['price'] = prices[0]
+            else:
+                errors[product_code] = f'{error.__class__.__name__}: {str(error)}'
+
+    if errors:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f'현재가를 조회하지 못한 종목이 있습니다: {errors}')
+
+    return portfolio, deposit, overseas_deposit, currency
+
+
 r = APIRouter(prefix='/stock',
-              tags=['stock'])
+              tags=['stock'],
+              dependencies=[Depends(revalidate_on_error)])
 
 
 @r.post('/', response_model=LoginOutput)
@@ -17,12 +244,12 @@ async def test_api(request: LoginInput, user=Depends(login_required)):
     try:
         context = request.dict()
 
-        # create api
-        api = load_api(**context)
+        # get api
+        api = await get_api(request)
 
         # get context
         context.update(account=api.account,
-                       is_vts=api.controller.IsVTS())
+                       is_vts=await api.run(api.api.controller.IsVTS))
 
         return context
 
@@ -44,9 +271,9 @@ async def evaluate_total_amount(request: LoginInput,
                                 overall: bool = True,
                                 user=Depends(login_required)):
     """### 계좌 전체 금액  """
-    # create api
-    api = load_api(**request.dict(include={'market', 'account', 'password'}))
-    deposit, stocks, total_amount = api.evaluate_amount(overall=overall, currency=False)
+    # get api
+    api = await get_api(request)
+    deposit, stocks, total_amount = await api.evaluate_amount(overall=overall, currency=False)
     return {
         'deposit': deposit,
         'stocks': stocks,
@@ -59,10 +286,10 @@ async def get_deposit_amount(request: LoginInput,
                              overall: bool = False,
                              user=Depends(login_required)):
     """### 예수금 전체 금액 """
-    # create api
-    api = load_api(**request.dict(include={'market', 'account', 'password'}))
+    # get api
+    api = await get_api(request)
     return {
-        'deposit': api.get_deposit(overall=overall)
+        'deposit': await api.get_deposit(overall=overall)
     }
 
 
@@ -71,50 +298,59 @@ async def get_stocks_list(request: LoginInput,
                           overall: bool = False,
                           user=Depends(login_required)):
     """### 현재 보유한 주식 리스트 반환 """
-    # create api
-    api = load_api(**request.dict(include={'market', 'account', 'password'}))
-    return api.get_stocks(overall=overall)
+    # get api
+    api = await get_api(request)
+    return await api.get_stocks(overall=overall)
 
 
 @r.post('/info/currency', response_model=Currency)
 async def get_currency(request: LoginInput, user=Depends(login_required)):
     """ 1 달러 -> 원으로 환전할때의 현재 기준 예상환율을 반환 """
-    # create api
-    api = load_api(**request.dict(include={'market', 'account', 'password'}))
+    # get api
+    api = await get_api(request)
+    fx_rate = await api.currency_info
     return {
-        'currency': api.currency
+        'currency': fx_rate.rate,
+        'source': fx_rate.source,
+        'age': fx_rate.age,
     }
 
 
 @r.post('/info/kospi', response_model=List[PriceHistory])
 async def get_kospi_histories(request: LoginInput,
                               standard: DWM = DWM.D,
+                              accept: Optional[str] = Header(None),
                               user=Depends(login_required)):
     """ kospi 히스토리 반환 """
-    # create api
-    api = load_api(**request.dict(include={'market', 'account', 'password'}))
-    return api.get_kospi_histories(standard=standard)
+    # get api
+    api = await get_api(request)
+    return rows_response(await api.get_kospi_histories(standard=standard),
+                         PriceHistory,
+                         accept=accept)
 
 
 @r.post('/info/sp500', response_model=List[PriceHistory])
 async def get_sp500_histories(request: LoginInput,
                               standard: DWM = DWM.D,
+                              accept: Optional[str] = Header(None),
                               user=Depends(login_required)):
     """ SP&500 히스토리 반환 """
-    # create api
-    api = load_api(**request.dict(include={'market', 'account', 'password'}))
-    return api.get_sp500_histories(standard=standard)
+    # get api
+    api = await get_api(request)
+    return rows_response(await api.get_sp500_histories(standard=standard),
+                         PriceHistory,
+                         accept=accept)
 
 
 @r.post('/trade/buy', response_model=OrderNum)
 async def buy_stock(request: BuyOrSellInput, user=Depends(login_required)):
     """### 설정한 price보다 낮으면 product_code의 종목 시장가로 매수 """
-    # create api
-    api = load_api(**request.dict(include={'market', 'account', 'password'}))
-    order_num = api.buy_stock(product_code=request.product_code,
-                              count=request.count,
-                              price=request.price,
-                              market_code=request.market_code)
+    # get api
+    api = await get_api(request)
+    order_num = await api.buy_stock(product_code=request.product_code,
+                                    count=request.count,
+                                    price=request.price,
+                                    market_code=request.market_code)
 
     return {
         'order_num': order_num
@@ -124,62 +360,167 @@ async def buy_stock(request: BuyOrSellInput, user=Depends(login_required)):
 @r.post('/trade/sell', response_model=OrderNum)
 async def sell_stock(request: BuyOrSellInput, user=Depends(login_required)):
     """### 설정한 price보다 낮으면 product_code의 종목 매도 """
-    # create api
-    api = load_api(**request.dict(include={'market', 'account', 'password'}))
-    order_num = api.sell_stock(product_code=request.product_code,
-                               count=request.count,
-                               price=request.price,
-                               market_code=request.market_code)
+    # get api
+    api = await get_api(request)
+    order_num = await api.sell_stock(product_code=request.product_code,
+                                     count=request.count,
+                                     price=request.price,
+                                     market_code=request.market_code)
 
     return {
         'order_num': order_num
     }
 
 
+@r.post('/trade/batch', response_model=BatchOrderOutput)
+async def submit_orders(request: BatchOrderInput, user=Depends(login_required)):
+    """
+    ### 여러 주문을 순서대로 연속 제출(Api.submit_orders)
+
+    - 제출 전에 전체 주문을 검증하며 잘못된 주문이 있으면 아무것도 주문하지 않음(400)
+    - 주문 간격은 controller throttle(주문 초당 요청 수)이 조절
+    - 주문별 주문번호/에러 반환, stop_on_error: True일 경우 에러 이후 주문은 제출하지 않음
+    """
+    # get api
+    api = await get_order_api(request)
+    batch = await api.submit_orders([order.dict() for order in request.orders],
+                                    stop_on_error=request.stop_on_error)
+
+    return batch.to_dict()
+
+
+@r.post('/trade/rebalance', response_model=RebalanceOutput)
+async def rebalance(request: RebalanceInput,
+                    dry_run: bool = True,
+                    user=Depends(login_required)):
+    """
+    ### 목표 비중에 맞춘 리밸런싱 주문(국내/해외)
+
+    - setting 테이블의 REBALANCE(AVAILABLE_LIMIT, DOMESTIC_LIMIT, OVERSEAS_LIMIT, ADDITIONAL_AMOUNT) 기준
+    - targets에 없는 보유 종목은 전량 매도
+    - dry_run: True(기본)일 경우 주문하지 않고 주문 계획만 반환
+    - 주문은 매도 -> 매수 순서로 실행하며, 실패한 경우 남은 주문은 실행하지 않음
+    - 해외 종목/달러 예수금이 있는 경우 환율이 FX_MAX_AGE초 안에 외부(broker/http)에서 갱신되지 않았으면 주문하지 않음(409)
+    """
+    from pyefriend.rebalance import plan_rebalance
+
+    limits = load_rebalance_limits()
+
+    # get api
+    domestic = await get_api(request.copy(update={'market': Market.DOMESTIC}))
+    portfolio, deposit, overseas_deposit, currency = await collect_portfolio(request, domestic)
+
+    uses_currency = overseas_deposit > 0 or any(item['is_overseas'] for item in portfolio.values())
+    if not dry_run and uses_currency and not currency.is_fresh(FX_MAX_AGE):
+        age = 'unknown' if currency.age is None else f'{currency.age:.0f}s'
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT,
+                            detail=f'환율이 갱신되지 않아 주문하지 않습니다(source={currency.source}, age={age}).')
+
+    product_codes = list(portfolio)
+    items = list(portfolio.values())
+
+    try:
+        plan = plan_rebalance(product_codes=product_codes,
+                              counts=[item['count'] for item in items],
+                              prices=[item['price'] for item in items],
+                              weights=[item['weight'] for item in items],
+                              is_overseas=[item['is_overseas'] for item in items],
+                              lots=[item['lot'] for item in items],
+                              market_codes=[item['market_code'] for item in items],
+                              cash=deposit,
+                              currency=currency.rate,
+                              limits=limits,
+                              min_amount=request.min_amount)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    orders = plan.orders()
+
+    if not dry_run:
+        # 같은 시장(국내/해외)의 연속된 주문을 한 번에 제출(매도 -> 매수 순서 유지)
+        failed = None
+
+        for is_overseas, group in groupby(orders, key=lambda order: order['is_overseas']):
+            group = list(group)
+
+            if failed is not None:
+                for order in group:
+                    order['error'] = f'실행하지 않음({failed} 주문 실패)'
+                continue
+
+            market = Market.OVERSEAS if is_overseas else Market.DOMESTIC
+            api = await get_order_api(request.copy(update={'market': market}))
+            batch = await api.submit_orders([dict(side=order['side'],
+                                                  product_code=order['product_code'],
+                                                  count=order['count'],
+                                                  price=order['price'] if is_overseas else 0,
+                                                  market_code=order['market_code'])
+                                             for order in group],
+                                            stop_on_error=True)
+
+            for order, result in zip(group, batch):
+                order['order_num'] = result.order_num
+                order['error'] = result.error
+
+                if failed is None and not result.ok:
+                    failed = order['product_code']
+
+    return {
+        'dry_run': dry_run,
+        'summary': dict(plan.summary(), currency_source=currency.source, currency_age=currency.age),
+        'orders': orders,
+    }
+
+
 @r.post('/order/processed', response_model=List[ProcessedOrderOutput])
-async def get_processed_orders(request: ProcessedOrderInput, user=Depends(login_required)):
+async def get_processed_orders(request: ProcessedOrderInput,
+                               accept: Optional[str] = Header(None),
+                               user=Depends(login_required)):
     """### start_date 이후의 체결된 주문 리스트 반환 """
-    # create api
-    api = load_api(**request.dict(include={'market', 'account', 'password'}))
-    return api.get_processed_orders(start_date=request.start_date,                                    market_code=request.market_code)
+    # get api
+    api = await get_api(request)
+    return rows_response(await api.get_processed_orders(start_date=request.start_date,
+                                                        market_code=request.market_code),
+                         ProcessedOrderOutput,
+                         accept=accept)
 
 
 @r.post('/order/unprocessed', response_model=List[UnProcessedOrderOutput])
 async def get_unprocessed_orders(request: UnProcessedOrderInput, user=Depends(login_required)):
     """### 미체결된 주문 리스트 반환 """
-    # create api
-    api = load_api(**request.dict(include={'market', 'account', 'password'}))
-    return api.get_unprocessed_orders(market_code=request.market_code)
+    # get api
+    api = await get_api(request)
+    return await api.get_unprocessed_orders(market_code=request.market_code)
 
 
 @r.post('/order/cancel', response_model=OrderNum)
 async def cancel_order(request: CancelInput, user=Depends(login_required)):
     """### 주문 취소 """
-    # create api
-    api = load_api(**request.dict(include={'market', 'account', 'password'}))
+    # get api
+    api = await get_api(request)
     return {
-        'order_num': api.cancel_order(order_num=request.order_num,
-                                      count=request.count,
-                                      product_code=request.product_code,
-                                      market_code=request.market_code)
+        'order_num': await api.cancel_order(order_num=request.order_num,
+                                            count=request.count,
+                                            product_code=request.product_code,
+                                            market_code=request.market_code)
     }
 
 
 @r.post('/order/cancel-all', response_model=List[str])
 async def cancel_unprocessed_order(request: CancelAllInput, user=Depends(login_required)):
     """### 미체결된 모든 리스트 취소 """
-    # create api
-    api = load_api(**request.dict(include={'market', 'account', 'password'}))
-    return api.cancel_all_unprocessed_orders(market_code=request.market_code)
+    # get api
+    api = await get_api(request)
+    return await api.cancel_all_unprocessed_orders(market_code=request.market_code)
 
 
 @r.post('/product', response_model=ProductInfo)
 async def get_product_info(request: GetProductInput,
                            user=Depends(login_required)):
     """### 종목명 및 가격 """
-    # create api
-    api = load_api(**request.dict(include={'market', 'account', 'password'}))
-    return api.get_product_info(product_code=request.product_code, market_code=request.market_code)
+    # get api
+    api = await get_api(request)
+    return await api.get_product_info(product_code=request.product_code, market_code=request.market_code)
 
 
 @r.post('/product/status')
@@ -190,10 +531,10 @@ async def get_product_status(request: GetProductInput,
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
                             detail='해당 URI는 해외(overseas)만 가능합니다.')
 
-    # create api
-    api = load_api(**request.dict(include={'market', 'account', 'password'}))
+    # get api
+    api = await get_api(request)
     return {
-        'status': api.get_product_status(product_code=request.product_code, market_code=request.market_code)
+        'status': await api.get_product_status(product_code=request.product_code, market_code=request.market_code)
     }
 
 
@@ -201,10 +542,10 @@ async def get_product_status(request: GetProductInput,
 async def get_product_prices(request: GetProductInput,
                              user=Depends(login_required)):
     """### 종목명 및 대/중/소 업종 코드 """
-    # create api
-    api = load_api(**request.dict(include={'market', 'account', 'password'}))
+    # get api
+    api = await get_api(request)
     current, minimum, maximum, opening, base, total_volume = (
-        api.get_product_prices(product_code=request.product_code, market_code=request.market_code)
+        await api.get_product_prices(product_code=request.product_code, market_code=request.market_code)
     )
     return {
         'current': current,
@@ -216,49 +557,100 @@ async def get_product_prices(request: GetProductInput,
     }
 
 
+@r.post('/product/price/batch', response_class=StreamingResponse)
+async def get_product_prices_batch(request: GetProductsInput,
+                                   user=Depends(login_required)):
+    """
+    ### 여러 종목의 현재가(NDJSON, 한 줄에 한 종목)
+
+    - cache된 종목을 먼저 반환하고, 나머지 종목은 조회가 끝나는 순서대로 반환
+    - 조회에 실패한 종목은 `{"product_code": ..., "error": ...}`로 반환하며 나머지 종목은 계속 조회
+    """
+    # get api
+    api = await get_api(request)
+
+    async def lines():
+        async for product_code, prices, error in api.iter_product_prices(request.product_codes,
+                                                                         market_code=request.market_code):
+            if error is None:
+                row = dict(zip(ProductPrice.__fields__, prices), product_code=product_code)
+            else:
+                row = {'product_code': product_code,
+                       'error': f'{error.__class__.__name__}: {getattr(error, "detail", None) or str(error)}'}
+
+            yield dumps(row) + b'\n'
+
+    return StreamingResponse(lines(), media_type='application/x-ndjson')
+
+
 @r.post('/product/history', response_model=List[PriceHistory])
 async def list_product_histories(request: GetProductInput,
                                  standard: DWM = DWM.D,
                                  standard_date: str = None,
+                                 max_pages: int = 1,
+                                 accept: Optional[str] = Header(None),
                                  user=Depends(login_required)):
     """
     ### 종목명 및 대/중/소 업종 코드의 일/주/월별 주가 리스트 제공
 
     - standard_date: 해외의 경우 기준일자 기준으로 조회 가능
+    - max_pages: 연속 조회 최대 page 수
     """
-    # create api
-    api = load_api(**request.dict(include={'market', 'account', 'password'}))
-    return api.list_product_histories(product_code=request.product_code,
-                                      market_code=request.market_code,
-                                      standard=standard,
-                                      standard_date=standard_date)
+    # get api
+    api = await get_api(request)
+    return rows_response(await api.list_product_histories(product_code=request.product_code,
+                                                          market_code=request.market_code,
+                                                          standard=standard,
+                                                          standard_date=standard_date,
+                                                          max_pages=max_pages),
+                         PriceHistory,
+                         accept=accept)
 
 
 @r.post('/product/history/daily', response_model=List[PriceHistory])
 async def list_product_histories_daily(request: GetProductInput,
                                        start_date: str,
                                        end_date: str,
+                                       stream: bool = False,
+                                       accept: Optional[str] = Header(None),
                                        user=Depends(login_required)):
-    """### 일자별 종목의 현/시/고/체결량 제공  """
-    # create api
-    api = load_api(**request.dict(include={'market', 'account', 'password'}))
-    return api.list_product_histories_daily(product_code=request.product_code,
-                                            start_date=start_date,
-                                            end_date=end_date,
-                                            market_code=request.market_code)
+    """
+    ### 일자별 종목의 현/시/고/체결량 제공
+
+    - stream: True일 경우 NDJSON(한 줄에 한 record)으로 broker/저장소에서 받는 page 단위로 바로 반환
+    """
+    # get api
+    api = await get_api(request)
+
+    if stream:
+        return stream_histories(api.stream(api.api.iter_product_histories_daily,
+                                           product_code=request.product_code,
+                                           start_date=start_date,
+                                           end_date=end_date,
+                                           market_code=request.market_code))
+
+    return rows_response(await api.list_product_histories_daily(product_code=request.product_code,
+                                                                start_date=start_date,
+                                                                end_date=end_date,
+                                                                market_code=request.market_code),
+                         PriceHistory,
+                         accept=accept)
 
 
 @r.post('/product/chart', response_model=List[ProductChart])
 async def get_product_chart(request: GetProductInput,
                             interval: int = 60,
+                            accept: Optional[str] = Header(None),
                             user=Depends(login_required)):
     """### interval별 종목의 현/시/고/체결량 제공(해당 URI는 국내(domestic)만 가능합니다.)  """
     if request.market != Market.DOMESTIC:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='해당 URI는 국내(domestic)만 가능합니다.')
 
-    # create api
-    api = load_api(**request.dict(include={'market', 'account', 'password'}))
-    return api.get_product_chart(product_code=request.product_code, interval=interval)
+    # get api
+    api = await get_api(request)
+    return rows_response(await api.get_product_chart(product_code=request.product_code, interval=interval),
+                         ProductChart,
+                         accept=accept)
 
 
 @r.post('/product/spread', response_model=ProductSpread)
@@ -268,9 +660,9 @@ async def get_spread(request: GetSpreadInput,
     if request.market != Market.DOMESTIC:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='해당 URI는 국내(domestic)만 가능합니다.')
 
-    # create api
-    api = load_api(**request.dict(include={'market', 'account', 'password'}))
-    return api.get_spread(product_code=request.product_code)
+    # get api
+    api = await get_api(request)
+    return await api.get_spread(product_code=request.product_code)
 
 
 @r.post('/product/popular', response_model=List[PopularProduct])
@@ -288,9 +680,9 @@ async def list_popular_products(request: LoginInput,
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
                             detail='해당 URI는 국내(domestic)만 가능합니다.')
 
-    # create api
-    api = load_api(**request.dict(include={'market', 'account', 'password'}))
-    return api.list_popular_products(direction=direction, index_code=index, last_day=last_day)
+    # get api
+    api = await get_api(request)
+    return await api.list_popular_products(direction=direction, index_code=index, last_day=last_day)
 
 
 @r.post('/product/foreigner', response_model=List[ForeignerNetBuySell])
@@ -306,9 +698,9 @@ async def list_foreigner_net_buy_or_sell(request: LoginInput,
     if request.market != Market.DOMESTIC:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='해당 URI는 국내(domestic)만 가능합니다.')
 
-    # create api
-    api = load_api(**request.dict(include={'market', 'account', 'password'}))
-    return api.list_foreigner_net_buy_or_sell(net_buy_sell=net_buy_sell, index_code=index)
+    # get api
+    api = await get_api(request)
+    return await api.list_foreigner_net_buy_or_sell(net_buy_sell=net_buy_sell, index_code=index)
 
 
 @r.post('/sector', response_model=SectorInfo)
@@ -317,32 +709,117 @@ async def get_sector_info(request: GetSectorInput, user=Depends(login_required))
     if request.market != Market.DOMESTIC:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='해당 URI는 국내(domestic)만 가능합니다.')
 
-    # create api
-    api = load_api(**request.dict(include={'market', 'account', 'password'}))
-    return api.get_sector_info(sector_code=request.sector_code)
+    # get api
+    api = await get_api(request)
+    return await api.get_sector_info(sector_code=request.sector_code)
 
 
 @r.post('/sector/history', response_model=List[PriceHistory])
 async def list_sector_histories(request: GetSectorInput,
                                 standard: DWM = DWM.D,
+                                stream: bool = False,
+                                max_pages: int = 1,
+                                accept: Optional[str] = Header(None),
                                 user=Depends(login_required)):
-    """### 종목명 및 대/중/소 업종 코드 """
+    """
+    ### 종목명 및 대/중/소 업종 코드
+
+    - stream: True일 경우 NDJSON(한 줄에 한 record)으로 연속 조회 page를 받는 대로 반환
+    - max_pages: stream일 경우 연속 조회 최대 page 수
+    """
     if request.market != Market.DOMESTIC:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='해당 URI는 국내(domestic)만 가능합니다.')
 
-    # create api
-    api = load_api(**request.dict(include={'market', 'account', 'password'}))
-    return api.list_sector_histories(sector_code=request.sector_code, standard=standard)
+    # get api
+    api = await get_api(request)
+
+    if stream:
+        return stream_histories(api.stream(api.api.iter_sector_histories,
+                                           sector_code=request.sector_code,
+                                           standard=standard,
+                                           max_pages=max_pages))
+
+    return rows_response(await api.list_sector_histories(sector_code=request.sector_code, standard=standard),
+                         PriceHistory,
+                         accept=accept)
 
 
 @r.post('/sector/chart', response_model=List[SectorChart])
 async def get_sector_chart(request: GetSectorInput,
                            interval: int = 60,
+                           accept: Optional[str] = Header(None),
                            user=Depends(login_required)):
     """### interval별 종목의 현/시/고/체결량 제공  """
     if request.market != Market.DOMESTIC:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='해당 URI는 국내(domestic)만 가능합니다.')
 
-    # create api
-    api = load_api(**request.dict(include={'market', 'account', 'password'}))
-    return api.get_sector_chart(sector_code=request.sector_code, interval=interval)
+    # get api
+    api = await get_api(request)
+    return rows_response(await api.get_sector_chart(sector_code=request.sector_code, interval=interval),
+                         SectorChart,
+                         accept=accept)
+
+
+# fastapi 0.70은 APIRouter의 prefix를 websocket route에 적용하지 않으므로 app에 전체 경로로 등록(pyefriend_api.api)
+async def subscribe_quotes(websocket: WebSocket, token: str):
+    """
+    ### 종목 현재가 push(WebSocket, /api/v1/stock/quote/ws)
+
+    1. `?token=<access_token>`으로 접속
+    2. 첫 message로 로그인 정보(`{"market", "account", "password"}`) 전송
+    3. `{"action": "subscribe" | "unsubscribe", "product_codes": [...], "market_code": null}`로 구독/해제
+    4. 값이 바뀐 종목을 `[{"product_code", "market_code", "current", ...}, ...]`로 수신
+
+    - 구독자 수와 관계없이 종목당 QUOTE_INTERVAL(초, config.yml)마다 한 번 조회
+    - 느린 client는 중간 값을 건너뛰고 종목별 최신 값만 수신
+    """
+    try:
+        decode_access_token(token)
+    except CredentialException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+
+    try:
+        request = LoginInput(**await websocket.receive_json())
+        await get_api(request)  # 계좌/인증정보 검증
+    except WebSocketDisconnect:
+        return
+    except Exception as e:
+        await websocket.send_json({'error': f'{e.__class__.__name__}: {str(e)}'})
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    key, hub = get_quote_hub(request)
+    client = hub.connect()
+
+    async def receive():
+        while True:
+            try:
+                message = QuoteSubscription(**await websocket.receive_json())
+            except (ValidationError, TypeError, ValueError):
+                # 잘못된 message는 연결 종료
+                await websocket.close(code=status.WS_1003_UNSUPPORTED_DATA)
+                return
+
+            targets = [(product_code, message.market_code) for product_code in message.product_codes]
+            if message.action == 'subscribe':
+                hub.subscribe(client, targets)
+            else:
+                hub.unsubscribe(client, targets)
+
+    async def send():
+        while True:
+            quotes = await client.get()
+            await websocket.send_json([dict(value, product_code=product_code, market_code=market_code)
+                                       for (product_code, market_code), value in quotes.items()])
+
+    tasks = [asyncio.ensure_future(receive()), asyncio.ensure_future(send())]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await release_quote_hub(key, hub, client)
@@ -53,6 +53,8 @@ class Amount(Deposit):
 
 class Currency(BaseModel):
     currency: float = Field(..., title='환율')
+    source: str = Field(None, title="환율 출처('broker' / 'http' / 'base': 갱신되지 않은 기본값)")
+    age: Optional[float] = Field(None, title='갱신 후 지난 시간(초)')
 
 
 class PriceHistory(BaseModel):
@@ -75,6 +77,32 @@ class OrderNum(BaseModel):
     order_num: str = Field(..., title='주문번호')
 
 
+class BatchOrder(BaseModel):
+    side: str = Field(..., title="'buy' / 'sell'", regex='^(buy|sell)$')
+    product_code: str = Field(..., title='종목코드')
+    market_code: Optional[str] = MarketField
+    count: int = Field(..., title='매수/매도수량', gt=0)
+    price: float = Field(0, title='매수/매도가격(국내는 0일 경우 시장가)', ge=0)
+
+
+class BatchOrderInput(LoginInput):
+    orders: List[BatchOrder] = Field(..., title='주문 리스트(순서대로 제출)', min_items=1, max_items=1000)
+    stop_on_error: bool = Field(False, title='주문 에러 발생시 남은 주문을 제출하지 않음')
+
+
+class BatchOrderResult(BatchOrder):
+    order_num: Optional[str] = Field(None, title='주문번호')
+    error: Optional[str] = Field(None, title='주문 에러')
+    submitted: bool = Field(..., title='제출 여부')
+
+
+class BatchOrderOutput(BaseModel):
+    succeeded: int = Field(..., title='성공한 주문 수')
+    failed: int = Field(..., title='실패(미제출 포함)한 주문 수')
+    elapsed: float = Field(..., title='제출 시간(초)')
+    results: List[BatchOrderResult]
+
+
 class UnProcessedOrderInput(LoginInput):
     market_code: Optional[str] = MarketField
 
@@ -122,6 +150,18 @@ class GetProductInput(LoginInput):
     market_code: Optional[str] = MarketField
 
 
+class GetProductsInput(LoginInput):
+    product_codes: List[str] = Field(..., title='종목코드 리스트', min_items=1, max_items=1000)
+    market_code: Optional[str] = MarketField
+
+
+class QuoteSubscription(BaseModel):
+    """ WebSocket 시세 구독 message """
+    action: str = Field(..., title="'subscribe' / 'unsubscribe'", regex='^(subscribe|unsubscribe)$')
+    product_codes: List[str] = Field(..., title='종목코드 리스트', max_items=1000)
+    market_code: Optional[str] = MarketField
+
+
 class ProductInfo(BaseModel):
     product_name: str = Field(..., title='품목명')
     price: float = Field(..., title='현재가')
@@ -228,3 +268,56 @@ class ForeignerNetBuySell(BaseModel):
     total_volume: int = Field(..., title='거래량')
     net_quantity: int = Field(..., title='합산수량')
     fake_net_quantity: int = Field(..., title='합산수량(가집계)')
+
+
+class RebalanceTarget(BaseModel):
+    product_code: str = Field(..., title='종목코드')
+    weight: float = Field(..., title='목표 비중(국내/해외 종목 안에서 정규화)', ge=0)
+    market_code: Optional[str] = Field(None,
+                                       title='해외 거래소 코드',
+                                       description='해외 종목일 경우 입력(없을 경우 국내 종목)',
+                                       example='NASD')
+    lot: int = Field(1, title='주문 단위', ge=1)
+
+
+class RebalanceInput(LoginInput):
+    market: Market = Field(Market.DOMESTIC,
+                           title='타겟장',
+                           description='국내/해외 종목을 함께 주문하므로 사용하지 않음')
+    targets: List[RebalanceTarget] = Field(..., title='목표 비중', max_items=5000)
+    min_amount: float = Field(0, title='최소 주문 금액(원)', ge=0)
+
+
+class RebalanceOrder(BaseModel):
+    product_code: str = Field(..., title='종목코드')
+    market_code: Optional[str] = Field(None, title='해외 거래소 코드')
+    is_overseas: bool = Field(..., title='해외 종목 여부')
+    side: str = Field(..., title="'buy' / 'sell'")
+    count: int = Field(..., title='주문 수량')
+    price: float = Field(..., title='현재가(종목 통화)')
+    amount: float = Field(..., title='주문 금액(원)')
+    current_count: int = Field(..., title='보유 수량')
+    target_count: int = Field(..., title='주문 후 수량')
+    order_num: Optional[str] = Field(None, title='주문번호')
+    error: Optional[str] = Field(None, title='주문 에러(실패/미실행)')
+
+
+class RebalanceSummary(BaseModel):
+    total_amount: float = Field(..., title='계좌 전체 금액(원, additional_amount 포함)')
+    budget: float = Field(..., title='운용 금액(원)')
+    currency: float = Field(..., title='환율')
+    currency_source: str = Field(..., title="환율 출처('broker' / 'http' / 'base')")
+    currency_age: Optional[float] = Field(None, title='환율 갱신 후 지난 시간(초)')
+    cash: float = Field(..., title='예수금(원)')
+    sell_amount: float = Field(..., title='매도 금액(원)')
+    buy_amount: float = Field(..., title='매수 금액(원)')
+    cash_after: float = Field(..., title='주문 후 예수금(원)')
+    domestic_amount: float = Field(..., title='주문 후 국내 주식 금액(원)')
+    overseas_amount: float = Field(..., title='주문 후 해외 주식 금액(원)')
+    orders: int = Field(..., title='주문 수')
+
+
+class RebalanceOutput(BaseModel):
+    dry_run: bool = Field(..., title='주문하지 않고 계획만 반환했는지 여부')
+    summary: RebalanceSummary
+    orders: List[RebalanceOrder]
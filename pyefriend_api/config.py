@@ -9,18 +9,13 @@ from pyefriend_api.utils.tool import load_yaml
 HOME_PATH = os.getenv("EFRIEND_HOME", None)
 CONF_PATH = os.getenv("EFRIEND_CONF", None)
 
-assert HOME_PATH is not None, "환경변수 'EFRIEND_HOME'를 설정해야합니다."
-
-if CONF_PATH is None:
+if CONF_PATH is None and HOME_PATH is not None:
     CONF_PATH = os.path.join(HOME_PATH, 'config.yml')
 
 
-print(f"다음의 경로를 사용합니다.\n"
-      f"- HOME_PATH='{HOME_PATH}'\n"
-      f"- CONF_PATH='{CONF_PATH}'")
-
-
 def get_config_yaml() -> dict:
+    assert HOME_PATH is not None, "환경변수 'EFRIEND_HOME'를 설정해야합니다."
+
     # config
     config_path = os.path.abspath(CONF_PATH)
 
@@ -36,7 +31,15 @@ def get_config_yaml() -> dict:
 
 
 class Config:
-    conf = get_config_yaml()
+    # config.yml(처음 조회할 때 load)
+    conf: Optional[dict] = None
+
+    @classmethod
+    def load(cls) -> dict:
+        if cls.conf is None:
+            cls.conf = get_config_yaml()
+
+        return cls.conf
 
     @classmethod
     def get(cls,
@@ -47,7 +50,7 @@ class Config:
             **kwargs) -> Optional[Any]:
 
         # try to get from config.yml
-        option: Any = cls.conf.get(str(section).lower(), {}).get(str(key).lower(), None)
+        option: Any = cls.load().get(str(section).lower(), {}).get(str(key).lower(), None)
 
         if option is None:
             if default is not None:
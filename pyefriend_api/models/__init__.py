@@ -1,6 +1,7 @@
-from .setting import Setting
+from .setting import Setting, SettingVersion
 
 
 __all__ = [
     'Setting',
+    'SettingVersion',
 ]
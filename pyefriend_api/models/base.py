@@ -3,10 +3,8 @@ from typing import Optional
 from sqlalchemy import MetaData, Column, Integer, DateTime, func, text
 from sqlalchemy.orm import declarative_base, DeclarativeMeta
 
-from pyefriend_api.settings import engine
-
-# create metadata
-metadata: Optional[MetaData] = MetaData(bind=engine)
+# create metadata(engine은 app startup에서 생성, create_all/drop_all시 bind=settings.get_engine())
+metadata: Optional[MetaData] = MetaData()
 
 # create base
 Base: Optional[DeclarativeMeta] = declarative_base(metadata=metadata)
@@ -1,16 +1,20 @@
-from typing import Optional
+import time
+import threading
+from functools import wraps
+from typing import Callable, Dict, Optional, Tuple
 from sqlalchemy import Column, Integer, Text, String, JSON, Float, Index, ForeignKey, Boolean
 from sqlalchemy.orm import Session
 
+from pyefriend.metrics import metrics
 from pyefriend_api.utils.orm_helper import provide_session
 from pyefriend_api.config import Config
 from .base import Base, Length
 
 
-# section - key - default value
+# section - key - default value(None일 경우 CONFIG_DEFAULTS의 config.yml 값 사용)
 SETTING_LIST = {
     'ACCOUNT': {
-        'ACCOUNT': (Config.get('core', 'ACCOUNT'), '계좌번호'),
+        'ACCOUNT': (None, '계좌번호'),
     },
     'REBALANCE': {
         'AVAILABLE_LIMIT': (0.9, r'계좌 전체 금액 중 사용할 금액 비율'),
@@ -21,6 +25,169 @@ SETTING_LIST = {
 }
 
 
+# config.yml에서 기본값을 가져오는 setting: (section, key) - (config section, config key)
+# (import시 config.yml을 읽지 않도록 initialize에서 조회)
+CONFIG_DEFAULTS = {
+    ('ACCOUNT', 'ACCOUNT'): ('core', 'ACCOUNT'),
+}
+
+
+def get_default_value(section: str, key: str) -> Optional[str]:
+    """ SETTING_LIST의 기본값(config.yml 값 포함) """
+    value, _ = SETTING_LIST[section][key]
+
+    if value is None and (section, key) in CONFIG_DEFAULTS:
+        value = Config.get(*CONFIG_DEFAULTS[(section, key)])
+
+    return value
+
+
+def get_setting_check_interval() -> float:
+    """ 다른 worker의 변경 여부(setting_version) 확인 주기(초, config.yml database.SETTING_CHECK_INTERVAL) """
+    return Config.get_float('database', 'SETTING_CHECK_INTERVAL', default=1)
+
+
+class SettingVersion(Base):
+    """ setting 테이블 변경시 증가하는 version(worker간 cache 무효화) """
+    __tablename__ = 'setting_version'
+
+    # columns
+    id = Column(Integer, primary_key=True, comment='ID(1 row)')
+    version = Column(Integer, nullable=False, default=0, comment='Version')
+
+    _checked = False
+
+    @classmethod
+    def ensure_table(cls, session: Session):
+        """ 이전에 생성한 database에 테이블이 없는 경우 생성(process별 한 번) """
+        if not cls._checked:
+            cls.__table__.create(bind=session.connection(), checkfirst=True)
+            cls._checked = True
+
+    @classmethod
+    @provide_session
+    def get(cls, session: Session = None) -> int:
+        cls.ensure_table(session)
+
+        row = session.query(cls.version).filter(cls.id == 1).first()
+        return row[0] if row else 0
+
+    @classmethod
+    @provide_session
+    def bump(cls, session: Session = None):
+        cls.ensure_table(session)
+
+        updated = (
+            session
+                .query(cls)
+                .filter(cls.id == 1)
+                .update({cls.version: cls.version + 1}, synchronize_session=False)
+        )
+        if not updated:
+            session.add(cls(id=1, version=1))
+
+
+class SettingCache:
+    """
+    process별 setting 테이블 snapshot
+
+    - 전체 테이블을 한 번에 조회하여 {(section, key): (value, comment)}로 보관
+    - 같은 process의 변경(update/save/initialize/truncate)은 바로 무효화
+    - 다른 worker의 변경은 check_interval(초)마다 setting_version을 확인하여 무효화
+
+    :param check_interval: setting_version 확인 주기(초), None일 경우 처음 사용할 때 설정값 SETTING_CHECK_INTERVAL 사용
+    """
+    def __init__(self, check_interval: float = None):
+        self._check_interval = check_interval
+
+        self.rows: Optional[Dict[Tuple[str, str], Tuple[Optional[str], Optional[str]]]] = None
+        self.version: Optional[int] = None
+        self.checked = 0.
+
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+
+    @property
+    def check_interval(self) -> float:
+        if self._check_interval is None:
+            self._check_interval = get_setting_check_interval()
+        return self._check_interval
+
+    @check_interval.setter
+    def check_interval(self, value: float):
+        self._check_interval = value
+
+    def get(self, section: str, key: str) -> Optional[Tuple[Optional[str], Optional[str]]]:
+        """ (value, comment), 없을 경우 None """
+        return self.snapshot_rows().get((section.upper(), key.upper()))
+
+    def snapshot_rows(self) -> Dict[Tuple[str, str], Tuple[Optional[str], Optional[str]]]:
+        now = time.monotonic()
+
+        with self._lock:
+            if self.rows is not None and now - self.checked < self.check_interval:
+                self.hits += 1
+                return self.rows
+
+        version = SettingVersion.get() if self.rows is not None else None
+
+        with self._lock:
+            if self.rows is not None and version == self.version:
+                self.checked = now
+                self.hits += 1
+                return self.rows
+
+            self.misses += 1
+
+        return self.load(now)
+
+    @provide_session
+    def load(self, now: float = None, session: Session = None) -> Dict[Tuple[str, str], Tuple[Optional[str], Optional[str]]]:
+        """ version 및 전체 테이블 조회 """
+        version = SettingVersion.get(session=session)
+        rows = {(row.section, row.key): (row.value, row.comment) for row in session.query(Setting).all()}
+
+        with self._lock:
+            self.rows, self.version = rows, version
+            self.checked = time.monotonic() if now is None else now
+            self.loads += 1
+
+        return rows
+
+    def invalidate(self):
+        with self._lock:
+            self.rows = None
+            self.invalidations += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self.rows) if self.rows is not None else 0,
+                'version': self.version,
+                'hits': self.hits,
+                'misses': self.misses,
+                'loads': self.loads,
+                'invalidations': self.invalidations,
+                'hit_rate': self.hits / total if total else 0.,
+            }
+
+
+def invalidate_setting_cache(func: Callable) -> Callable:
+    """ 변경 함수 실행(provide_session의 commit) 후 setting_cache 무효화 """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            setting_cache.invalidate()
+
+    return wrapper
+
+
 class Setting(Base):
     __tablename__ = 'setting'
 
@@ -59,14 +226,19 @@ class Setting(Base):
         )
         return row
 
+    @classmethod
+    @invalidate_setting_cache
     @provide_session
-    def update(self, section: str, key: str, value: str, session: Session = None):
-        obj = Setting.get(section=section, key=key, session=session)
+    def update(cls, section: str, key: str, value: str, session: Session = None):
+        obj = cls.get(section=section, key=key, session=session)
         obj.value = value
+        SettingVersion.bump(session=session)
 
+    @invalidate_setting_cache
     @provide_session
     def save(self, session=None):
         session.add(self)
+        SettingVersion.bump(session=session)
 
     @classmethod
     @provide_session
@@ -75,31 +247,35 @@ class Setting(Base):
 
     @classmethod
     def get_value(cls, section: str, key: str, with_comment: bool = False, dtype=None):
-        row: Setting = cls.get(section=section, key=key)
+        """ setting_cache에서 조회(테이블 전체를 한 번에 조회하여 보관) """
+        row = setting_cache.get(section=section, key=key)
 
         if row:
-            value = row.value
+            value, comment = row
             if dtype:
                 value = dtype(value)
 
             if with_comment:
-                return value, row.comment
+                return value, comment
             else:
                 return value
         else:
             return None
 
     @classmethod
+    @invalidate_setting_cache
     @provide_session
     def truncate(cls, session: Session = None):
         session.query(cls).delete()
+        SettingVersion.bump(session=session)
 
     @classmethod
+    @invalidate_setting_cache
     @provide_session
     def initialize(cls, first: bool = False, session: Session = None):
-        items = [dict(section=section, key=key, value=value, comment=comment)
+        items = [dict(section=section, key=key, value=get_default_value(section, key), comment=comment)
                  for section, section_value in SETTING_LIST.items()
-                 for key, (value, comment) in section_value.items()]
+                 for key, (_, comment) in section_value.items()]
 
         if first:
             # save
@@ -109,6 +285,8 @@ class Setting(Base):
             # update
             session.bulk_update_mappings(cls, items)
 
+        SettingVersion.bump(session=session)
+
     @staticmethod
     def validate():
         available_limit = Setting.get_value('REBALANCE', 'AVAILABLE_LIMIT', dtype=float)
@@ -122,3 +300,10 @@ class Setting(Base):
         assert 0 <= overseas_limit <= 1.
 
         assert domestic_limit + overseas_limit < 1
+
+
+# [Section] Variables
+
+setting_cache = SettingCache()
+
+metrics.register('setting_cache', setting_cache.snapshot)
@@ -1,28 +1,31 @@
 import os, sys
 import logging
+import threading
 
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 
-from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
-from sqlalchemy.orm import scoped_session, sessionmaker
+from pyefriend_api.config import HOME_PATH, CONF_PATH
 
-from pyefriend_api.config import Config, HOME_PATH
-from pyefriend_api.utils.log import get_logger
-from pyefriend_api.utils.tool import is_jupyter_kernel
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+    from sqlalchemy.orm import scoped_session
 
 # 기본 폴더
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
-# sqlalchemy engine & session
-engine: Optional[Engine] = None
-Session: Optional[scoped_session] = None
+# sqlalchemy engine & session(initialize에서 생성)
+engine: Optional['Engine'] = None
+Session: Optional['scoped_session'] = None
 
-# logger
-logger = get_logger(use_file=False)
+# logger(initialize에서 handler 설정)
+logger = logging.getLogger('api')
 
-# jupyter kernel인지 여부
-IS_JUPYTER_KERNEL = is_jupyter_kernel()
+# jupyter kernel인지 여부(initialize에서 확인)
+IS_JUPYTER_KERNEL: Optional[bool] = None
+
+_initialized = False
+
+_lock = threading.Lock()
 
 
 def prepare_syspath():
@@ -34,6 +37,11 @@ def configure_sqlalchemy_session(echo: bool = False):
     global engine
     global Session
 
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import scoped_session, sessionmaker
+
+    from pyefriend_api.config import Config
+
     # set engine
     engine = create_engine(Config.get('database', 'SQLALCHEMY_CONN_STR'), echo=echo)
     logger.info('create engine')
@@ -51,9 +59,30 @@ def configure_sqlalchemy_session(echo: bool = False):
 
 
 def initialize():
-    prepare_syspath()
-    configure_sqlalchemy_session()
+    """ logger/sys.path/sqlalchemy 설정(app startup에서 호출, 여러 번 호출해도 한 번만 실행) """
+    global IS_JUPYTER_KERNEL, _initialized
+
+    from pyefriend_api.utils.log import get_logger
+    from pyefriend_api.utils.tool import is_jupyter_kernel
+
+    with _lock:
+        if _initialized:
+            return
+
+        get_logger(use_file=False)
+        logger.info('Initialize Py-Efriend!')
+        logger.info(f"다음의 경로를 사용합니다. HOME_PATH='{HOME_PATH}', CONF_PATH='{CONF_PATH}'")
+
+        IS_JUPYTER_KERNEL = is_jupyter_kernel()
+        prepare_syspath()
+        configure_sqlalchemy_session()
+
+        _initialized = True
+
 
+def get_engine() -> 'Engine':
+    """ sqlalchemy engine(initialize 전일 경우 initialize) """
+    if engine is None:
+        initialize()
 
-logger.info('Initialize Py-Efriend!')
-initialize()
+    return engine
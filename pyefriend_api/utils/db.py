@@ -1,14 +1,13 @@
 import os
-import pandas as pd
 from typing import Dict, List
 
-from pyefriend_api.settings import BASE_DIR, logger
+from pyefriend_api.settings import BASE_DIR, logger, get_engine
 from pyefriend_api.models.base import metadata
 from pyefriend_api.models import Setting
 
 
 def init_db():
-    metadata.create_all()
+    metadata.create_all(bind=get_engine())
     logger.info('create_all: Done')
 
     Setting.initialize(first=True)
@@ -17,7 +16,7 @@ def init_db():
 
 def reset_db():
     # drop tables
-    metadata.drop_all()
+    metadata.drop_all(bind=get_engine())
     logger.info('drop_all: Done')
 
     # create tables
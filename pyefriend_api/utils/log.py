@@ -45,5 +45,6 @@ def remove_logger(logger_name: str = None, logger: logging.Logger = None):
     if logger_name is not None:
         logger = logging.getLogger(logger_name)
 
-    while logger.hasHandlers():
+    # hasHandlers()는 상위 logger의 handler까지 확인하므로 handlers로 확인
+    while logger.handlers:
         logger.removeHandler(logger.handlers[0])
@@ -9,6 +9,9 @@ from pyefriend_api import settings
 
 @contextmanager
 def create_session() -> Session:
+    if settings.Session is None:
+        settings.initialize()
+
     s: Session = settings.Session()
 
     try:
@@ -11,6 +11,10 @@ def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+
 def get_hashed_password(password_env: str):
     password = os.getenv(password_env, None)
 
@@ -18,4 +22,4 @@ def get_hashed_password(password_env: str):
     assert password is not None, "FastAPI 비밀번호를 입력해야합니다."
 
     # hash
-    return pwd_context.hash(password)
+    return hash_password(password)
@@ -0,0 +1,139 @@
+"""
+# Fast response
+
+pydantic 검증 없이 row(dict) list를 바로 직렬화하는 응답
+
+- broker 조회 결과(columnar.ExtractionPlan으로 type 변환된 값)는 response_model 검증을 생략하고
+  model의 field 순서/type(int/float)만 맞춰 직렬화(RowEncoder)
+- orjson이 설치된 경우 orjson, 없을 경우 json 사용
+- Accept header로 형식 선택
+    - application/json(기본): [{column: value}, ...]
+    - application/vnd.pyefriend.columnar+json: {column: [value, ...]}
+    - application/vnd.apache.arrow.stream: Arrow IPC stream(pyarrow 필요)
+
+example)
+    @r.post('/history', response_model=List[PriceHistory])
+    async def list_histories(..., accept: Optional[str] = Header(None)):
+        return rows_response(await api.list_histories(...), PriceHistory, accept=accept)
+"""
+import json
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Type
+
+from fastapi import HTTPException, status
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+JSON = 'application/json'
+COLUMNAR_JSON = 'application/vnd.pyefriend.columnar+json'
+ARROW_STREAM = 'application/vnd.apache.arrow.stream'
+
+# [Section] Variables
+
+_encoders: Dict[Type[BaseModel], 'RowEncoder'] = {}
+
+
+# [Section] Modules
+
+def dumps(content: Any) -> bytes:
+    """ json 직렬화(utf-8 bytes) """
+    if orjson is not None:
+        return orjson.dumps(content)
+
+    return json.dumps(content, ensure_ascii=False, separators=(',', ':'), default=str).encode('utf-8')
+
+
+class FastJSONResponse(Response):
+    """ pydantic/jsonable_encoder를 거치지 않는 JSONResponse """
+    media_type = JSON
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def _keep(value: Any) -> Any:
+    return value
+
+
+def _to_float(value: Any) -> Optional[float]:
+    return None if value is None else float(value)
+
+
+def _to_int(value: Any) -> Optional[int]:
+    return None if value is None else int(value)
+
+
+# model field type -> 값 변환 함수(pydantic 응답과 같은 type)
+CASTS = {
+    float: _to_float,
+    int: _to_int,
+}
+
+
+class RowEncoder:
+    """
+    model field 기준 row projection(model별로 한 번만 생성)
+
+    - model에 없는 key는 제외, 없는 field는 None
+    - int/float field는 pydantic 응답과 같은 type으로 변환
+    """
+    def __init__(self, model: Type[BaseModel]):
+        self.fields = tuple((key, CASTS.get(field.type_, _keep)) for key, field in model.__fields__.items())
+
+    def rows(self, rows: Iterable[Dict]) -> List[Dict]:
+        fields = self.fields
+        return [{key: cast(row.get(key)) for key, cast in fields} for row in rows]
+
+    def columns(self, rows: Sequence[Dict]) -> Dict[str, list]:
+        return {key: [cast(row.get(key)) for row in rows] for key, cast in self.fields}
+
+
+def get_row_encoder(model: Type[BaseModel]) -> RowEncoder:
+    encoder = _encoders.get(model)
+
+    if encoder is None:
+        encoder = _encoders[model] = RowEncoder(model)
+
+    return encoder
+
+
+def to_arrow(columns: Dict[str, list]) -> bytes:
+    """ {column: values} -> Arrow IPC stream """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise HTTPException(status_code=status.HTTP_406_NOT_ACCEPTABLE,
+                            detail=f"'{ARROW_STREAM}' 형식은 pyarrow가 설치되어야 합니다.")
+
+    table = pa.table(columns)
+    sink = pa.BufferOutputStream()
+
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+
+    return sink.getvalue().to_pybytes()
+
+
+def rows_response(rows: Sequence[Dict], model: Type[BaseModel], accept: Optional[str] = None) -> Response:
+    """
+    row(dict) list를 Accept header에 맞는 형식으로 반환(response_model 검증 생략)
+
+    :param rows: api 조회 결과
+    :param model: response_model의 row model(field 순서/type 기준)
+    :param accept: Accept header
+    """
+    encoder = get_row_encoder(model)
+    accept = accept or ''
+
+    if ARROW_STREAM in accept:
+        return Response(to_arrow(encoder.columns(rows)), media_type=ARROW_STREAM)
+
+    if COLUMNAR_JSON in accept:
+        return Response(dumps(encoder.columns(rows)), media_type=COLUMNAR_JSON)
+
+    return FastJSONResponse(encoder.rows(rows))
@@ -1,10 +1,10 @@
 import os
-import yaml
-import requests
-import ipykernel
+import logging
 
 
 def load_yaml(file_path: str) -> dict:
+    import yaml
+
     with open(file_path, encoding='utf-8') as f:
         _dict = yaml.load(f, Loader=yaml.FullLoader)
 
@@ -12,6 +12,8 @@ def load_yaml(file_path: str) -> dict:
 
 
 def get_jupyter_id() -> str:
+    import ipykernel
+
     connection_file = os.path.basename(ipykernel.get_connection_file())
     kernel_id = connection_file.split('-', 1)[1].split('.')[0]
 
@@ -21,7 +23,7 @@ def get_jupyter_id() -> str:
 def is_jupyter_kernel(raise_error: bool = False):
     try:
         jupyter_id = get_jupyter_id()
-        print(f'using jupyter kernel now: {jupyter_id}')
+        logging.getLogger('api').info(f'using jupyter kernel now: {jupyter_id}')
         return True
 
     except RuntimeError as e:
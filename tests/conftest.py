@@ -0,0 +1,56 @@
+"""
+SimulatedController 기반 test 공통 fixture
+
+RUN command in source:
+    python -m pytest -q
+"""
+import os
+import shutil
+import tempfile
+
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# pyefriend_api 설정(config.yml, 비밀번호)이 없는 경우 template 사용
+if not os.getenv('EFRIEND_HOME'):
+    os.environ['EFRIEND_HOME'] = tempfile.mkdtemp(prefix='efriend-test-')
+    shutil.copy(os.path.join(BASE_DIR, 'config.template.yml'), os.path.join(os.environ['EFRIEND_HOME'], 'config.yml'))
+os.environ.setdefault('EFRIEND_PASSWORD', 'password')
+
+from pyefriend import api
+from pyefriend.executor import ControllerThread
+from pyefriend.simulator import SimulatedController, Fixture
+
+
+@pytest.fixture
+def controller():
+    """ 지연 없는 SimulatedController(api.controller로 설정, test 후 원래 controller 복원) """
+    previous = api.controller
+    controller = api.set_controller(SimulatedController(default_fixture=Fixture.filled(),
+                                                        accounts=('5005775101', '5005775102'),
+                                                        latency=0,
+                                                        jitter=0))
+    yield controller
+    api.controller = previous
+
+
+@pytest.fixture
+def controller_thread():
+    thread = ControllerThread(name='pyefriend-controller-test')
+    thread.start()
+    yield thread
+    thread.shutdown()
+
+
+@pytest.fixture
+def client(controller):
+    """ pyefriend_api TestClient(startup 실행), 로그인 header는 client.headers에 설정 """
+    from fastapi.testclient import TestClient
+    from pyefriend_api.api import create_app
+    from pyefriend_api.app.auth import create_access_token, get_admin_user
+
+    with TestClient(create_app()) as client:
+        client.token = create_access_token({'sub': get_admin_user()['username']})
+        client.headers['Authorization'] = f'Bearer {client.token}'
+        yield client
@@ -0,0 +1,154 @@
+import asyncio
+import time
+
+import pytest
+
+import pyefriend.async_api as async_api_module
+from pyefriend.api import DomesticApi
+from pyefriend.async_api import AsyncApi
+from pyefriend.const import ServiceClass
+from pyefriend.exceptions import StreamInterruptedException
+from pyefriend.simulator import Fixture
+from pyefriend.throttle import TokenBucket
+
+
+def run(coroutine):
+    return asyncio.new_event_loop().run_until_complete(coroutine)
+
+
+def make_async_api(controller, controller_thread, timeout: float, limiter: int = 8) -> AsyncApi:
+    api = controller_thread.call(DomesticApi, account='5005775101', password='password')
+
+    async def create():
+        return AsyncApi(api, executor=controller_thread, limiter=asyncio.Semaphore(limiter), timeout=timeout)
+
+    return run(create())
+
+
+def test_batch_prices_do_not_time_out_while_waiting_for_limiter(controller, controller_thread):
+    """ throttle(초당 50건)로 1.2초 걸리는 60종목 조회가 호출별 timeout(0.5초)에 걸리지 않음 """
+    controller.throttle.buckets[ServiceClass.QUOTE] = TokenBucket(50., capacity=1)
+    async_api = make_async_api(controller, controller_thread, timeout=0.5)
+
+    async def collect():
+        return [item async for item in async_api.iter_product_prices([f'A{i:05d}' for i in range(60)])]
+
+    results = run(collect())
+    errors = [error for _, _, error in results if error is not None]
+
+    assert len(results) == 60
+    assert errors == []
+
+
+def test_batch_timeout_scales_with_count(controller, controller_thread):
+    controller.throttle.buckets[ServiceClass.QUOTE] = TokenBucket(20.)
+    async_api = make_async_api(controller, controller_thread, timeout=2)
+
+    assert async_api.batch_timeout(1000) == 2 + 1000 / 20
+
+
+def test_stream_applies_timeout_per_page(controller, controller_thread):
+    """ 전체 1초 걸리는 stream이 page별 timeout(0.5초)에 걸리지 않음 """
+    async_api = make_async_api(controller, controller_thread, timeout=0.5)
+
+    def pages():
+        for index in range(5):
+            time.sleep(0.2)
+            yield [index]
+
+    async def collect():
+        return [page async for page in async_api.stream(pages)]
+
+    assert run(collect()) == [[0], [1], [2], [3], [4]]
+
+
+def test_stream_stops_producing_until_pages_are_received(controller, controller_thread, monkeypatch):
+    monkeypatch.setattr(async_api_module, 'STREAM_BUFFER', 2)
+    async_api = make_async_api(controller, controller_thread, timeout=5)
+    produced = []
+
+    def pages():
+        for index in range(100):
+            produced.append(index)
+            yield [index]
+
+    async def read_one():
+        stream = async_api.stream(pages)
+        first = await stream.__anext__()
+        await asyncio.sleep(0.3)
+        count = len(produced)
+        await stream.aclose()
+        return first, count
+
+    first, count = run(read_one())
+
+    assert first == [0]
+    # 받은 page 1개 + buffer 2개
+    assert count <= 3
+    # 반복을 중단하면 남은 page는 조회하지 않음
+    assert controller_thread.call(lambda: len(produced)) <= 3
+
+
+def iter_simulated_pages(controller, count: int = 6):
+    """ 연속 조회(RequestData/RequestNextData)로 page 번호 반환 """
+    controller.add_fixture('PAGES', lambda request: Fixture(next_pages=[Fixture() for _ in range(count - 1)]))
+
+    def pages():
+        controller.RequestData('PAGES')
+        index = 0
+        yield index
+
+        while controller.IsMoreNextData() == '1':
+            controller.RequestNextData('PAGES')
+            index += 1
+            yield index
+
+    return pages
+
+
+def test_paused_stream_does_not_hold_controller_thread(controller, controller_thread, monkeypatch):
+    """ page를 받지 않는 동안 controller thread는 다른 요청을 실행하고, page를 받으면 이어서 조회 """
+    monkeypatch.setattr(async_api_module, 'STREAM_BUFFER', 2)
+    async_api = make_async_api(controller, controller_thread, timeout=5)
+    pages = iter_simulated_pages(controller)
+
+    async def read_slowly():
+        stream = async_api.stream(pages)
+        first = [await stream.__anext__()]
+        await asyncio.sleep(0.2)
+
+        started = time.monotonic()
+        await asyncio.wrap_future(controller_thread.submit(lambda: None))
+        waited = time.monotonic() - started
+
+        return first + [page async for page in stream], waited
+
+    received, waited = run(read_slowly())
+
+    assert received == [0, 1, 2, 3, 4, 5]
+    assert waited < 0.5
+
+
+def test_stream_is_interrupted_by_request_while_paused(controller, controller_thread, monkeypatch):
+    """ 멈춘 동안 다른 조회가 실행되면 초기화된 연속 조회를 이어가지 않고 에러 """
+    monkeypatch.setattr(async_api_module, 'STREAM_BUFFER', 2)
+    async_api = make_async_api(controller, controller_thread, timeout=5)
+    pages = iter_simulated_pages(controller)
+    controller.add_fixture('OTHER', Fixture())
+    received = []
+
+    async def read_slowly():
+        stream = async_api.stream(pages)
+        received.append(await stream.__anext__())
+        await asyncio.sleep(0.2)
+
+        await asyncio.wrap_future(controller_thread.submit(controller.RequestData, 'OTHER'))
+
+        async for page in stream:
+            received.append(page)
+
+    with pytest.raises(StreamInterruptedException):
+        run(read_slowly())
+
+    # 멈추기 전에 받은 page까지만 반환
+    assert received == [0, 1, 2]
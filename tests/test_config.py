@@ -0,0 +1,16 @@
+import os
+import subprocess
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_import_does_not_read_config():
+    """ pyefriend_api.api import/app 생성시 config.yml을 읽지 않음(startup에서 처음 load) """
+    code = ('import pyefriend_api.api as api; api.create_app(); '
+            'from pyefriend_api.config import Config; assert Config.conf is None, Config.conf')
+    env = dict(os.environ, PYTHONPATH=BASE_DIR, EFRIEND_HOME=os.path.join(BASE_DIR, 'not-exists'))
+
+    result = subprocess.run([sys.executable, '-c', code], env=env, cwd=BASE_DIR, capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,58 @@
+import time
+
+from pyefriend import executor
+from pyefriend import fx as fx_module
+from pyefriend.api import DomesticApi
+from pyefriend.const import Currency
+from pyefriend.fx import FxService
+from pyefriend.simulator import Fixture
+
+
+class OfflineFxService(FxService):
+    """ 외부 환율 조회가 항상 실패하는 FxService """
+    fetches = 0
+
+    def fetch(self) -> float:
+        self.fetches += 1
+        raise ConnectionError('offline')
+
+
+def test_broker_rate_is_refreshed_in_background(controller, controller_thread, monkeypatch):
+    service = OfflineFxService(interval=600)
+    monkeypatch.setattr(fx_module, 'fx_service', service)
+    monkeypatch.setattr(executor, 'controller_thread', controller_thread)
+    controller.add_fixture('OS_OS3004R', Fixture(multi={3: [['', '', '', '', '1300.5']]}))
+
+    api = controller_thread.call(DomesticApi, account='5005775101', password='password')
+
+    # 조회는 기다리지 않고, broker 갱신은 controller thread에서 실행
+    assert api.currency_info.source == 'base'
+    assert service.wait(5)
+
+    fx_rate = api.currency_info
+    assert (fx_rate.rate, fx_rate.source) == (1300.5, 'broker')
+    assert fx_rate.is_fresh(60)
+
+    # interval 안에서는 broker를 다시 조회하지 않음
+    count = controller.request_count
+    assert api.currency == 1300.5
+    assert controller.request_count == count
+
+
+def test_base_rate_is_returned_without_waiting(controller, monkeypatch):
+    """ 갱신된 환율이 없어도 기다리거나 외부 조회를 반복하지 않고 Currency.BASE(source='base') 반환 """
+    service = OfflineFxService(interval=600)
+    monkeypatch.setattr(fx_module, 'fx_service', service)
+    monkeypatch.setattr(executor, 'controller_thread', None)
+
+    api = DomesticApi(account='5005775101', password='password')
+    count = controller.request_count
+    started = time.monotonic()
+    rates = [api.currency_info for _ in range(10)]
+
+    assert time.monotonic() - started < 0.5
+    assert {(fx_rate.rate, fx_rate.source) for fx_rate in rates} == {(Currency.BASE, 'base')}
+    assert not rates[-1].is_fresh(600)
+    assert service.fetches == 0
+    # controller thread가 없으면 broker 조회를 property 안에서 실행하지 않음
+    assert controller.request_count == count
@@ -0,0 +1,95 @@
+import time
+import threading
+from concurrent.futures import Future
+
+from pyefriend import executor, master
+from pyefriend.api import DomesticApi
+from pyefriend.exceptions import RequestExpiredException
+from pyefriend.master import MasterRecord, StockMaster
+from pyefriend.simulator import Fixture
+
+RECORDS = [MasterRecord(product_code=f'{i:06d}', product_name=f'종목{i}', market='KOSPI', group='ST', standard_code='')
+           for i in range(1000)]
+
+
+def test_refresh_does_not_block_lookups(controller, controller_thread, monkeypatch):
+    """ 마스터 갱신(다운로드) 중에는 transaction으로 조회하고, 업종 코드는 controller thread에서 나눠서 채움 """
+    downloading = threading.Event()
+
+    def download_master_files(timeout: float = master.DOWNLOAD_TIMEOUT):
+        downloading.set()
+        time.sleep(0.5)
+        return RECORDS
+
+    monkeypatch.setattr(master, 'download_master_files', download_master_files)
+    monkeypatch.setattr(master, 'stock_master', None)
+    monkeypatch.setattr(master, '_attempted', 0.)
+    monkeypatch.setattr(master, 'STOCK_MASTER', None)
+    monkeypatch.setattr(executor, 'controller_thread', controller_thread)
+
+    controller.stock_master = {record.product_code: {master.SECTOR_FIELD: 'G25'} for record in RECORDS}
+    controller.add_fixture('KST03010100', Fixture(single={6: '삼성전자'}, default='1'))
+
+    api = controller_thread.call(DomesticApi, account='5005775101', password='password')
+
+    started = time.monotonic()
+    name = controller_thread.call(api.get_product_name, '005930')
+    assert time.monotonic() - started < 0.3
+    assert downloading.wait(1)
+    assert name == '삼성전자'  # 갱신 중에는 transaction으로 조회
+    assert controller_thread.call(api.is_valid_product, '999999')  # 마스터가 없으면 검증하지 않음
+
+    master._refresh_thread.join(5)
+    assert controller_thread.call(api.get_product_name, '000001') == '종목1'
+    assert master.stock_master.get('000999')['sector_code'] == 'G25'
+    assert not controller_thread.call(api.is_valid_product, '999999')
+
+
+def test_expired_chunk_keeps_filled_sectors(controller):
+    """ 만료된 chunk만 이전 마스터의 업종 코드로 채우고, 나머지 chunk는 새로 조회한 업종 코드 유지 """
+    class ExpiringExecutor:
+        def schedule(self, func, args=(), kwargs=None, service_class=None, deadline=None):
+            future = Future()
+            if args[1] == 200:
+                future.set_exception(RequestExpiredException('expired'))
+            else:
+                future.set_result(func(*args))
+            return future
+
+    controller.stock_master = {record.product_code: {master.SECTOR_FIELD: 'G25'} for record in RECORDS}
+    previous = StockMaster([record._replace(sector_code='G10') for record in RECORDS])
+
+    stock_master = StockMaster(RECORDS).fill_sectors_in_chunks(controller, ExpiringExecutor(), previous=previous)
+
+    assert stock_master.get('000199')['sector_code'] == 'G25'
+    assert stock_master.get('000200')['sector_code'] == 'G10'
+    assert stock_master.get('000399')['sector_code'] == 'G10'
+    assert stock_master.get('000400')['sector_code'] == 'G25'
+
+
+def test_failed_refresh_is_retried(monkeypatch):
+    """ 갱신에 실패한 경우 REFRESH_RETRY_INTERVAL 후 같은 날 다시 시도 """
+    calls = []
+
+    def download_master_files(timeout: float = master.DOWNLOAD_TIMEOUT):
+        calls.append(timeout)
+        if len(calls) == 1:
+            raise ConnectionError('unavailable')
+        return RECORDS
+
+    monkeypatch.setattr(master, 'download_master_files', download_master_files)
+    monkeypatch.setattr(master, 'stock_master', None)
+    monkeypatch.setattr(master, '_attempted', 0.)
+    monkeypatch.setattr(master, 'STOCK_MASTER', None)
+    monkeypatch.setattr(executor, 'controller_thread', None)
+
+    assert master.get_or_create_stock_master() is None
+    master._refresh_thread.join(5)
+    assert master.get_or_create_stock_master() is None  # REFRESH_RETRY_INTERVAL 전에는 다시 시도하지 않음
+    assert len(calls) == 1
+
+    monkeypatch.setattr(master, 'REFRESH_RETRY_INTERVAL', 0.)
+    master.get_or_create_stock_master()
+    master._refresh_thread.join(5)
+    assert len(calls) == 2
+    assert len(master.get_or_create_stock_master()) == len(RECORDS)
@@ -0,0 +1,106 @@
+import pytest
+
+from pyefriend.api import DomesticApi
+from pyefriend.cache import quote_cache
+from pyefriend.const import ServiceClass
+from pyefriend.order import InvalidOrderException
+from pyefriend.simulator import Fixture
+from pyefriend.throttle import TokenBucket
+
+
+@pytest.fixture
+def api(controller):
+    quote_cache.clear()
+    controller.throttle.buckets[ServiceClass.ORDER] = TokenBucket(1000.)
+    yield DomesticApi(account='5005775101', password='password')
+    quote_cache.clear()
+
+
+def order_fixture(failed=(), throttled: int = 0):
+    """ SCABO(매수): failed 종목은 에러, 처음 throttled번은 요청 제한 응답 """
+    calls = []
+
+    def fixture(request) -> Fixture:
+        product_code = request.get(3)
+        calls.append(product_code)
+
+        if len(calls) <= throttled:
+            return Fixture(rt_code='1', msg_code='EGW00201', message='초당 거래건수를 초과하였습니다.')
+        if product_code in failed:
+            return Fixture(rt_code='1', msg_code='40070000', message='주문 불가')
+        return Fixture(single={1: f'{len(calls):010d}'})
+
+    return fixture, calls
+
+
+def test_order_invalidates_quote_cache(api, controller):
+    api.get_product_prices('005930')
+    api.get_product_prices('000660')
+    count = controller.request_count
+
+    # cache된 시세는 다시 요청하지 않음
+    api.get_product_prices('005930')
+    assert controller.request_count == count
+
+    # 주문한 종목의 시세만 제거
+    api.buy_stock('005930', 1)
+    count = controller.request_count
+    api.get_product_prices('005930')
+    api.get_product_prices('000660')
+    assert controller.request_count == count + 1
+
+
+def test_submit_orders_continues_after_error(api, controller):
+    fixture, calls = order_fixture(failed={'000660'})
+    controller.add_fixture('SCABO', fixture)
+
+    batch = api.submit_orders([dict(side='buy', product_code=product_code, count=1)
+                               for product_code in ('005930', '000660', '035420')])
+
+    assert calls == ['005930', '000660', '035420']
+    assert (batch.succeeded, batch.failed) == (2, 1)
+    assert list(batch.errors) == [1]
+
+
+def test_submit_orders_stops_on_error(api, controller):
+    fixture, calls = order_fixture(failed={'000660'})
+    controller.add_fixture('SCABO', fixture)
+
+    batch = api.submit_orders([dict(side='buy', product_code=product_code, count=1)
+                               for product_code in ('005930', '000660', '035420')],
+                              stop_on_error=True)
+
+    # 에러 이후 주문은 제출하지 않음
+    assert calls == ['005930', '000660']
+    assert [result.submitted for result in batch] == [True, True, False]
+    assert batch.results[0].ok and not batch.results[2].ok
+
+
+def test_submit_orders_retries_rate_limited_order(api, controller):
+    fixture, calls = order_fixture(throttled=1)
+    controller.add_fixture('SCABO', fixture)
+
+    batch = api.submit_orders([dict(side='buy', product_code='005930', count=1)], retries=1)
+
+    assert calls == ['005930', '005930']
+    assert batch.results[0].ok
+
+    # 재시도 횟수를 넘으면 에러로 기록
+    fixture, calls = order_fixture(throttled=2)
+    controller.add_fixture('SCABO', fixture)
+
+    batch = api.submit_orders([dict(side='buy', product_code='005930', count=1)], retries=1)
+
+    assert len(calls) == 2
+    assert batch.results[0].error.startswith('RateLimitException')
+
+
+def test_submit_orders_validates_before_submitting(api, controller):
+    fixture, calls = order_fixture()
+    controller.add_fixture('SCABO', fixture)
+
+    with pytest.raises(InvalidOrderException):
+        api.submit_orders([dict(side='buy', product_code='005930', count=1),
+                           dict(side='buy', product_code='000660', count=0)])
+
+    assert calls == []
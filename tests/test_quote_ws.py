@@ -0,0 +1,36 @@
+import time
+
+from pyefriend.cache import quote_cache
+from pyefriend_api.app.v1.stock import router
+
+WS_PATH = '/api/v1/stock/quote/ws'
+
+
+def login(websocket, account: str):
+    websocket.send_json({'market': 'domestic', 'account': account, 'password': 'password'})
+
+
+def test_hub_is_not_replaced_by_another_account(client, monkeypatch):
+    monkeypatch.setitem(quote_cache.ttls, 'SCP', 0)
+
+    with client.websocket_connect(f'{WS_PATH}?token={client.token}') as first:
+        login(first, '5005775101')
+        first.send_json({'action': 'subscribe', 'product_codes': ['005930']})
+        assert first.receive_json()[0]['product_code'] == '005930'
+        first_hub = next(iter(router.quote_hubs.values()))
+
+        with client.websocket_connect(f'{WS_PATH}?token={client.token}') as second:
+            login(second, '5005775102')
+            second.send_json({'action': 'subscribe', 'product_codes': ['000660']})
+            assert second.receive_json()[0]['product_code'] == '000660'
+
+            # 계좌별 hub, 먼저 접속한 client의 upstream은 그대로
+            assert len(router.quote_hubs) == 2
+            assert first_hub in router.quote_hubs.values()
+            assert {key.account for key in router.quote_hubs} == {'5005775101', '5005775102'}
+
+    # 모든 client 연결 해제시 hub 종료(server쪽 연결 종료 처리 대기)
+    deadline = time.monotonic() + 5
+    while router.quote_hubs and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert router.quote_hubs == {}
@@ -0,0 +1,86 @@
+import threading
+
+import pytest
+
+from pyefriend.exceptions import UnExpectedException
+from pyefriend.realtime import RealTimeManager
+
+QUERY = 'TEST_REAL'
+
+
+def test_subscribe_while_tick_is_delivered_on_controller_thread(controller, controller_thread):
+    """ controller thread에서 tick 처리 중에 다른 thread에서 구독해도 deadlock이 발생하지 않음 """
+    manager = RealTimeManager(QUERY, controller=controller, executor=controller_thread)
+    first = manager.subscribe(['005930'])
+
+    # controller thread: 구독 요청이 대기열에 들어온 뒤 tick 수신(on_receive)
+    release = threading.Event()
+
+    def tick():
+        release.wait(5)
+        controller.push_real_data(QUERY, '005930', ['005930', '090000', '70000', '10'])
+
+    tick_future = controller_thread.submit(tick)
+
+    subscribed = threading.Event()
+
+    def subscribe():
+        manager.subscribe(['000660'])
+        subscribed.set()
+
+    thread = threading.Thread(target=subscribe, daemon=True)
+    thread.start()
+
+    # 구독 thread가 controller thread를 기다리는 중에 tick 처리
+    thread.join(0.2)
+    release.set()
+
+    assert subscribed.wait(5), 'subscribe가 controller thread의 tick 처리와 deadlock'
+    tick_future.result(5)
+
+    assert [t.price for t in first.drain()] == [70000.]
+    assert (QUERY, '000660') in controller.real_data
+
+
+def test_ref_count_registers_once(controller, controller_thread):
+    manager = RealTimeManager(QUERY, controller=controller, executor=controller_thread)
+
+    first = manager.subscribe(['005930', '000660'])
+    second = manager.subscribe(['005930'])
+    assert manager.ref_counts == {'005930': 2, '000660': 1}
+
+    first.close()
+    assert controller.real_data == {(QUERY, '005930')}
+
+    manager.close()
+    assert second.closed
+    assert controller.real_data == set()
+    assert manager.ref_counts == {}
+
+
+def test_failed_registration_is_rolled_back(controller, controller_thread, monkeypatch):
+    """ RequestRealData 실패시 구독 정보를 되돌려서 다음 구독자가 다시 등록 """
+    manager = RealTimeManager(QUERY, controller=controller, executor=controller_thread)
+    request_real_data = controller.RequestRealData
+
+    def failing(query: str, code: str):
+        if code == '000660':
+            raise UnExpectedException('실시간 등록 실패')
+        request_real_data(query, code)
+
+    monkeypatch.setattr(controller, 'RequestRealData', failing)
+
+    with pytest.raises(UnExpectedException):
+        manager.subscribe(['005930', '000660'])
+
+    # 먼저 등록한 종목도 해제
+    assert manager.ref_counts == {}
+    assert manager.subscriptions == {}
+    assert controller.real_data == set()
+
+    monkeypatch.setattr(controller, 'RequestRealData', request_real_data)
+    subscription = manager.subscribe(['000660'])
+
+    assert manager.ref_counts == {'000660': 1}
+    assert (QUERY, '000660') in controller.real_data
+    subscription.close()
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from pyefriend.rebalance import RebalanceLimits, plan_rebalance
+
+LIMITS = RebalanceLimits(available_limit=0.9, domestic_limit=0.5, overseas_limit=0.4, additional_amount=0.)
+
+
+def random_plan(rng: np.random.Generator, size: int):
+    is_overseas = rng.random(size) < 0.4
+    weights = np.where(rng.random(size) < 0.2, 0., rng.random(size))
+
+    inputs = dict(product_codes=[f'A{index:05d}' for index in range(size)],
+                  counts=rng.integers(0, 200, size),
+                  prices=np.where(is_overseas, rng.uniform(5, 500, size), rng.uniform(1000, 500000, size)).round(2),
+                  weights=weights,
+                  is_overseas=is_overseas,
+                  lots=rng.choice([1, 1, 1, 10], size),
+                  market_codes=np.where(is_overseas, 'NASD', None),
+                  cash=float(rng.uniform(0, 50_000_000)),
+                  currency=1200.,
+                  limits=LIMITS)
+    return inputs, plan_rebalance(**inputs)
+
+
+@pytest.mark.parametrize('seed', range(50))
+def test_plan_invariants(seed):
+    rng = np.random.default_rng(seed)
+    inputs, plan = random_plan(rng, size=int(rng.integers(1, 60)))
+    orders = plan.orders()
+    summary = plan.summary()
+    counts, lots = np.asarray(inputs['counts']), np.asarray(inputs['lots'])
+    targets = plan.targets
+
+    # 예수금 + 매도 금액 안에서만 매수
+    assert summary['cash_after'] >= -1e-6
+    assert summary['orders'] == len(orders)
+
+    # 보유 수량 이상 매도하지 않음
+    assert (targets >= 0).all()
+
+    # 주문 수량은 주문 단위의 배수(전량 매도 제외)
+    partial = targets != 0
+    assert (plan.deltas[partial] % lots[partial] == 0).all()
+
+    # 목표 비중이 0인 보유 종목은 전량 매도
+    assert (targets[np.asarray(inputs['weights']) == 0] == 0).all()
+
+    # 국내/해외 주문 후 금액은 각 한도를 넘지 않음
+    assert summary['domestic_amount'] <= summary['budget'] * LIMITS.domestic_limit + 1e-6
+    assert summary['overseas_amount'] <= summary['budget'] * LIMITS.overseas_limit + 1e-6
+
+    # 매도 -> 매수 순서
+    sides = [order['side'] for order in orders]
+    assert sides == sorted(sides, key=lambda side: side == 'buy')
+
+    # 주문 결과와 목표 수량 일치
+    for order in orders:
+        sign = 1 if order['side'] == 'buy' else -1
+        assert order['target_count'] == order['current_count'] + sign * order['count']
+    assert (targets == counts + plan.deltas).all()
+
+
+def test_plan_rejects_mismatched_lengths():
+    with pytest.raises(ValueError):
+        plan_rebalance(product_codes=['005930', '000660'], counts=[1], prices=[1., 1.], weights=[1., 1.])
+
+
+def test_buy_count_is_multiple_of_lot():
+    """ 보유 수량이 주문 단위의 배수가 아니어도 매수 수량은 주문 단위의 배수 """
+    plan = plan_rebalance(product_codes=['069500'],
+                          counts=[7],
+                          prices=[10000.],
+                          weights=[1.],
+                          lots=[10],
+                          cash=1_000_000,
+                          limits=RebalanceLimits(available_limit=1., domestic_limit=1., overseas_limit=0.))
+
+    order, = plan.orders()
+    assert (order['side'], order['count'] % 10) == ('buy', 0)
+    assert order['target_count'] <= 107
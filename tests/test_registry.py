@@ -0,0 +1,11 @@
+from pyefriend.const import Market
+from pyefriend.registry import ApiRegistry
+
+
+def test_key_market_is_normalized():
+    registry = ApiRegistry()
+
+    key = registry.make_key(Market.DOMESTIC, '5005775101', password='password')
+
+    assert key.market == 'domestic'
+    assert key == registry.make_key('domestic', '5005775101', password='password')
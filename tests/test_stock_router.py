@@ -0,0 +1,86 @@
+import asyncio
+import json
+import time
+
+from pyefriend.const import Currency
+from pyefriend.fx import FxRate
+from pyefriend.rebalance import RebalanceLimits
+from pyefriend.simulator import Fixture
+from pyefriend_api.app.v1.stock import router
+from pyefriend_api.app.v1.stock.router import stream_histories
+
+REBALANCE_PATH = '/api/v1/stock/trade/rebalance'
+
+
+def test_stream_histories_ends_with_error_record():
+    async def pages():
+        yield [dict(standard_date='20211201', minimum=90., maximum=110., opening=95., closing=100., volume=10)]
+        raise asyncio.TimeoutError()
+
+    async def collect():
+        return b''.join([line async for line in stream_histories(pages()).body_iterator])
+
+    lines = [json.loads(line) for line in asyncio.new_event_loop().run_until_complete(collect()).splitlines()]
+
+    assert lines[0]['standard_date'] == '20211201'
+    assert lines[-1] == {'error': 'TimeoutError: '}
+
+
+def patch_portfolio(monkeypatch, fx_rate: FxRate):
+    """ 해외 종목 1개(보유 0주)를 목표로 하는 계좌 """
+    async def collect_portfolio(request, domestic):
+        portfolio = {'AAPL': dict(count=0, price=150., weight=1., is_overseas=True, market_code='NASD', lot=1)}
+        return portfolio, 1_000_000., 0., fx_rate
+
+    monkeypatch.setattr(router, 'collect_portfolio', collect_portfolio)
+    monkeypatch.setattr(router, 'load_rebalance_limits', lambda: RebalanceLimits())
+
+
+def test_rebalance_refuses_to_order_with_stale_currency(client, monkeypatch):
+    patch_portfolio(monkeypatch, FxRate(Currency.BASE, 'base', 0.))
+    body = {'account': '5005775101', 'password': 'password', 'targets': [{'product_code': 'AAPL',
+                                                                           'market_code': 'NASD',
+                                                                           'weight': 1.}]}
+
+    response = client.post(f'{REBALANCE_PATH}?dry_run=false', json=body)
+    assert response.status_code == 409
+
+    # dry_run은 계획과 함께 환율 출처 반환
+    response = client.post(f'{REBALANCE_PATH}?dry_run=true', json=body)
+    assert response.status_code == 200
+    summary = response.json()['summary']
+    assert (summary['currency'], summary['currency_source'], summary['currency_age']) == (Currency.BASE, 'base', None)
+
+
+def test_rebalance_orders_with_fresh_currency(client, monkeypatch):
+    patch_portfolio(monkeypatch, FxRate(1300., 'broker', time.time()))
+    body = {'account': '5005775101', 'password': 'password', 'targets': [{'product_code': 'AAPL',
+                                                                           'market_code': 'NASD',
+                                                                           'weight': 1.}]}
+
+    response = client.post(f'{REBALANCE_PATH}?dry_run=false', json=body)
+    assert response.status_code == 200
+    output = response.json()
+    assert output['summary']['currency_source'] == 'broker'
+    assert [order['side'] for order in output['orders']] == ['buy']
+    assert output['orders'][0]['order_num'] is not None
+
+
+def add_history_pages(controller, pages: int = 3):
+    """ 연속 조회 page당 2일치 일별 시세(SCPD) """
+    def page(index: int) -> Fixture:
+        return Fixture(multi={0: [[f'202111{30 - index * 2 - offset:02d}', 1, 1, 1, 1, 1] for offset in range(2)]})
+
+    controller.add_fixture('SCPD', lambda request: Fixture(multi=page(0).multi,
+                                                           next_pages=[page(index) for index in range(1, pages)]))
+
+
+def test_product_histories_default_to_one_page(client, controller):
+    add_history_pages(controller)
+    body = {'market': 'domestic', 'account': '5005775101', 'password': 'password', 'product_code': '005930'}
+
+    response = client.post('/api/v1/stock/product/history', json=body)
+    assert [row['standard_date'] for row in response.json()] == ['20211130', '20211129']
+
+    response = client.post('/api/v1/stock/product/history?max_pages=2', json=body)
+    assert len(response.json()) == 4
@@ -0,0 +1,53 @@
+from datetime import datetime
+
+from pyefriend import store as store_module
+from pyefriend.store import HistoryStore, KST, last_final_date
+
+
+def record(standard_date: str) -> dict:
+    return dict(standard_date=standard_date, minimum=1., maximum=1., opening=1., closing=1., volume=1)
+
+
+def test_overseas_bars_are_final_after_us_close():
+    # 한국 시간 12월 2일 오전 3시: 미국 12월 1일 장중
+    now = datetime(2021, 12, 2, 3, tzinfo=KST)
+    assert last_final_date('domestic', now) == '20211201'
+    assert last_final_date('overseas', now) == '20211130'
+
+    now = datetime(2021, 12, 2, 8, tzinfo=KST)
+    assert last_final_date('overseas', now) == '20211201'
+
+    # 국내 당일 시세는 18시 이후 확정
+    assert last_final_date('domestic', datetime(2021, 12, 2, 15, tzinfo=KST)) == '20211201'
+    assert last_final_date('domestic', datetime(2021, 12, 2, 18, tzinfo=KST)) == '20211202'
+
+
+def test_live_overseas_bar_is_not_stored(tmp_path, monkeypatch):
+    monkeypatch.setattr(store_module, 'last_final_date', lambda market, now=None: '20211130')
+    store = HistoryStore(str(tmp_path))
+    fetched = []
+
+    def fetch(start_date, end_date):
+        fetched.append((start_date, end_date))
+        return [record('20211201'), record('20211130'), record('20211129')], True
+
+    records = store.get_or_fetch('overseas', 'AAPL', '20211129', '20211201', fetch=fetch)
+
+    assert [r['standard_date'] for r in records] == ['20211201', '20211130', '20211129']
+    assert store.covered('overseas', 'AAPL') == [('20211129', '20211130')]
+
+    # 확정되지 않은 일자만 다시 조회
+    store.get_or_fetch('overseas', 'AAPL', '20211129', '20211201', fetch=fetch)
+    assert fetched[-1] == ('20211201', '20211201')
+
+
+def test_truncated_fetch_covers_only_received_range(tmp_path, monkeypatch):
+    monkeypatch.setattr(store_module, 'last_final_date', lambda market, now=None: '20211231')
+    store = HistoryStore(str(tmp_path))
+
+    # 최근 일자부터 조회하다가 max_pages에서 중단
+    store.get_or_fetch('domestic', '005930', '20210101', '20211130',
+                       fetch=lambda start_date, end_date: ([record('20211130'), record('20211101')], False))
+
+    assert store.covered('domestic', '005930') == [('20211101', '20211130')]
+    assert store.missing('domestic', '005930', '20210101', '20211130') == [('20210101', '20211031')]
@@ -0,0 +1,32 @@
+import pytest
+
+from pyefriend.const import ServiceClass
+from pyefriend.throttle import RATE_WINDOW, Throttle, ThrottleStat, parse_rates
+
+
+def test_stat_keeps_only_rate_window():
+    """ effective_rate를 조회하지 않아도 오래된 요청 기록은 제거 """
+    stat = ThrottleStat()
+
+    for index in range(10000):
+        stat.record(now=index * 0.01, wait=0.)
+
+    assert stat.requests == 10000
+    assert len(stat.timestamps) <= RATE_WINDOW / 0.01 + 1
+    assert stat.effective_rate(now=99.99) == len(stat.timestamps) / RATE_WINDOW
+
+
+def test_rate_for_shared_class_is_rejected(monkeypatch):
+    """ history는 quote 한도를 공유하므로 따로 설정한 값이 무시되지 않고 에러 """
+    with pytest.raises(ValueError):
+        parse_rates('quote=20,history=5')
+
+    with pytest.raises(ValueError):
+        Throttle(rates={ServiceClass.HISTORY: 5.})
+
+    monkeypatch.setenv('PYEFRIEND__THROTTLE_RATES', 'history=5')
+    with pytest.raises(ValueError):
+        Throttle()
+
+    monkeypatch.delenv('PYEFRIEND__THROTTLE_RATES')
+    assert Throttle.unlimited().buckets[ServiceClass.QUOTE] is None